@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Solver Benchmark Script
+
+Runs the schedule optimizer on synthetic instances of increasing size and
+records model-build time, variable/constraint counts, solve time, objective
+and peak RSS. Results are written to a JSON baseline and compared against the
+previous run, so the effect of a solver change shows up on every case size.
+
+Usage:
+    python scripts/solver_benchmark.py                     # small, medium, large
+    python scripts/solver_benchmark.py --cases small medium --time-limit 10
+    python scripts/solver_benchmark.py --no-save           # compare without updating the baseline
+"""
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scheduler.synthetic import InstanceSpec  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).parent.parent / "reports" / "solver_benchmark.json"
+
+# One week each, so every case is a single model; longer ranges go through the
+# rolling horizon (see scheduler.rolling_horizon)
+CASES = {
+    "small": InstanceSpec(employees=50, templates=6, days=7, departments=1, rules=10),
+    "medium": InstanceSpec(employees=500, templates=12, days=7, departments=4, rules=50),
+    "large": InstanceSpec(employees=5000, templates=24, days=7, departments=20, rules=200),
+}
+
+# Metrics compared against the baseline; lower is better for all of them
+COMPARED_METRICS = ["build_time", "solve_time", "num_variables", "num_constraints", "objective", "peak_rss_mb"]
+
+
+def run_case(name: str, spec: InstanceSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and solve one case. Runs in a fresh process so peak RSS is per case."""
+    from src.scheduler.constraint_solver import ScheduleOptimizer
+    from src.scheduler.instance import SolverInstance
+    from src.scheduler.synthetic import generate_instance
+
+    started = time.perf_counter()
+    employees, shifts, constraints = generate_instance(spec)
+    generate_time = time.perf_counter() - started
+
+    optimizer = ScheduleOptimizer(config=config)
+    started = time.perf_counter()
+    result = optimizer.generate_schedule(
+        employees=employees, shifts=shifts, constraints=constraints, instance=SolverInstance(employees, shifts)
+    )
+    total_time = time.perf_counter() - started
+
+    statistics = result.get("statistics", {})
+    solved_with_model = statistics.get("method") != "greedy" and optimizer.model is not None
+    assigned = sum(len(entry["assigned_employees"]) for entry in result.get("schedule", []))
+
+    record = {
+        "case": name,
+        "employees": len(employees),
+        "shifts": len(shifts),
+        "rules": len(constraints),
+        "status": result["status"],
+        "method": statistics.get("method", "cp-sat"),
+        "generate_time": round(generate_time, 3),
+        "total_time": round(total_time, 3),
+        "build_time": round(optimizer.build_time, 3) if solved_with_model else None,
+        "solve_time": None,
+        "time_limit": statistics.get("time_limit"),
+        "stop_reason": statistics.get("stop_reason"),
+        "num_variables": len(optimizer.variables.get("assignments", {})) if solved_with_model else None,
+        "num_constraints": len(optimizer.model.Proto().constraints) if solved_with_model else None,
+        "objective": None,
+        "best_bound": None,
+        "assignments": assigned,
+        "peak_rss_mb": None,
+    }
+
+    if solved_with_model and optimizer.solver is not None:
+        record["solve_time"] = round(optimizer.solver.WallTime(), 3)
+        if result["status"] in ["optimal", "feasible"]:
+            record["objective"] = optimizer.solver.ObjectiveValue()
+            record["best_bound"] = optimizer.solver.BestObjectiveBound()
+    elif statistics.get("solve_time") is not None:
+        record["solve_time"] = round(statistics["solve_time"], 3)
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    record["peak_rss_mb"] = round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return record
+
+
+def run_isolated(name: str, spec: InstanceSpec, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a case in a freshly spawned process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, name, spec, config).result()
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """Load the previous run, if any."""
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(previous: Optional[Dict[str, Any]], current: Dict[str, Any], threshold: float) -> int:
+    """Print current results next to the previous run and return the number of regressions."""
+    previous_cases = {record["case"]: record for record in (previous or {}).get("cases", [])}
+    regressions = 0
+
+    print("\n" + "=" * 100)
+    print("SOLVER BENCHMARK" + (f" (vs run of {previous['timestamp']})" if previous else " (no previous run)"))
+    print("=" * 100)
+
+    for record in current["cases"]:
+        before = previous_cases.get(record["case"])
+        print(
+            f"\n{record['case']}: {record['employees']} employees, {record['shifts']} shifts, {record['rules']} rules "
+            f"-> {record['status']} ({record['method']})"
+        )
+        if before and before.get("spec") != record.get("spec"):
+            print("  ⚠️  instance spec changed since previous run, comparison is indicative only")
+
+        for metric in COMPARED_METRICS:
+            value = record.get(metric)
+            old = before.get(metric) if before else None
+            line = f"  {metric:16} {_format(value):>14}"
+
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)):
+                change = (value - old) / abs(old) if old else 0.0
+                line += f"   was {_format(old):>14}  {change:+7.1%}"
+                if change > threshold:
+                    line += "  ❌ REGRESSION"
+                    regressions += 1
+                elif change < -threshold:
+                    line += "  ✅ IMPROVED"
+            print(line)
+
+    print("\n" + "=" * 100)
+    if previous:
+        print(f"{regressions} metric(s) regressed by more than {threshold:.0%}")
+    return regressions
+
+
+def _format(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.3f}"
+    return f"{value:,}"
+
+
+def main() -> int:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the schedule optimizer on synthetic instances")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES), help="Cases to run")
+    parser.add_argument("--time-limit", type=float, default=30, help="Solver time limit per case in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Instance generator seed")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="JSON baseline to compare and update")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="Do not overwrite the baseline with this run")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero if any metric regressed")
+    args = parser.parse_args()
+
+    from src.services.schedule_service import ScheduleGenerationService
+
+    # Benchmark the configuration the service runs with
+    config = {**ScheduleGenerationService().optimizer.config, "max_solve_time": args.time_limit}
+
+    records = []
+    for name in args.cases:
+        spec = replace(CASES[name], seed=args.seed)
+        print(f"Running {name} ({spec.employees} employees, {spec.templates} templates, {spec.days} days)...", flush=True)
+        record = run_isolated(name, spec, config)
+        record["spec"] = {key: str(value) if key == "start_date" else value for key, value in asdict(spec).items()}
+        records.append(record)
+
+    current = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config,
+        "cases": records,
+    }
+
+    previous = load_baseline(args.baseline)
+    regressions = compare(previous, current, args.threshold)
+
+    if not args.no_save:
+        # Keep baseline entries for cases not run this time
+        kept = [record for record in (previous or {}).get("cases", []) if record["case"] not in args.cases]
+        current["cases"] = kept + records
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
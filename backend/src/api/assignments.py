@@ -28,6 +28,7 @@ from ..schemas import (
     AssignmentUpdate,
     MessageResponse,
 )
+from ..services.conflict_detection import assignment_index
 
 router = APIRouter(prefix="/api/assignments", tags=["assignments"])
 
@@ -114,27 +115,11 @@ async def create_assignment(
             )
 
         # Check for conflicts (overlapping shifts on same date)
-        conflict_query = (
-            select(ScheduleAssignment)
-            .join(Shift, ScheduleAssignment.shift_id == Shift.id)
-            .where(
-                and_(
-                    ScheduleAssignment.employee_id == assignment.employee_id,
-                    ScheduleAssignment.status.in_(["assigned", "confirmed"]),
-                    Shift.date == shift.date,
-                )
-            )
-            .options(selectinload(ScheduleAssignment.shift))
-        )
-        conflict_result = await db.execute(conflict_query)
-        existing_assignments = conflict_result.scalars().all()
-
-        conflicts = []
-        for existing in existing_assignments:
-            if shift.conflicts_with(existing.shift):
-                conflicts.append(
-                    f"Conflicts with shift {existing.shift.id} ({existing.shift.start_time} - {existing.shift.end_time})"
-                )
+        timeline = await assignment_index.timeline(db, assignment.employee_id, shift.date)
+        conflicts = [
+            f"Conflicts with shift {existing.id} ({existing.start_time} - {existing.end_time})"
+            for existing in timeline.overlapping(shift)
+        ]
 
         if conflicts:
             raise HTTPException(
@@ -233,27 +218,11 @@ async def bulk_create_assignments(
         shifts_result = await db.execute(shifts_query)
         shifts_map = {shift.id: shift for shift in shifts_result.scalars().all()}
 
-        # Get existing assignments for conflict detection
-        existing_query = (
-            select(ScheduleAssignment)
-            .join(Shift, ScheduleAssignment.shift_id == Shift.id)
-            .where(
-                and_(
-                    ScheduleAssignment.employee_id.in_(employee_ids),
-                    ScheduleAssignment.status.in_(["assigned", "confirmed"]),
-                )
-            )
-            .options(selectinload(ScheduleAssignment.shift))
-        )
-        existing_result = await db.execute(existing_query)
-        existing_assignments = existing_result.scalars().all()
-
-        # Group existing assignments by employee
-        employee_assignments = {}
-        for assignment in existing_assignments:
-            if assignment.employee_id not in employee_assignments:
-                employee_assignments[assignment.employee_id] = []
-            employee_assignments[assignment.employee_id].append(assignment)
+        # Get existing assignments for conflict detection (only employees missing from the index are queried)
+        timelines = {}
+        if bulk_data.validate_conflicts and shifts_map:
+            shift_dates = [shift.date for shift in shifts_map.values()]
+            timelines = await assignment_index.timelines(db, employee_ids, min(shift_dates), max(shift_dates))
 
         # Process each assignment
         for idx, assignment_data in enumerate(bulk_data.assignments):
@@ -297,10 +266,10 @@ async def bulk_create_assignments(
 
                 # Check conflicts if validation enabled
                 if bulk_data.validate_conflicts:
-                    conflicts = []
-                    for existing in employee_assignments.get(assignment_data.employee_id, []):
-                        if existing.shift.date == shift.date and shift.conflicts_with(existing.shift):
-                            conflicts.append(f"Conflicts with shift {existing.shift_id}")
+                    conflicts = [
+                        f"Conflicts with shift {existing.id}"
+                        for existing in timelines[assignment_data.employee_id].overlapping(shift)
+                    ]
 
                     if conflicts:
                         errors.append(
@@ -487,6 +456,18 @@ async def update_assignment(
             if not can_assign:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=reason)
 
+            # Check for conflicts with the employee's other assignments
+            timeline = await assignment_index.timeline(db, new_employee_id, shift.date)
+            conflicts = [
+                f"Conflicts with shift {existing.id} ({existing.start_time} - {existing.end_time})"
+                for existing in timeline.overlapping(shift, exclude_assignment_id=id)
+            ]
+            if conflicts:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Assignment conflicts detected: {'; '.join(conflicts)}",
+                )
+
         # Apply updates
         for field, value in update_data.items():
             setattr(db_assignment, field, value)
@@ -22,9 +22,12 @@ from ..schemas import (
     EmployeeDistributionItem,
     EmployeeResponse,
     PaginatedResponse,
+    ScheduleAudit,
     ShiftResponse,
     ValidateAssignmentRequest,
     ValidateAssignmentResponse,
+    WhatIfValidationRequest,
+    WhatIfValidationResponse,
 )
 from ..services.crud import crud_department
 from ..services import conflict_detection
@@ -982,6 +985,39 @@ async def validate_department_assignment(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/{department_id}/validate-changes", response_model=WhatIfValidationResponse)
+async def validate_department_changes(
+    department_id: int,
+    validation_request: WhatIfValidationRequest,
+    db: AsyncSession = Depends(get_database_session),
+    current_user: dict = Depends(get_current_manager),
+):
+    """
+    Validate a batch of proposed assignment changes without saving them.
+
+    Changes (add, remove, move) are applied in order to in-memory copies of
+    the affected employees' schedules. Returns the conflicts the batch would
+    introduce and the ones it would resolve, so a manager can preview a
+    drag-and-drop edit before committing it. Nothing is written. Changes
+    touching shifts of other departments are reported in ``errors``.
+
+    Requires manager role.
+    """
+    # Check if department exists
+    department = await crud_department.get(db, department_id)
+    if not department:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Department not found")
+
+    try:
+        result = await conflict_detection.evaluate_assignment_changes(
+            db, [change.model_dump() for change in validation_request.changes], department_id
+        )
+        return WhatIfValidationResponse(**result)
+    except Exception as e:
+        logger.error(f"Error validating assignment changes: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post("/{department_id}/check-coverage", response_model=CheckCoverageResponse)
 async def check_department_coverage(
     department_id: int,
@@ -1096,3 +1132,60 @@ async def get_department_conflict_report(
     except Exception as e:
         logger.error(f"Error generating conflict report: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{department_id}/schedule-audit", response_model=ScheduleAudit)
+async def get_department_schedule_audit(
+    department_id: int,
+    start_date: str = Query(..., description="Audit start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="Audit end date (YYYY-MM-DD)"),
+    minimum_rest_hours: float = Query(8.0, description="Minimum rest between shifts", ge=0),
+    db: AsyncSession = Depends(get_database_session),
+    current_user: dict = Depends(get_current_manager),
+):
+    """
+    Audit the department's employees for rest period and hour limit violations.
+
+    Runs a single query over the date range, so it is suited to long ranges
+    and scheduled audits. Rest is checked between consecutive shifts of an
+    employee whatever days they fall on, and daily and weekly hours include
+    the employee's shifts in other departments.
+
+    Query Parameters:
+    - start_date: Audit period start date (YYYY-MM-DD)
+    - end_date: Audit period end date (YYYY-MM-DD)
+    - minimum_rest_hours: Minimum rest between shifts (default: 8)
+
+    Requires manager role.
+    """
+    from datetime import date as date_type
+
+    # Check if department exists
+    department = await crud_department.get(db, department_id)
+    if not department:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Department not found")
+
+    # Parse dates
+    try:
+        start_date_obj = date_type.fromisoformat(start_date)
+        end_date_obj = date_type.fromisoformat(end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid date format: {e}")
+
+    if end_date_obj < start_date_obj:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+
+    try:
+        conflicts = await conflict_detection.audit_employee_schedules(
+            db, start_date_obj, end_date_obj, department_id=department_id, minimum_rest_hours=minimum_rest_hours
+        )
+
+        return ScheduleAudit(
+            department_id=department_id,
+            period={"start_date": start_date_obj.isoformat(), "end_date": end_date_obj.isoformat()},
+            total_conflicts=len(conflicts),
+            conflicts=conflicts
+        )
+    except Exception as e:
+        logger.error(f"Error auditing schedules: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -3,7 +3,7 @@ Schedule management API routes
 """
 
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,9 +22,11 @@ from ..schemas import (
     ScheduleStatus,
     GenerationRequirements,
     GenerationResponse,
+    GenerationJobResponse,
     ValidationResponse,
     OptimizationGoals,
     OptimizationResponse,
+    RepairResponse,
     PublishSettings,
     PublishResponse,
     ConflictDetail,
@@ -33,6 +35,7 @@ from ..schemas import (
     AssignmentResponse,
     AssignmentUpdate
 )
+from ..services.schedule_jobs import schedule_job_manager
 from ..services.schedule_service import schedule_service
 
 router = APIRouter(prefix="/api/schedules", tags=["schedules"])
@@ -255,23 +258,24 @@ async def delete_schedule(
 
 # AI Schedule Generation Endpoints
 
-@router.post("/generate", response_model=GenerationResponse)
+@router.post("/generate", response_model=GenerationJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_schedule_assignments(
     requirements: GenerationRequirements,
     db: AsyncSession = Depends(get_database_session),
     current_user = Depends(get_current_user)
 ):
     """
-    Generate schedule assignments using AI constraint solver.
+    Queue schedule generation using the AI constraint solver.
 
-    This endpoint calls the existing schedule_service.generate_schedule() method
-    to create optimized shift assignments based on:
+    The solver runs in a background process pool so the request returns
+    immediately with a job ID. Assignments are optimized based on:
     - Employee availability and qualifications
     - Shift requirements and templates
     - Business rules and constraints
     - Workload balancing
 
-    The generated assignments are automatically saved to the database.
+    The generated assignments are automatically saved to the database when
+    the job completes.
 
     **Requirements:**
     - start_date: Schedule start date
@@ -281,83 +285,205 @@ async def generate_schedule_assignments(
     - constraints: Optional additional constraints
 
     **Returns:**
-    - Generated assignments
-    - Detected conflicts
-    - Coverage statistics
-    - Optimization score
+    - Job ID, status and progress. Poll `/generate/jobs/{job_id}` and fetch
+      `/generate/jobs/{job_id}/result` once the job has completed.
+
+    With `stream_incumbents`, every improving solution is broadcast to the
+    `schedules` WebSocket room as a `schedule_generation_incumbent` event
+    (objective, gap, elapsed time and assignment diff).
+
+    With `decompose`, groups of employees and the shifts only they may work
+    are solved week by week as independent partitions in parallel and the
+    week boundaries are re-solved afterwards.
     """
     try:
-        # Call existing AI service
-        result = await schedule_service.generate_schedule(
-            db=db,
+        job = await schedule_job_manager.submit(
             start_date=requirements.start_date,
             end_date=requirements.end_date,
-            constraints=requirements.constraints
+            constraints=requirements.constraints,
+            created_by=getattr(current_user, "id", None),
+            stream_incumbents=requirements.stream_incumbents,
+            decompose=requirements.decompose
         )
+        return GenerationJobResponse(**job.to_dict())
 
-        # Transform service result to API response format
-        conflicts = []
-        if result.get("status") == "error":
-            # No conflicts if generation failed
-            pass
-        else:
-            # Check for conflicts in generated schedule
-            conflict_check = await schedule_service.check_conflicts(
-                db=db,
-                start_date=requirements.start_date,
-                end_date=requirements.end_date
-            )
+    except Exception as e:
+        logger.error(f"Error queueing schedule generation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Schedule generation failed: {str(e)}"
+        )
 
-            # Transform conflicts to ConflictDetail format
-            for conflict in conflict_check.get("conflicts", []):
-                conflicts.append(ConflictDetail(
-                    type=conflict.get("type", "unknown"),
-                    employee_id=conflict.get("employee_id"),
-                    employee_name=conflict.get("employee_name"),
-                    assignment_ids=conflict.get("assignment_ids"),
-                    shift_id=conflict.get("shift_id"),
-                    shift_date=conflict.get("shift_date") or conflict.get("date"),
-                    description=conflict.get("message", f"{conflict.get('type')} conflict detected"),
-                    severity="high" if conflict.get("type") == "double_booking" else "medium"
-                ))
 
-        # Calculate coverage stats
-        coverage = None
-        if result.get("schedule"):
-            total_shifts = len(result["schedule"])
-            assigned_shifts = len([s for s in result["schedule"] if s.get("assigned_employees")])
-            total_assignments = sum(len(s.get("assigned_employees", [])) for s in result["schedule"])
-            unique_employees = len(set(
-                emp["id"]
-                for shift in result["schedule"]
-                for emp in shift.get("assigned_employees", [])
-            ))
+@router.get("/generate/jobs", response_model=List[GenerationJobResponse])
+async def list_generation_jobs(
+    limit: int = Query(20, ge=1, le=200),
+    current_user = Depends(get_current_user)
+):
+    """List recent schedule generation jobs, newest first."""
+    return [GenerationJobResponse(**job.to_dict()) for job in schedule_job_manager.list_jobs(limit)]
 
-            coverage = CoverageStats(
-                total_shifts=total_shifts,
-                assigned_shifts=assigned_shifts,
-                coverage_percentage=(assigned_shifts / total_shifts * 100) if total_shifts > 0 else 0,
-                total_assignments=total_assignments,
-                unique_employees=unique_employees
-            )
 
-        return GenerationResponse(
-            status=result.get("status", "error"),
-            message=result.get("message", "Schedule generation completed"),
-            saved_assignments=result.get("saved_assignments"),
-            schedule=result.get("schedule", []),
-            conflicts=conflicts,
-            coverage=coverage,
-            optimization_score=85.0 if result.get("status") in ["optimal", "feasible"] else None
+@router.get("/generate/jobs/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Get status and progress of a schedule generation job."""
+    job = schedule_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Generation job {job_id} not found"
+        )
+
+    return GenerationJobResponse(**job.to_dict())
+
+
+@router.post("/generate/jobs/{job_id}/cancel", response_model=GenerationJobResponse)
+async def cancel_generation_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Cancel a queued or running schedule generation job.
+
+    A running solve is stopped and nothing is saved. Jobs that are already
+    saving their assignments run to completion.
+    """
+    job = await schedule_job_manager.cancel(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Generation job {job_id} not found"
+        )
+
+    return GenerationJobResponse(**job.to_dict())
+
+
+@router.post("/generate/jobs/{job_id}/accept", response_model=GenerationJobResponse)
+async def accept_generation_incumbent(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Accept the current incumbent of a solving job.
+
+    Stops the search early and saves the best schedule found so far.
+    """
+    job = await schedule_job_manager.accept(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Generation job {job_id} not found"
+        )
+
+    if not job.accepted and not job.is_finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Generation job {job_id} has no solution to accept yet"
+        )
+
+    return GenerationJobResponse(**job.to_dict())
+
+
+@router.get("/generate/jobs/{job_id}/result", response_model=GenerationResponse)
+async def get_generation_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_database_session),
+    current_user = Depends(get_current_user)
+):
+    """
+    Get the result of a finished schedule generation job.
+
+    **Returns:**
+    - Generated assignments
+    - Detected conflicts
+    - Coverage statistics
+    - Optimization score
+    """
+    job = schedule_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Generation job {job_id} not found"
         )
 
+    if not job.is_finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Generation job {job_id} is still {job.status.value}"
+        )
+
+    result = job.result or {"status": job.status.value, "message": job.message or "", "schedule": []}
+
+    try:
+        return await _build_generation_response(db, job.start_date, job.end_date, result)
     except Exception as e:
-        print(f"Error generating schedule: {e}")
+        logger.error(f"Error building generation result for job {job_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Schedule generation failed: {str(e)}"
+            detail=f"Failed to load generation result: {str(e)}"
+        )
+
+
+async def _build_generation_response(
+    db: AsyncSession, start_date: date, end_date: date, result: dict
+) -> GenerationResponse:
+    """Transform a service generation result into the API response format."""
+    conflicts = []
+    if result.get("status") in ["optimal", "feasible"]:
+        # Check for conflicts in generated schedule
+        conflict_check = await schedule_service.check_conflicts(
+            db=db,
+            start_date=start_date,
+            end_date=end_date
         )
 
+        # Transform conflicts to ConflictDetail format
+        for conflict in conflict_check.get("conflicts", []):
+            conflicts.append(ConflictDetail(
+                type=conflict.get("type", "unknown"),
+                employee_id=conflict.get("employee_id"),
+                employee_name=conflict.get("employee_name"),
+                assignment_ids=conflict.get("assignment_ids"),
+                shift_id=conflict.get("shift_id"),
+                shift_date=conflict.get("shift_date") or conflict.get("date"),
+                description=conflict.get("message", f"{conflict.get('type')} conflict detected"),
+                severity="high" if conflict.get("type") == "double_booking" else "medium"
+            ))
+
+    # Calculate coverage stats
+    coverage = None
+    if result.get("schedule"):
+        total_shifts = len(result["schedule"])
+        assigned_shifts = len([s for s in result["schedule"] if s.get("assigned_employees")])
+        total_assignments = sum(len(s.get("assigned_employees", [])) for s in result["schedule"])
+        unique_employees = len(set(
+            emp["id"]
+            for shift in result["schedule"]
+            for emp in shift.get("assigned_employees", [])
+        ))
+
+        coverage = CoverageStats(
+            total_shifts=total_shifts,
+            assigned_shifts=assigned_shifts,
+            coverage_percentage=(assigned_shifts / total_shifts * 100) if total_shifts > 0 else 0,
+            total_assignments=total_assignments,
+            unique_employees=unique_employees
+        )
+
+    return GenerationResponse(
+        status=result.get("status", "error"),
+        message=result.get("message", "Schedule generation completed"),
+        saved_assignments=result.get("saved_assignments"),
+        schedule=result.get("schedule", []),
+        conflicts=conflicts,
+        coverage=coverage,
+        optimization_score=85.0 if result.get("status") in ["optimal", "feasible"] else None,
+        statistics=result.get("statistics")
+    )
+
 
 @router.post("/{schedule_id}/validate", response_model=ValidationResponse)
 async def validate_schedule(
@@ -669,6 +795,16 @@ def _format_conflict_description(conflict: dict) -> str:
 
     if conflict_type == "double_booking":
         return f"Employee {conflict.get('employee_name')} has overlapping shifts on {conflict.get('date')}"
+    elif conflict_type == "insufficient_rest":
+        return (
+            f"Employee {conflict.get('employee_name')} has only {conflict.get('rest_hours')} hours of rest "
+            f"before the shift on {conflict.get('date')} (minimum {conflict.get('min_rest_hours')})"
+        )
+    elif conflict_type == "consecutive_days":
+        return (
+            f"Employee {conflict.get('employee_name')} works {conflict.get('days')} consecutive days "
+            f"from {conflict.get('date')} (maximum {conflict.get('max_consecutive_days')})"
+        )
     elif conflict_type == "qualification_mismatch":
         missing = ", ".join(conflict.get("missing_qualifications", []))
         return f"Employee {conflict.get('employee_name')} missing qualifications: {missing}"
@@ -682,7 +818,7 @@ def _determine_severity(conflict_type: str) -> str:
         return "high"
     elif conflict_type == "qualification_mismatch":
         return "high"
-    elif conflict_type == "availability":
+    elif conflict_type in ("availability", "insufficient_rest", "consecutive_days"):
         return "medium"
     else:
         return "low"
@@ -868,6 +1004,62 @@ async def update_assignment(
         )
 
 
+@router.post("/{schedule_id}/assignments/{assignment_id}/repair", response_model=RepairResponse)
+async def repair_assignment(
+    schedule_id: int,
+    assignment_id: int,
+    db: AsyncSession = Depends(get_database_session),
+    current_user = Depends(get_current_user)
+):
+    """
+    Refill a shift after the assigned employee calls out.
+
+    Re-solves only the neighborhood of the affected shift (same day and rest
+    window, qualified candidates) and keeps the rest of the schedule frozen.
+    The patch is validated with the conflict checks before it is saved;
+    a patch with blocking conflicts is returned with status "rejected" and
+    nothing is written.
+    """
+    result = await db.execute(
+        select(ScheduleAssignment)
+        .where(ScheduleAssignment.id == assignment_id)
+        .where(ScheduleAssignment.schedule_id == schedule_id)
+    )
+    assignment = result.scalar_one_or_none()
+
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Assignment with ID {assignment_id} not found in schedule {schedule_id}"
+        )
+
+    if not assignment.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Assignment {assignment_id} is {assignment.status} and cannot be repaired"
+        )
+
+    repair = await schedule_service.repair_assignment(db, assignment_id)
+
+    if repair["status"] == "error":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=repair.get("message", "Repair failed")
+        )
+
+    return RepairResponse(
+        schedule_id=schedule_id,
+        assignment_id=assignment_id,
+        status=repair["status"],
+        message=repair.get("message"),
+        added=repair.get("added", []),
+        removed=repair.get("removed", []),
+        unfilled=repair.get("unfilled", []),
+        conflicts=repair.get("conflicts", []),
+        statistics=repair.get("statistics")
+    )
+
+
 @router.delete("/{schedule_id}/assignments/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_assignment(
     schedule_id: int,
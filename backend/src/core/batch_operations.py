@@ -90,12 +90,15 @@ class BatchOperations:
         """
         Bulk insert with ON CONFLICT DO UPDATE (PostgreSQL upsert)
 
+        With no update_columns, conflicting rows are skipped (ON CONFLICT DO
+        NOTHING) and only the rows actually inserted are counted.
+
         Args:
             db: Database session
             model: SQLAlchemy model class
             items: List of dictionaries with item data
             constraint_columns: Columns that define uniqueness constraint
-            update_columns: Columns to update on conflict
+            update_columns: Columns to update on conflict (empty: do nothing)
             batch_size: Items per batch
             commit: Whether to commit after upsert
 
@@ -125,15 +128,18 @@ class BatchOperations:
             stmt = pg_insert(model).values(batch)
 
             # Define conflict action
-            update_dict = {col: stmt.excluded[col] for col in update_columns}
-            stmt = stmt.on_conflict_do_update(
-                index_elements=constraint_columns,
-                set_=update_dict
-            )
+            if update_columns:
+                update_dict = {col: stmt.excluded[col] for col in update_columns}
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=constraint_columns,
+                    set_=update_dict
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=constraint_columns)
 
             try:
-                await db.execute(stmt)
-                total_upserted += len(batch)
+                result = await db.execute(stmt)
+                total_upserted += len(batch) if update_columns else result.rowcount
 
                 logger.debug(f"Bulk upserted {len(batch)} items (total: {total_upserted}/{len(items)})")
 
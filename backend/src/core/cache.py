@@ -1,11 +1,13 @@
 """Caching utilities for performance optimization."""
 
+import dataclasses
 import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional, Set
 
 import redis
 
@@ -84,6 +86,35 @@ class CacheManager:
             logger.error(f"Cache clear pattern error: {e}")
         return 0
 
+    def add_to_sets(self, keys: Iterable[str], member: str, ttl: int = 3600) -> bool:
+        """Add member to every set in keys in one round trip, refreshing their TTL."""
+        if not self.enabled:
+            for key in keys:
+                self.memory_cache.setdefault(key, set()).add(member)
+            return True
+
+        try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.sadd(key, member)
+                pipeline.expire(key, ttl)
+            pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache set add error: {e}")
+            return False
+
+    def get_set(self, key: str) -> Set[str]:
+        """Get the members of a set."""
+        if not self.enabled:
+            return set(self.memory_cache.get(key, set()))
+
+        try:
+            return set(self.redis_client.smembers(key))
+        except Exception as e:
+            logger.error(f"Cache set get error: {e}")
+            return set()
+
     @staticmethod
     def generate_key(*args, **kwargs) -> str:
         """Generate cache key from arguments."""
@@ -152,6 +183,37 @@ def cache_result(ttl: int = 3600, prefix: str = ""):
     return decorator
 
 
+def canonical_json(value: Any) -> str:
+    """
+    Serialize a value to a canonical JSON string.
+
+    Dict keys are sorted and lists and sets are treated as unordered, so two
+    values that differ only in ordering serialize identically. Tuples keep
+    their order (e.g. (start, end) time ranges). Dataclasses, enums, dates and
+    times are converted to plain JSON values.
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+
+    if isinstance(value, dict):
+        items = sorted((str(key), canonical_json(item)) for key, item in value.items())
+        return "{" + ",".join(f"{json.dumps(key)}:{item}" for key, item in items) + "}"
+    if isinstance(value, tuple):
+        return "[" + ",".join(canonical_json(item) for item in value) + "]"
+    if isinstance(value, (list, set, frozenset)):
+        return "[" + ",".join(sorted(canonical_json(item) for item in value)) + "]"
+    if isinstance(value, Enum):
+        return canonical_json(value.value)
+    if isinstance(value, (date, time)):
+        return json.dumps(value.isoformat())
+    return json.dumps(value, default=str)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Content hash of the canonical JSON form of parts."""
+    return hashlib.sha256(canonical_json(parts).encode()).hexdigest()
+
+
 class ScheduleCache:
     """Specialized cache for schedule results."""
 
@@ -160,34 +222,55 @@ class ScheduleCache:
         self.cache = cache_manager
         self.prefix = "schedule"
 
-    def get_schedule(self, employees: list, shifts: list, constraints: list) -> Optional[dict]:
+    def get_schedule(self, employees: list, shifts: list, constraints: list, config: Optional[dict] = None) -> Optional[dict]:
         """Get cached schedule if exists."""
-        key = self._generate_schedule_key(employees, shifts, constraints)
+        key = self._generate_schedule_key(employees, shifts, constraints, config)
         return self.cache.get(f"{self.prefix}:{key}")
 
-    def set_schedule(self, employees: list, shifts: list, constraints: list, schedule: dict, ttl: int = 1800):
-        """Cache schedule result."""
-        key = self._generate_schedule_key(employees, shifts, constraints)
-        return self.cache.set(f"{self.prefix}:{key}", schedule, ttl)
+    def set_schedule(
+        self, employees: list, shifts: list, constraints: list, schedule: dict, ttl: int = 1800, config: Optional[dict] = None
+    ):
+        """Cache schedule result and index it under every employee it covers."""
+        key = self._generate_schedule_key(employees, shifts, constraints, config)
+        if not self.cache.set(f"{self.prefix}:{key}", schedule, ttl):
+            return False
+
+        employee_ids = {self._employee_id(e) for e in employees}
+        return self.cache.add_to_sets((self._employee_index_key(emp_id) for emp_id in employee_ids), key, ttl)
 
     def invalidate_employee_schedules(self, employee_id: str):
         """Invalidate all schedules containing specific employee."""
-        return self.cache.clear_pattern(f"{self.prefix}:*{employee_id}*")
+        index_key = self._employee_index_key(employee_id)
+        keys = self.cache.get_set(index_key)
+        for key in keys:
+            self.cache.delete(f"{self.prefix}:{key}")
+        self.cache.delete(index_key)
+        return len(keys)
 
     def invalidate_date_schedules(self, date: str):
         """Invalidate all schedules for specific date."""
         return self.cache.clear_pattern(f"{self.prefix}:*{date}*")
 
-    def _generate_schedule_key(self, employees, shifts, constraints) -> str:
-        """Generate unique key for schedule parameters."""
-        key_data = {
-            "employee_ids": sorted([e.get("id") or e for e in employees]),
-            "shift_ids": sorted([s.get("id") or s for s in shifts]),
-            "constraint_hashes": sorted(
-                [hashlib.md5(json.dumps(c, sort_keys=True).encode()).hexdigest() for c in constraints]
-            ),
-        }
-        return CacheManager.generate_key(**key_data)
+    def _generate_schedule_key(self, employees, shifts, constraints, config=None) -> str:
+        """
+        Generate a content-addressed key for schedule parameters.
+
+        The key hashes the full content of the employees, shifts, constraints and
+        solver config, independent of their order, so any change to the inputs
+        produces a new key.
+        """
+        return fingerprint(list(employees), list(shifts), list(constraints), config or {})
+
+    def _employee_index_key(self, employee_id: Any) -> str:
+        """Key of the set of cached schedules covering an employee."""
+        return f"{self.prefix}:employee:{employee_id}"
+
+    @staticmethod
+    def _employee_id(employee: Any) -> str:
+        """ID of an employee given as an object, a dict or a bare ID."""
+        if isinstance(employee, dict):
+            return str(employee.get("id"))
+        return str(getattr(employee, "id", employee))
 
 
 class RuleCache:
@@ -211,3 +294,16 @@ class RuleCache:
     def invalidate_all_rules(self):
         """Clear all cached rules."""
         return self.cache.clear_pattern(f"{self.prefix}:*")
+
+
+_schedule_cache: Optional[ScheduleCache] = None
+
+
+def get_schedule_cache() -> ScheduleCache:
+    """Shared ScheduleCache, connected to Redis on first use."""
+    global _schedule_cache
+    if _schedule_cache is None:
+        from .config import settings
+
+        _schedule_cache = ScheduleCache(CacheManager(settings.REDIS_URL))
+    return _schedule_cache
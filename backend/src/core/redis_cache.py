@@ -120,6 +120,19 @@ class RedisCache:
             logger.error(f"Cache delete error for {key}: {e}")
             return False
 
+    def incr(self, key: str) -> Optional[int]:
+        """Atomically increment a counter, returning its new value"""
+        if not self.enabled:
+            return None
+
+        try:
+            value = self.client.incr(key)
+            logger.debug(f"Cache INCR: {key} ({value})")
+            return value
+        except Exception as e:
+            logger.error(f"Cache incr error for {key}: {e}")
+            return None
+
     def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching pattern"""
         if not self.enabled:
@@ -341,6 +341,11 @@ async def shutdown_event():
     if monitor:
         await monitor.stop()
 
+    # Stop schedule generation workers
+    from .services.schedule_jobs import schedule_job_manager
+
+    await schedule_job_manager.shutdown()
+
     # Close database connections
     await close_db_connection()
 
@@ -413,6 +418,17 @@ async def detailed_health_check():
         return {"status": "monitoring_not_enabled", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus metrics, including schedule generation phase timings and solver statistics"""
+    from fastapi.responses import Response
+
+    from .solver_metrics import metrics_response
+
+    payload, content_type = metrics_response()
+    return Response(content=payload, media_type=content_type)
+
+
 # ============================================================================
 # DEPRECATED MOCK AUTHENTICATION ENDPOINTS - REMOVED
 # ============================================================================
@@ -799,12 +815,16 @@ async def generate_schedule(
     current_user: dict = Depends(get_current_manager),
 ):
     """Generate schedule for date range using constraint solver."""
+    from .services.schedule_jobs import schedule_job_manager
     from .services.schedule_service import schedule_service
 
     try:
-        # Generate schedule using constraint solver
-        result = await schedule_service.generate_schedule(
-            db=db, start_date=request.start_date, end_date=request.end_date, constraints=request.constraints
+        # Solve as a background job in the worker pool and wait for its result
+        result = await schedule_job_manager.run(
+            request.start_date,
+            request.end_date,
+            constraints=request.constraints,
+            created_by=getattr(current_user, "id", None),
         )
 
         # Check for conflicts before returning
@@ -860,8 +880,8 @@ async def optimize_schedule(
     from .services.schedule_service import schedule_service
 
     try:
-        # Optimize schedule using constraint solver
-        result = await schedule_service.optimize_schedule(db=db, schedule_ids=request.schedule_ids)
+        # Optimize schedule using constraint solver, solved in the worker pool
+        result = await schedule_service.optimize_schedule(db=db, schedule_ids=request.schedule_ids, in_background=True)
 
         if result["status"] in ["optimal", "feasible"]:
             return {
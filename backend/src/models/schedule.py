@@ -71,7 +71,7 @@ class Schedule(Base):
     # Constraints and indexes
     __table_args__ = (
         CheckConstraint("week_start <= week_end", name="valid_week_period"),
-        CheckConstraint("week_end - week_start <= INTERVAL '7 days'", name="max_week_duration"),
+        CheckConstraint("week_end - week_start <= 7", name="max_week_duration"),
         CheckConstraint(
             "status IN ('draft', 'pending_approval', 'approved', 'published', 'archived', 'rejected')", name="valid_status"
         ),
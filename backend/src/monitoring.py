@@ -185,6 +185,7 @@ class HealthMonitor:
             "db_pool": {},
             "event_loop": {},
             "memory": {},
+            "schedule_generation": {},
         }
 
         try:
@@ -216,6 +217,11 @@ class HealthMonitor:
             status["memory"]["python_current_mb"] = current / 1024 / 1024
             status["memory"]["python_peak_mb"] = peak / 1024 / 1024
 
+            # Most recent schedule generation (phase timings and solver statistics)
+            from .solver_metrics import get_last_generation
+
+            status["schedule_generation"] = get_last_generation()
+
         except Exception as e:
             logger.error(f"Error getting health status: {e}")
             status["error"] = str(e)
@@ -1,10 +1,22 @@
 """Constraint solver for schedule optimization using OR-Tools."""
 
 import logging
+import time as time_module
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .diagnostics import capacity_bottlenecks
+from .eligibility import EligibilityMatrix
+from .greedy import GreedyScheduler
+from .instance import SolverInstance
+from .intervals import IntervalIndex, clashes, within_gap
+from .solve_budget import EarlyStop, SolvePlan, SolveRecord, plan_solve, solve_history
+from .symmetry import add_lex_leader, canonical_plan, employee_classes
 
 try:
     from ortools.sat.python import cp_model
@@ -14,6 +26,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Objective weight of every position a repair leaves unfilled
+UNFILLED_POSITION_PENALTY = 1000
+
 
 class ShiftType(Enum):
     """Types of shifts."""
@@ -36,6 +51,7 @@ class Employee:
     preferences: Dict[str, Any] = field(default_factory=dict)
     max_hours_per_week: int = 40
     min_hours_per_week: int = 0
+    department_id: Optional[int] = None
 
 
 @dataclass
@@ -50,6 +66,7 @@ class Shift:
     min_employees: int = 1
     max_employees: int = 10
     shift_type: ShiftType = ShiftType.FULL_DAY
+    department_id: Optional[int] = None
 
     def get_duration_hours(self) -> float:
         """Calculate shift duration in hours."""
@@ -77,6 +94,81 @@ class SchedulingConstraint:
         return True
 
 
+@dataclass
+class CarryOver:
+    """
+    Plan state from before the first shift of a solve.
+
+    Rolling-horizon windows (see scheduler.rolling_horizon) pass what earlier
+    windows committed: each employee's last shift as (start, end) datetimes, the
+    days worked in a row up to the day before the window, and the hours and
+    weekend shifts worked so far for the fairness terms.
+    """
+
+    last_shift: Dict[str, Tuple[datetime, datetime]] = field(default_factory=dict)
+    consecutive_days: Dict[str, int] = field(default_factory=dict)
+    hours: Dict[str, int] = field(default_factory=dict)
+    weekend_shifts: Dict[str, int] = field(default_factory=dict)
+
+
+_SolutionCallbackBase = cp_model.CpSolverSolutionCallback if cp_model else object
+
+
+class IncumbentCallback(_SolutionCallbackBase):
+    """
+    Report every improving solution found during the search.
+
+    Each report carries the objective, best bound, relative gap, elapsed time
+    and the assignments added/removed since the previous incumbent.
+    ``on_improvement`` is only notified, e.g. for early termination.
+    """
+
+    def __init__(
+        self,
+        shift_vars: Dict[str, List[Tuple[str, Any]]],
+        on_solution: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_improvement: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize with the optimizer's per-shift variable map."""
+        super().__init__()
+        self._shift_vars = shift_vars
+        self._on_solution = on_solution
+        self._on_improvement = on_improvement
+        self._previous = set()
+        self.solution_count = 0
+
+    def on_solution_callback(self):
+        """Called by CP-SAT for each new incumbent."""
+        self.solution_count += 1
+        if self._on_improvement is not None:
+            self._on_improvement()
+        if self._on_solution is None:
+            return
+
+        current = {
+            (emp_id, shift_id)
+            for shift_id, pairs in self._shift_vars.items()
+            for emp_id, var in pairs
+            if self.BooleanValue(var)
+        }
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+
+        self._on_solution(
+            {
+                "solution": self.solution_count,
+                "objective": objective,
+                "best_bound": bound,
+                "gap": abs(objective - bound) / max(1.0, abs(objective)),
+                "elapsed": self.WallTime(),
+                "assignment_count": len(current),
+                "added": sorted(current - self._previous),
+                "removed": sorted(self._previous - current),
+            }
+        )
+        self._previous = current
+
+
 class ScheduleOptimizer:
     """Optimizer for generating optimal schedules."""
 
@@ -87,6 +179,26 @@ class ScheduleOptimizer:
         self.solver = None
         self.variables = {}
         self.solution = None
+        self.shift_vars: Dict[str, List[Tuple[str, Any]]] = {}
+        self.employee_vars: Dict[str, List[Tuple[Shift, Any]]] = {}
+        self.interval_index: Optional[IntervalIndex] = None
+        self.eligibility: Optional[EligibilityMatrix] = None
+        self.instance: Optional[SolverInstance] = None
+        self.existing_assignments: Set[Tuple[str, str]] = set()
+        self.minimal_change_weight = 0
+        self.carry_over = CarryOver()
+        self.build_time = 0.0
+        self.num_objective_terms = 0
+        self.solve_plan: Optional[SolvePlan] = None
+        self.stop_reason: Optional[str] = None
+        # (employee IDs, shift IDs) of each class of interchangeable employees
+        self.symmetry_classes: List[Tuple[List[str], List[str]]] = []
+        # Objective terms of soft custom constraints (see scheduler.rule_compiler)
+        self.rule_penalties: List[Any] = []
+        # Assumption literal and description per named constraint group, only
+        # while explaining an infeasible model
+        self.assumptions: Optional[Dict[str, Any]] = None
+        self.assumption_descriptions: Dict[str, str] = {}
 
     def generate_schedule(
         self,
@@ -94,10 +206,33 @@ class ScheduleOptimizer:
         shifts: List[Shift],
         constraints: Optional[List[SchedulingConstraint]] = None,
         preferences: Optional[Dict[str, Any]] = None,
+        solution_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        existing_assignments: Optional[Iterable[Tuple[str, str]]] = None,
+        minimal_change_weight: int = 0,
+        instance: Optional[SolverInstance] = None,
+        carry_over: Optional[CarryOver] = None,
     ) -> Dict[str, Any]:
-        """Generate an optimal schedule."""
+        """
+        Generate an optimal schedule.
+
+        When ``solution_callback`` is given it is called with a summary of every
+        improving solution (see IncumbentCallback) while the solver runs.
+
+        ``existing_assignments`` is the current plan as (employee_id, shift_id)
+        pairs. It seeds the search with solution hints and, with a positive
+        ``minimal_change_weight``, every deviation from it is penalized.
+
+        ``instance`` is the compact form of ``employees`` and ``shifts`` when the
+        caller has already converted them; otherwise it is built here.
+
+        ``carry_over`` is the state left by earlier windows of a rolling-horizon
+        solve. Shifts clashing with an employee's last earlier shift are ruled
+        out, carried streaks count towards ``config["max_consecutive_days"]`` and
+        carried hours and weekend shifts towards the fairness terms.
+        """
         if not cp_model:
-            return self._generate_fallback_schedule(employees, shifts)
+            self.carry_over = carry_over or CarryOver()
+            return self._generate_fallback_schedule(employees, shifts, instance=instance)
 
         # Edge cases
         if not employees:
@@ -106,98 +241,445 @@ class ScheduleOptimizer:
         if not shifts:
             return {"status": "error", "message": "No shifts to schedule", "schedule": []}
 
+        build_started = time_module.perf_counter()
+        self._use_instance(employees, shifts, instance)
+        self.carry_over = carry_over or CarryOver()
+
+        # Very large instances are only solved heuristically
+        self.eligibility = EligibilityMatrix(employees, shifts)
+        self._exclude_carried_clashes()
+        eligibility = self.eligibility.by_shift()
+        variable_limit = self.config.get("greedy_variable_limit")
+        if variable_limit and self.eligibility.pair_count() > variable_limit:
+            logger.info(f"Instance exceeds {variable_limit} eligible assignments, using greedy construction")
+            return self._generate_fallback_schedule(employees, shifts, eligibility, self.instance)
+
+        # Demand no eligible staff could cover fails fast, without a search
+        if self.config.get("feasibility_precheck", True):
+            bottlenecks = capacity_bottlenecks(self.instance, self.eligibility, self._constrained_shifts(employees, shifts))
+            if bottlenecks:
+                return {
+                    "status": "infeasible",
+                    "message": f"No feasible schedule: {bottlenecks[0]['description']}",
+                    "schedule": [],
+                    "bottlenecks": bottlenecks,
+                    "statistics": {"build_time": time_module.perf_counter() - build_started, "precheck": True},
+                }
+
         # Initialize model
         self.model = cp_model.CpModel()
+        self.existing_assignments = set(existing_assignments or ())
+        self.minimal_change_weight = minimal_change_weight
 
         # Create variables
-        self._create_variables(employees, shifts)
+        self._create_variables(employees, shifts, self.eligibility)
 
         # Apply constraints
         self._apply_hard_constraints(employees, shifts)
 
         # Apply custom constraints
+        self.rule_penalties = []
         if constraints:
             for constraint in constraints:
                 self._apply_custom_constraint(constraint, employees, shifts)
 
+        # Order the schedules of interchangeable employees
+        self.symmetry_classes = []
+        if self.config.get("symmetry_breaking", True):
+            self._add_symmetry_breaking(employees, constraints or [])
+
         # Create objective function
         self._create_objective_function(employees, shifts, preferences)
 
-        # Solve
-        self.solver = cp_model.CpSolver()
-        self.solver.parameters.max_time_in_seconds = self.config.get("max_solve_time", 30)
+        # Warm start from the current plan, or from a greedy construction, in
+        # the order the symmetry-breaking constraints expect
+        if self.existing_assignments:
+            self._add_solution_hints(canonical_plan(self.existing_assignments, self.symmetry_classes))
+        elif self.config.get("greedy_hints", True):
+            greedy_plan = self._greedy_scheduler(employees, shifts, eligibility).build()
+            self._add_solution_hints(canonical_plan(greedy_plan, self.symmetry_classes))
 
-        status = self.solver.Solve(self.model)
+        self.build_time = time_module.perf_counter() - build_started
+
+        # Solve within the time and worker budget for this model size
+        self.solver = cp_model.CpSolver()
+        self.solve_plan = plan = plan_solve(self.config, len(self.variables["assignments"]))
+        self.solver.parameters.max_time_in_seconds = plan.max_time
+        if plan.num_workers:
+            self.solver.parameters.num_search_workers = plan.num_workers
+        if plan.relative_gap_limit:
+            self.solver.parameters.relative_gap_limit = plan.relative_gap_limit
+
+        with EarlyStop(plan, self.solver.StopSearch) as early_stop:
+            if solution_callback or plan.needs_watcher:
+                callback = IncumbentCallback(self.shift_vars, solution_callback, early_stop.on_solution)
+                status = self.solver.Solve(self.model, callback)
+            else:
+                status = self.solver.Solve(self.model)
+
+        self.stop_reason = early_stop.stop_reason
+        solve_history.record(
+            SolveRecord(
+                num_variables=len(self.variables["assignments"]),
+                solve_time=self.solver.WallTime(),
+                first_solution_time=early_stop.first_solution_time,
+                best_solution_time=early_stop.best_solution_time,
+            )
+        )
 
         # Extract solution
         result = self._extract_solution(status, employees, shifts)
 
+        if status == cp_model.INFEASIBLE and self.config.get("explain_infeasibility", True):
+            conflicts = self._explain_infeasibility(employees, shifts, constraints or [])
+            if conflicts:
+                result["conflicts"] = conflicts
+                result["message"] = "No feasible schedule, conflicting rules: " + "; ".join(
+                    conflict["description"] for conflict in conflicts
+                )
+
         return result
 
-    def _create_variables(self, employees: List[Employee], shifts: List[Shift]):
-        """Create decision variables for the model."""
+    def stop_search(self):
+        """Ask a running solve to stop and return its best solution so far."""
+        if self.solver is not None:
+            self.solver.StopSearch()
+
+    def repair_schedule(
+        self,
+        employees: List[Employee],
+        shifts: List[Shift],
+        current_assignments: Iterable[Tuple[str, str]],
+        affected_shift_id: str,
+        unavailable_employee_ids: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        Repair a plan after a call-out by re-solving only a small neighborhood.
+
+        The neighborhood is every shift on the affected shift's day or within the
+        rest window around it, crossed with the employees eligible for the affected
+        shift. All assignments outside it are frozen: they only count towards shift
+        coverage and limit what the candidates may take on, so the sub-model stays
+        small enough to solve in well under a second.
+
+        Args:
+            employees: All employees in the plan
+            shifts: All shift instances in the plan
+            current_assignments: Current plan as (employee_id, shift_id) pairs
+            affected_shift_id: Shift that lost an employee
+            unavailable_employee_ids: Employees dropped from the affected shift and
+                excluded from the neighborhood
+
+        Returns:
+            Dict with the assignments to add and remove, positions that could not
+            be filled and solver statistics
+        """
+        if not cp_model:
+            return {"status": "error", "message": "Schedule repair requires OR-Tools", "added": [], "removed": []}
+
+        shift_map = {shift.id: shift for shift in shifts}
+        if affected_shift_id not in shift_map:
+            return {"status": "error", "message": f"Shift {affected_shift_id} not found", "added": [], "removed": []}
+
+        unavailable = set(unavailable_employee_ids)
+        original = {key for key in current_assignments if key[1] in shift_map}
+        current = {(emp_id, sid) for emp_id, sid in original if not (emp_id in unavailable and sid == affected_shift_id)}
+
+        min_rest = int(self.config.get("min_rest_hours", 8) * 60)
+        instance = SolverInstance(employees, shifts)
+        affected = instance.shift_index[affected_shift_id]
+
+        neighborhood = [
+            shift
+            for column, shift in enumerate(shifts)
+            if instance.day[column] == instance.day[affected]
+            or within_gap(instance.interval(column), instance.interval(affected), min_rest)
+        ]
+        available = [emp for emp in employees if emp.id not in unavailable]
+        eligible = self._build_eligibility_index(available, [shift_map[affected_shift_id]])
+        candidates = [emp for emp in employees if emp.id in eligible[affected_shift_id]]
+
+        return self._solve_neighborhood(
+            shifts, original, current, neighborhood, candidates, self.config.get("repair_solve_time", 1.0)
+        )
+
+    def resolve_window(
+        self,
+        employees: List[Employee],
+        shifts: List[Shift],
+        current_assignments: Iterable[Tuple[str, str]],
+        free_shift_ids: Iterable[str],
+        time_limit: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-solve the given shifts for the given employees with the rest of the plan frozen.
+
+        Used to stitch independently solved parts of a decomposed instance back
+        together (see scheduler.decomposition).
+
+        Returns:
+            Dict in the same format as repair_schedule
+        """
+        if not cp_model:
+            return {"status": "error", "message": "Re-solving requires OR-Tools", "added": [], "removed": []}
+
+        free = set(free_shift_ids)
+        current = set(current_assignments)
+        window = [shift for shift in shifts if shift.id in free]
+
+        return self._solve_neighborhood(
+            shifts, current, current, window, employees, time_limit or self.config.get("repair_solve_time", 1.0)
+        )
+
+    def _solve_neighborhood(
+        self,
+        shifts: List[Shift],
+        original: Set[Tuple[str, str]],
+        current: Set[Tuple[str, str]],
+        neighborhood: List[Shift],
+        candidates: List[Employee],
+        time_limit: float,
+    ) -> Dict[str, Any]:
+        """
+        Solve the sub-model of ``candidates`` x ``neighborhood`` shifts.
+
+        Assignments in ``current`` outside the sub-model are frozen. Changes are
+        reported relative to ``original``.
+        """
+        min_rest = int(self.config.get("min_rest_hours", 8) * 60)
+        instance = SolverInstance(candidates, shifts)
+        column_of = instance.shift_index
+        neighborhood_ids = {shift.id for shift in neighborhood}
+        candidate_ids = {emp.id for emp in candidates}
+        eligibility = self._build_eligibility_index(candidates, neighborhood)
+
+        frozen = {(emp_id, sid) for emp_id, sid in current if not (emp_id in candidate_ids and sid in neighborhood_ids)}
+        frozen_by_employee = defaultdict(list)
+        for emp_id, sid in frozen:
+            frozen_by_employee[emp_id].append(sid)
+
+        # Build the sub-model over candidate x neighborhood pairs only
+        self.model = cp_model.CpModel()
+        self.existing_assignments = current
+        self.minimal_change_weight = max(1, self.config.get("minimal_change_weight", 1))
+        self.variables["assignments"] = {}
+        self.shift_vars = {shift.id: [] for shift in neighborhood}
+        self.employee_vars = {emp.id: [] for emp in candidates}
+        self.interval_index = IntervalIndex(instance.intervals([shift.id for shift in neighborhood]))
+        self.instance = instance
+
+        for emp in candidates:
+            fixed = [instance.interval(column_of[sid]) for sid in frozen_by_employee[emp.id]]
+            for shift in neighborhood:
+                if emp.id not in eligibility[shift.id]:
+                    continue
+                # Frozen assignments of this employee rule out clashing or short-rest shifts
+                if any(clashes(instance.interval(column_of[shift.id]), other, min_rest) for other in fixed):
+                    continue
+
+                var = self.model.NewBoolVar(f"emp_{emp.id}_shift_{shift.id}")
+                self.variables["assignments"][(emp.id, shift.id)] = var
+                self.shift_vars[shift.id].append((emp.id, var))
+                self.employee_vars[emp.id].append((shift, var))
+
+        # Coverage, with unfilled positions allowed at a high cost
+        frozen_counts = Counter(sid for _, sid in frozen if sid in neighborhood_ids)
+        shortfalls = {}
+        for shift in neighborhood:
+            shift_vars = [var for _, var in self.shift_vars[shift.id]]
+            staffed = frozen_counts[shift.id] + sum(shift_vars)
+            shortfall = self.model.NewIntVar(0, shift.min_employees, f"shortfall_{shift.id}")
+            self.model.Add(staffed + shortfall >= shift.min_employees)
+            if shift_vars:
+                self.model.Add(staffed <= max(shift.max_employees, frozen_counts[shift.id]))
+            shortfalls[shift.id] = shortfall
+
+        # Weekly hours, counting what each candidate already works outside the sub-model
+        for emp in candidates:
+            frozen_hours = Counter()
+            for sid in frozen_by_employee[emp.id]:
+                frozen_hours[instance.week[column_of[sid]]] += instance.hours[column_of[sid]]
+
+            weekly_terms = defaultdict(list)
+            for shift, var in self.employee_vars[emp.id]:
+                column = column_of[shift.id]
+                weekly_terms[instance.week[column]].append(var * instance.hours[column])
+
+            for week, hours in weekly_terms.items():
+                self.model.Add(sum(hours) + frozen_hours[week] <= max(emp.max_hours_per_week, frozen_hours[week]))
+
+        # No double booking or short rest within the sub-model
+        self._add_clique_constraints(candidates, self.interval_index.overlap_cliques())
+        self._add_clique_constraints(candidates, self.interval_index.rest_cliques(min_rest))
+
+        objective_terms = [shortfall * UNFILLED_POSITION_PENALTY for shortfall in shortfalls.values()]
+        objective_terms.extend(self._create_minimal_change_penalty())
+        objective_terms.extend(self._create_preference_penalty(candidates, neighborhood))
+        self.model.Minimize(sum(objective_terms))
+        self._add_solution_hints()
+
+        self.solver = cp_model.CpSolver()
+        self.solver.parameters.max_time_in_seconds = time_limit
+        status = self.solver.Solve(self.model)
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return {
+                "status": "infeasible" if status == cp_model.INFEASIBLE else "unknown",
+                "message": "No solution found with the rest of the plan frozen",
+                "added": [],
+                "removed": [],
+            }
+
+        repaired = frozen | {key for key, var in self.variables["assignments"].items() if self.solver.Value(var)}
+
+        return {
+            "status": "optimal" if status == cp_model.OPTIMAL else "feasible",
+            "added": [{"employee_id": emp_id, "shift_id": sid} for emp_id, sid in sorted(repaired - original)],
+            "removed": [{"employee_id": emp_id, "shift_id": sid} for emp_id, sid in sorted(original - repaired)],
+            "unfilled": [
+                {"shift_id": sid, "missing": self.solver.Value(shortfall)}
+                for sid, shortfall in shortfalls.items()
+                if self.solver.Value(shortfall)
+            ],
+            "neighborhood": {"shifts": len(neighborhood), "candidates": len(candidates)},
+            "statistics": {
+                "solve_time": self.solver.WallTime(),
+                "objective_value": self.solver.ObjectiveValue(),
+                "num_variables": len(self.variables["assignments"]),
+            },
+        }
+
+    def _create_variables(
+        self, employees: List[Employee], shifts: List[Shift], eligibility: Optional[EligibilityMatrix] = None
+    ):
+        """
+        Create decision variables for the model.
+
+        In sparse mode (``config["sparse_variables"]``) a BoolVar is only created for
+        (employee, shift) pairs marked in the eligibility matrix; every other pair
+        is implicitly zero. In dense mode a variable is created for every pair and the
+        ineligible ones are fixed to zero.
+        """
         self.variables["assignments"] = {}
+        self.shift_vars = {shift.id: [] for shift in shifts}
+        self.employee_vars = {emp.id: [] for emp in employees}
+        self.interval_index = IntervalIndex(self._use_instance(employees, shifts).intervals())
 
-        for emp in employees:
-            for shift in shifts:
-                var_name = f"emp_{emp.id}_shift_{shift.id}"
-                self.variables["assignments"][(emp.id, shift.id)] = self.model.NewBoolVar(var_name)
+        if eligibility is None:
+            eligibility = EligibilityMatrix(employees, shifts)
+        self.eligibility = eligibility
+
+        if self.config.get("sparse_variables", False):
+            pairs = eligibility.pairs()
+        else:
+            pairs = ((row, column) for row in range(len(employees)) for column in range(len(shifts)))
+
+        for row, column in pairs:
+            emp, shift = employees[row], shifts[column]
+            var = self.model.NewBoolVar(f"emp_{emp.id}_shift_{shift.id}")
+            if not eligibility.matrix[row, column]:
+                self.model.Add(var == 0)
+
+            self.variables["assignments"][(emp.id, shift.id)] = var
+            self.shift_vars[shift.id].append((emp.id, var))
+            self.employee_vars[emp.id].append((shift, var))
+
+    def _use_instance(
+        self, employees: List[Employee], shifts: List[Shift], instance: Optional[SolverInstance] = None
+    ) -> SolverInstance:
+        """Make ``instance`` (or the current one, if still valid) the compact instance read by the builders."""
+        for candidate in (instance, self.instance):
+            if candidate is not None and candidate.matches(employees, shifts):
+                self.instance = candidate
+                return candidate
+
+        self.instance = SolverInstance(employees, shifts)
+        return self.instance
+
+    def _build_eligibility_index(self, employees: List[Employee], shifts: List[Shift]) -> Dict[str, set]:
+        """Eligible employee IDs per shift ID (see EligibilityMatrix)."""
+        return EligibilityMatrix(employees, shifts).by_shift()
 
     def _apply_hard_constraints(self, employees: List[Employee], shifts: List[Shift]):
         """Apply hard constraints that must be satisfied."""
-        # 1. Shift coverage constraints
+        # 1. Shift coverage constraints (availability and qualifications are
+        # already encoded in the eligibility index built by _create_variables)
         for shift in shifts:
-            shift_vars = []
-            for emp in employees:
-                if self._has_required_qualifications(emp, shift):
-                    shift_vars.append(self.variables["assignments"][(emp.id, shift.id)])
+            shift_vars = [var for _, var in self.shift_vars[shift.id]]
 
             if shift_vars:
+                staffed = cp_model.LinearExpr.Sum(shift_vars)
                 # Minimum employees per shift
-                self.model.Add(sum(shift_vars) >= shift.min_employees)
+                self._named(
+                    self.model.Add(staffed >= shift.min_employees),
+                    f"min_staff:{shift.id}",
+                    f"Shift {shift.id} needs at least {shift.min_employees} employees",
+                )
                 # Maximum employees per shift
-                self.model.Add(sum(shift_vars) <= shift.max_employees)
-
-        # 2. Employee availability constraints
-        for emp in employees:
-            for shift in shifts:
-                if not self._is_available(emp, shift):
-                    self.model.Add(self.variables["assignments"][(emp.id, shift.id)] == 0)
+                self._named(
+                    self.model.Add(staffed <= shift.max_employees),
+                    f"max_staff:{shift.id}",
+                    f"Shift {shift.id} takes at most {shift.max_employees} employees",
+                )
 
-        # 3. Maximum hours per week constraint
+        # 2. Hours per calendar week; minimums are pro-rated for weeks the
+        # horizon only partly covers
+        coverage = self.instance.week_coverage()
         for emp in employees:
-            weekly_hours = []
-            for shift in shifts:
-                hours = shift.get_duration_hours()
-                weekly_hours.append(self.variables["assignments"][(emp.id, shift.id)] * int(hours))
+            for week, weekly_hours in self._weekly_hours_expressions(emp).items():
+                week_start = self.instance.horizon_start + timedelta(days=7 * week - self.instance.horizon_start.weekday())
+                self._named(
+                    self.model.Add(weekly_hours <= emp.max_hours_per_week),
+                    f"max_hours:{emp.id}:{week}",
+                    f"{emp.name} works at most {emp.max_hours_per_week} hours in the week of {week_start}",
+                )
+                if emp.min_hours_per_week:
+                    min_hours = emp.min_hours_per_week * coverage[week] // 7
+                    self._named(
+                        self.model.Add(weekly_hours >= min_hours),
+                        f"min_hours:{emp.id}:{week}",
+                        f"{emp.name} works at least {min_hours} hours in the week of {week_start}",
+                    )
 
-            if weekly_hours:
-                self.model.Add(sum(weekly_hours) <= emp.max_hours_per_week)
-                self.model.Add(sum(weekly_hours) >= emp.min_hours_per_week)
+        # 3. No double booking - employee can work at most one shift of every
+        # clique of mutually overlapping shifts
+        self._add_clique_constraints(
+            employees, self.interval_index.overlap_cliques(), ("no_double_booking", "No employee works overlapping shifts")
+        )
 
-        # 4. No double booking - employee can't work overlapping shifts
-        for emp in employees:
-            for i, shift1 in enumerate(shifts):
-                for shift2 in shifts[i + 1 :]:
-                    if self._shifts_overlap(shift1, shift2):
-                        self.model.Add(
-                            self.variables["assignments"][(emp.id, shift1.id)]
-                            + self.variables["assignments"][(emp.id, shift2.id)]
-                            <= 1
-                        )
-
-        # 5. Rest period constraints
+        # 4. Rest period constraints
         self._add_rest_period_constraints(employees, shifts)
 
+        # 5. Maximum consecutive working days, continuing streaks carried into the horizon
+        max_consecutive_days = self.config.get("max_consecutive_days")
+        if max_consecutive_days:
+            self._add_consecutive_days_constraints(employees, max_consecutive_days)
+
     def _apply_custom_constraint(self, constraint: SchedulingConstraint, employees: List[Employee], shifts: List[Shift]):
         """Apply a custom constraint to the model."""
-        context = {"employees": employees, "shifts": shifts, "model": self.model, "variables": self.variables}
+        context = {
+            "employees": employees,
+            "shifts": shifts,
+            "model": self.model,
+            "variables": self.variables,
+            "instance": self.instance,
+            # Soft constraints only count towards the objective of a regular solve
+            "penalties": None if self.assumptions is not None else self.rule_penalties,
+        }
+        added_from = len(self.model.Proto().constraints)
 
         try:
             constraint.apply(self.model, self.variables, context)
         except Exception as e:
             logger.warning(f"Failed to apply constraint {constraint.name}: {e}")
 
+        if self.assumptions is not None:
+            # Enforce whatever the rule added by its own assumption literal
+            for proto in self.model.Proto().constraints[added_from:]:
+                if proto.WhichOneof("constraint") in ("linear", "bool_or", "bool_and"):
+                    literal = self._assumption(f"rule:{constraint.id}", f"Rule '{constraint.name}'")
+                    proto.enforcement_literal.append(literal.Index())
+
     def _create_objective_function(
         self, employees: List[Employee], shifts: List[Shift], preferences: Optional[Dict[str, Any]] = None
     ):
@@ -211,46 +693,65 @@ class ScheduleOptimizer:
 
         # 2. Balance workload across employees
         workload_variance = self._calculate_workload_variance(employees, shifts)
-        if workload_variance:
+        if workload_variance is not None:
             objective_terms.append(workload_variance)
 
         # 3. Maximize coverage (prefer more employees when possible)
         for shift in shifts:
-            for emp in employees:
-                if self._has_required_qualifications(emp, shift):
-                    # Small positive weight for assignments
-                    objective_terms.append(self.variables["assignments"][(emp.id, shift.id)] * 1)
+            # Small positive weight for assignments
+            objective_terms.extend(var for _, var in self.shift_vars[shift.id])
 
         # 4. Fairness in weekend shifts
         weekend_fairness = self._create_weekend_fairness_penalty(employees, shifts)
         if weekend_fairness:
             objective_terms.extend(weekend_fairness)
 
+        # 5. Minimal change from the current plan
+        if self.existing_assignments and self.minimal_change_weight > 0:
+            objective_terms.extend(self._create_minimal_change_penalty())
+
+        # 6. Violations of soft custom constraints
+        objective_terms.extend(self.rule_penalties)
+
+        self.num_objective_terms = len(objective_terms)
         if objective_terms:
-            self.model.Minimize(sum(objective_terms))
+            self.model.Minimize(cp_model.LinearExpr.Sum(objective_terms))
+
+    def _add_solution_hints(self, plan: Optional[Set[Tuple[str, str]]] = None):
+        """Hint every variable with its value in ``plan`` (default: the current plan)."""
+        if plan is None:
+            plan = self.existing_assignments
+        for key, var in self.variables["assignments"].items():
+            self.model.AddHint(var, 1 if key in plan else 0)
+
+    def _create_minimal_change_penalty(self) -> List[Any]:
+        """Penalize dropping a current assignment or adding a new one."""
+        weight = self.minimal_change_weight
+        penalties = []
+
+        for key, var in self.variables["assignments"].items():
+            if key in self.existing_assignments:
+                penalties.append((1 - var) * weight)
+            else:
+                penalties.append(var * weight)
+
+        return penalties
 
     def _create_preference_penalty(self, employees: List[Employee], shifts: List[Shift]) -> List[Any]:
         """Create penalty terms for violating employee preferences."""
         penalties = []
+        column_of = self.instance.shift_index
 
         for emp in employees:
-            for shift in shifts:
-                penalty = 0
-
-                # Check shift type preference
-                if "preferred_shift_type" in emp.preferences:
-                    if shift.shift_type.value != emp.preferences["preferred_shift_type"]:
-                        penalty += 10
-
-                # Check day preference
-                if "preferred_days" in emp.preferences:
-                    day_name = shift.date.strftime("%A").lower()
-                    if day_name not in emp.preferences["preferred_days"]:
-                        penalty += 5
+            if not emp.preferences:
+                continue
+            for shift, var in self.employee_vars[emp.id]:
+                # Shift type and day preferences
+                penalty = self.instance.preference_penalty(emp, column_of[shift.id])
 
                 # Apply penalty if assigned against preference
                 if penalty > 0:
-                    penalties.append(self.variables["assignments"][(emp.id, shift.id)] * penalty)
+                    penalties.append(var * penalty)
 
         return penalties
 
@@ -260,42 +761,69 @@ class ScheduleOptimizer:
 
         # Count weekend shifts per employee
         weekend_counts = {}
+        weekday, column_of = self.instance.weekday, self.instance.shift_index
         for emp in employees:
             weekend_shifts = []
-            for shift in shifts:
-                if shift.date.weekday() >= 5:  # Saturday = 5, Sunday = 6
-                    weekend_shifts.append(self.variables["assignments"][(emp.id, shift.id)])
+            for shift, var in self.employee_vars[emp.id]:
+                if weekday[column_of[shift.id]] >= 5:  # Saturday = 5, Sunday = 6
+                    weekend_shifts.append(var)
 
             if weekend_shifts:
-                weekend_counts[emp.id] = sum(weekend_shifts)
+                weekend_counts[emp.id] = cp_model.LinearExpr.Sum(weekend_shifts)
 
-        # Penalize deviation from average
+        # Penalize deviation from average, counting weekend shifts of earlier windows
         if weekend_counts:
-            avg_var = self.model.NewIntVar(0, len(shifts), "avg_weekend")
-            self.model.Add(avg_var == sum(weekend_counts.values()) // len(employees))
+            carried = self.carry_over.weekend_shifts
+            most_carried = max((carried.get(emp.id, 0) for emp in employees), default=0)
+            for emp_id in weekend_counts:
+                weekend_counts[emp_id] += carried.get(emp_id, 0)
+
+            avg_var = self.model.NewIntVar(0, len(shifts) + most_carried, "avg_weekend")
+            total_var = self.model.NewIntVar(0, (len(shifts) + most_carried) * len(employees), "total_weekend")
+            self.model.Add(total_var == sum(weekend_counts.values()))
+            self.model.AddDivisionEquality(avg_var, total_var, len(employees))
 
             for emp_id, count in weekend_counts.items():
-                deviation = self.model.NewIntVar(0, len(shifts), f"dev_{emp_id}")
+                deviation = self.model.NewIntVar(0, len(shifts) + most_carried, f"dev_{emp_id}")
                 self.model.AddAbsEquality(deviation, count - avg_var)
                 penalties.append(deviation * 5)
 
         return penalties
 
+    def _hours_expression(self, employee: Employee) -> Optional[Any]:
+        """Total assigned hours of an employee as one weighted sum, or None without variables."""
+        pairs = self.employee_vars[employee.id]
+        if not pairs:
+            return None
+
+        hours, column_of = self.instance.hours, self.instance.shift_index
+        return cp_model.LinearExpr.WeightedSum([var for _, var in pairs], [hours[column_of[shift.id]] for shift, _ in pairs])
+
+    def _weekly_hours_expressions(self, employee: Employee) -> Dict[int, Any]:
+        """Assigned hours of an employee per calendar week of the instance, as weighted sums."""
+        hours, week, column_of = self.instance.hours, self.instance.week, self.instance.shift_index
+        weekly = defaultdict(lambda: ([], []))
+        for shift, var in self.employee_vars[employee.id]:
+            column = column_of[shift.id]
+            variables, weights = weekly[week[column]]
+            variables.append(var)
+            weights.append(hours[column])
+
+        return {w: cp_model.LinearExpr.WeightedSum(variables, weights) for w, (variables, weights) in weekly.items()}
+
     def _calculate_workload_variance(self, employees: List[Employee], shifts: List[Shift]) -> Optional[Any]:
         """Calculate variance in workload to promote fairness."""
         if not employees or not shifts:
             return None
 
-        # Calculate total hours per employee
+        # Calculate total hours per employee, including hours of earlier windows
+        carried = self.carry_over.hours
         total_hours = {}
         for emp in employees:
-            emp_hours = []
-            for shift in shifts:
-                hours = shift.get_duration_hours()
-                emp_hours.append(self.variables["assignments"][(emp.id, shift.id)] * int(hours))
+            emp_hours = self._hours_expression(emp)
 
-            if emp_hours:
-                total_hours[emp.id] = sum(emp_hours)
+            if emp_hours is not None:
+                total_hours[emp.id] = emp_hours + carried.get(emp.id, 0)
 
         if not total_hours:
             return None
@@ -303,13 +831,15 @@ class ScheduleOptimizer:
         # Calculate variance (simplified - minimize max-min difference)
         if len(total_hours) > 1:
             hours_list = list(total_hours.values())
-            max_hours = self.model.NewIntVar(0, 100, "max_hours")
-            min_hours = self.model.NewIntVar(0, 100, "min_hours")
+            weeks = max(self.instance.week, default=0) + 1
+            bound = max(100, max(emp.max_hours_per_week for emp in employees) * weeks + max(carried.values(), default=0))
+            max_hours = self.model.NewIntVar(0, bound, "max_hours")
+            min_hours = self.model.NewIntVar(0, bound, "min_hours")
 
             self.model.AddMaxEquality(max_hours, hours_list)
             self.model.AddMinEquality(min_hours, hours_list)
 
-            variance = self.model.NewIntVar(0, 100, "hours_variance")
+            variance = self.model.NewIntVar(0, bound, "hours_variance")
             self.model.Add(variance == max_hours - min_hours)
 
             return variance * 10  # Weight for variance penalty
@@ -320,43 +850,208 @@ class ScheduleOptimizer:
         """Add constraints for minimum rest periods between shifts."""
         min_rest_hours = self.config.get("min_rest_hours", 8)
 
-        for emp in employees:
-            # Sort shifts by date and start time
-            sorted_shifts = sorted(shifts, key=lambda s: (s.date, s.start_time))
+        # Pairs of shifts with too little rest in between are found once from the
+        # interval index and shared by every employee
+        cliques = self.interval_index.rest_cliques(int(min_rest_hours * 60))
+        self._add_clique_constraints(
+            employees, cliques, ("min_rest", f"Employees rest at least {min_rest_hours} hours between shifts")
+        )
 
-            for i in range(len(sorted_shifts) - 1):
-                shift1 = sorted_shifts[i]
-                shift2 = sorted_shifts[i + 1]
+    def _add_consecutive_days_constraints(self, employees: List[Employee], max_days: int):
+        """
+        Allow at most ``max_days`` worked days in every run of ``max_days + 1`` days.
 
-                # Calculate time between shifts
-                end1 = datetime.combine(shift1.date, shift1.end_time)
-                start2 = datetime.combine(shift2.date, shift2.start_time)
+        A streak carried into the horizon counts as worked days just before day 0.
+        """
+        day, column_of = self.instance.day, self.instance.shift_index
+        carried = self.carry_over.consecutive_days
 
-                if shift1.end_time > shift1.start_time:
-                    # Normal shift
-                    rest_time = (start2 - end1).total_seconds() / 3600
-                else:
-                    # Overnight shift
-                    end1 += timedelta(days=1)
-                    rest_time = (start2 - end1).total_seconds() / 3600
-
-                # If rest time is less than minimum, can't work both shifts
-                if 0 < rest_time < min_rest_hours:
-                    self.model.Add(
-                        self.variables["assignments"][(emp.id, shift1.id)] + self.variables["assignments"][(emp.id, shift2.id)]
-                        <= 1
+        for emp in employees:
+            shifts_by_day = defaultdict(list)
+            for shift, var in self.employee_vars[emp.id]:
+                shifts_by_day[day[column_of[shift.id]]].append(var)
+            if not shifts_by_day:
+                continue
+
+            works = {}
+            for d, day_vars in shifts_by_day.items():
+                works[d] = self.model.NewBoolVar(f"works_{emp.id}_{d}")
+                self.model.AddMaxEquality(works[d], day_vars)
+
+            streak = min(carried.get(emp.id, 0), max_days)
+            for first in range(-streak, max(works) - max_days + 1):
+                window = [works[d] for d in range(max(first, 0), first + max_days + 1) if d in works]
+                carried_days = max(0, -first)
+                if carried_days + len(window) > max_days:
+                    self._named(
+                        self.model.Add(cp_model.LinearExpr.Sum(window) <= max_days - carried_days),
+                        "max_consecutive_days",
+                        f"Employees work at most {max_days} consecutive days",
                     )
 
+    def _add_symmetry_breaking(self, employees: List[Employee], constraints: List[SchedulingConstraint]):
+        """
+        Order the assignment vectors of interchangeable employees lexicographically.
+
+        See scheduler.symmetry. Classes are found from the eligibility matrix,
+        so employees are grouped by the shifts they may take rather than by
+        how their qualifications and availability are written down. The order
+        constraints speed up proving optimality but also restrict the moves of
+        CP-SAT's local search, so they are only added when at least
+        ``config["symmetry_min_share"]`` of the employees are interchangeable
+        with someone.
+        """
+        assignments = self.variables["assignments"]
+        start = self.instance.start
+        classes = employee_classes(employees, self.eligibility, self.existing_assignments, self.carry_over, constraints)
+        if sum(len(rows) for rows in classes) < self.config.get("symmetry_min_share", 0.5) * len(employees):
+            return
+
+        for rows in classes:
+            columns = sorted(np.flatnonzero(self.eligibility.matrix[rows[0]]).tolist(), key=lambda column: start[column])
+            if not columns:
+                continue
+            members = [employees[row].id for row in rows]
+            order = [self.instance.shifts[column].id for column in columns]
+            for first, second in zip(members, members[1:]):
+                add_lex_leader(
+                    self.model,
+                    [assignments[(first, sid)] for sid in order],
+                    [assignments[(second, sid)] for sid in order],
+                    f"lex_{first}_{second}",
+                )
+            self.symmetry_classes.append((members, order))
+
+    def _exclude_carried_clashes(self):
+        """Mark shifts that clash with an employee's carried last shift as ineligible."""
+        if not self.carry_over.last_shift:
+            return
+
+        min_rest = int(self.config.get("min_rest_hours", 8) * 60)
+        origin = datetime.combine(self.instance.horizon_start, time())
+        starts, ends = np.asarray(self.instance.start), np.asarray(self.instance.end)
+
+        for emp_id, (last_start, last_end) in self.carry_over.last_shift.items():
+            row = self.eligibility.employee_index.get(emp_id)
+            if row is None:
+                continue
+            first = int((last_start - origin).total_seconds() // 60)
+            last = int((last_end - origin).total_seconds() // 60)
+            # Same test as intervals.clashes: overlapping, or separated by a short rest
+            gap = np.where(starts >= last, starts - last, first - ends)
+            clash = ((starts < last) & (first < ends)) | ((gap > 0) & (gap < min_rest))
+            self.eligibility.matrix[row, clash] = False
+
+    def _add_clique_constraints(
+        self, employees: List[Employee], cliques: List[List[str]], name: Optional[Tuple[str, str]] = None
+    ):
+        """
+        Allow each employee at most one assignment within every clique of shift IDs.
+
+        ``name`` is the (key, description) of the rule the cliques encode, used
+        when explaining infeasibility.
+        """
+        assignments = self.variables["assignments"]
+        for emp in employees:
+            for clique in cliques:
+                clique_vars = [assignments[(emp.id, sid)] for sid in clique if (emp.id, sid) in assignments]
+                if len(clique_vars) <= 1:
+                    continue
+                if self.assumptions is not None and name:
+                    # AtMostOne takes no enforcement literal
+                    self._named(self.model.Add(cp_model.LinearExpr.Sum(clique_vars) <= 1), *name)
+                else:
+                    self.model.AddAtMostOne(clique_vars)
+
+    def _assumption(self, key: str, description: str) -> Any:
+        """Assumption literal of a named constraint group, created on first use."""
+        if key not in self.assumptions:
+            self.assumptions[key] = self.model.NewBoolVar(key)
+            self.assumption_descriptions[key] = description
+        return self.assumptions[key]
+
+    def _named(self, constraint: Any, key: str, description: str) -> Any:
+        """Make ``constraint`` conditional on its group's assumption while explaining infeasibility."""
+        if self.assumptions is not None:
+            constraint.OnlyEnforceIf(self._assumption(key, description))
+        return constraint
+
+    def _constrained_shifts(self, employees: List[Employee], shifts: List[Shift]) -> List[bool]:
+        """Per shift, whether the model will enforce its staffing (it has at least one variable)."""
+        if not self.config.get("sparse_variables", False):
+            return [bool(employees)] * len(shifts)
+        return self.eligibility.matrix.any(axis=0).tolist()
+
+    def _explain_infeasibility(
+        self, employees: List[Employee], shifts: List[Shift], constraints: List[SchedulingConstraint]
+    ) -> List[Dict[str, str]]:
+        """
+        Name a minimal set of rules that cannot hold together.
+
+        The hard constraints and custom rules are rebuilt with one assumption
+        literal per rule group (shift staffing, employee-week hours, no double
+        booking, rest, consecutive days, each custom rule). CP-SAT returns a
+        core of assumptions that is infeasible on its own, which is then shrunk
+        by dropping one assumption at a time while the rest stay infeasible.
+        """
+        time_limit = self.config.get("explain_time_limit", 10.0)
+        started = time_module.monotonic()
+        saved = (self.model, self.variables, self.shift_vars, self.employee_vars)
+
+        try:
+            self.assumptions, self.assumption_descriptions = {}, {}
+            self.model = cp_model.CpModel()
+            self.variables = {}
+            self._create_variables(employees, shifts, self.eligibility)
+            self._apply_hard_constraints(employees, shifts)
+            for constraint in constraints:
+                self._apply_custom_constraint(constraint, employees, shifts)
+
+            literals = {literal.Index(): key for key, literal in self.assumptions.items()}
+            solver = cp_model.CpSolver()
+            solver.parameters.num_search_workers = 1
+
+            def infeasible(keys: List[str]) -> Optional[List[str]]:
+                self.model.ClearAssumptions()
+                self.model.AddAssumptions([self.assumptions[key] for key in keys])
+                solver.parameters.max_time_in_seconds = max(0.1, time_limit - (time_module.monotonic() - started))
+                if solver.Solve(self.model) != cp_model.INFEASIBLE:
+                    return None
+                return [literals[index] for index in solver.SufficientAssumptionsForInfeasibility()]
+
+            core = infeasible(list(self.assumptions))
+            if not core:
+                return []
+
+            for key in list(core):
+                if key not in core or time_module.monotonic() - started > time_limit:
+                    continue
+                smaller = infeasible([other for other in core if other != key])
+                if smaller is not None:
+                    core = smaller
+
+            return [{"rule": key, "description": self.assumption_descriptions[key]} for key in core]
+
+        except Exception as e:
+            logger.warning(f"Could not explain infeasibility: {e}")
+            return []
+
+        finally:
+            self.model, self.variables, self.shift_vars, self.employee_vars = saved
+            self.assumptions = None
+
     def _extract_solution(self, status: Any, employees: List[Employee], shifts: List[Shift]) -> Dict[str, Any]:
         """Extract the solution from the solver."""
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             schedule = []
 
+            names = {emp.id: emp.name for emp in employees}
+
             for shift in shifts:
                 assigned_employees = []
-                for emp in employees:
-                    if self.solver.Value(self.variables["assignments"][(emp.id, shift.id)]):
-                        assigned_employees.append({"id": emp.id, "name": emp.name})
+                for emp_id, var in self.shift_vars[shift.id]:
+                    if self.solver.Value(var):
+                        assigned_employees.append({"id": emp_id, "name": names[emp_id]})
 
                 schedule.append(
                     {
@@ -371,41 +1066,123 @@ class ScheduleOptimizer:
             return {
                 "status": "optimal" if status == cp_model.OPTIMAL else "feasible",
                 "schedule": schedule,
-                "statistics": {
-                    "solve_time": self.solver.WallTime(),
-                    "objective_value": self.solver.ObjectiveValue() if status == cp_model.OPTIMAL else None,
-                },
+                "statistics": self._model_statistics(status),
             }
 
         elif status == cp_model.INFEASIBLE:
-            return {"status": "infeasible", "message": "No feasible schedule found with given constraints", "schedule": []}
+            return {
+                "status": "infeasible",
+                "message": "No feasible schedule found with given constraints",
+                "schedule": [],
+                "statistics": self._model_statistics(status),
+            }
 
         else:
-            return {"status": "unknown", "message": "Solver returned unknown status", "schedule": []}
+            return {
+                "status": "unknown",
+                "message": "Solver returned unknown status",
+                "schedule": [],
+                "statistics": self._model_statistics(status),
+            }
 
-    def _generate_fallback_schedule(self, employees: List[Employee], shifts: List[Shift]) -> Dict[str, Any]:
-        """Generate a simple fallback schedule when OR-Tools is not available."""
-        schedule = []
+    def _model_statistics(self, status: Any) -> Dict[str, Any]:
+        """Model size, search effort and phase timings of the last solve."""
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        objective = self.solver.ObjectiveValue() if found else None
+        bound = self.solver.BestObjectiveBound() if found else None
+
+        return {
+            "solve_time": self.solver.WallTime(),
+            "objective_value": objective if status == cp_model.OPTIMAL else None,
+            "num_variables": len(self.variables["assignments"]),
+            "num_constraints": len(self.model.Proto().constraints),
+            "num_objective_terms": self.num_objective_terms,
+            "build_time": self.build_time,
+            "conflicts": self.solver.NumConflicts(),
+            "branches": self.solver.NumBranches(),
+            "best_bound": bound,
+            "gap": abs(objective - bound) / max(1.0, abs(objective)) if found else None,
+            "time_limit": self.solve_plan.time_limit if self.solve_plan else None,
+            "num_workers": self.solve_plan.num_workers if self.solve_plan else None,
+            "stop_reason": self.stop_reason,
+            "symmetry_classes": len(self.symmetry_classes),
+            "symmetric_employees": sum(len(members) for members, _ in self.symmetry_classes),
+            "phases": {"build_model": self.build_time, "solve": self.solver.WallTime()},
+        }
+
+    def _generate_fallback_schedule(
+        self,
+        employees: List[Employee],
+        shifts: List[Shift],
+        eligibility: Optional[Dict[str, set]] = None,
+        instance: Optional[SolverInstance] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a schedule with the greedy construction heuristic.
+
+        Used when OR-Tools is not available or the instance is too large to
+        model. The plan satisfies every hard constraint; shifts that could not be
+        staffed are reported in ``unfilled`` and the status is then "fallback".
+        """
+        started = datetime.now()
+        if eligibility is None:
+            eligibility = self._build_eligibility_index(employees, shifts)
+
+        greedy = self._greedy_scheduler(employees, shifts, eligibility, instance)
+        assignments = greedy.build()
+        unfilled = greedy.unfilled()
+
+        names = {emp.id: emp.name for emp in employees}
+        assigned = defaultdict(list)
+        for emp_id, shift_id in sorted(assignments):
+            assigned[shift_id].append({"id": emp_id, "name": names[emp_id]})
 
+        schedule = []
         for shift in shifts:
-            # Simple round-robin assignment
-            available_employees = [
-                emp for emp in employees if self._is_available(emp, shift) and self._has_required_qualifications(emp, shift)
-            ]
-
-            assigned = available_employees[: shift.min_employees]
-
             schedule.append(
                 {
                     "shift_id": shift.id,
                     "date": shift.date.isoformat(),
                     "start_time": shift.start_time.isoformat(),
                     "end_time": shift.end_time.isoformat(),
-                    "assigned_employees": [{"id": emp.id, "name": emp.name} for emp in assigned],
+                    "assigned_employees": assigned[shift.id],
                 }
             )
 
-        return {"status": "fallback", "message": "Using simple fallback scheduler", "schedule": schedule}
+        result = {
+            "status": "fallback" if unfilled else "feasible",
+            "message": "Generated with greedy construction heuristic",
+            "schedule": schedule,
+            "statistics": {
+                "solve_time": (datetime.now() - started).total_seconds(),
+                "objective_value": None,
+                "method": "greedy",
+                "phases": {"solve": (datetime.now() - started).total_seconds()},
+            },
+        }
+        if unfilled:
+            result["unfilled"] = [{"shift_id": sid, "missing": missing} for sid, missing in unfilled.items()]
+            result["message"] = f"Greedy construction left {len(unfilled)} shifts understaffed"
+        return result
+
+    def _greedy_scheduler(
+        self,
+        employees: List[Employee],
+        shifts: List[Shift],
+        eligibility: Dict[str, set],
+        instance: Optional[SolverInstance] = None,
+    ) -> GreedyScheduler:
+        """Set up the greedy heuristic with the same eligibility, rest and consecutive-days rules as the model."""
+        min_rest = int(self.config.get("min_rest_hours", 8) * 60)
+        return GreedyScheduler(
+            employees,
+            shifts,
+            eligibility,
+            self._use_instance(employees, shifts, instance),
+            min_rest,
+            self.config.get("max_consecutive_days"),
+            self.carry_over.consecutive_days,
+        )
 
     def _is_available(self, employee: Employee, shift: Shift) -> bool:
         """Check if an employee is available for a shift."""
@@ -0,0 +1,305 @@
+"""
+Decomposed solving of large instances by eligibility component and week.
+
+Employees and shifts are split into the connected components of the
+employee-shift eligibility graph: no employee of one component may work a
+shift of another, so components share no constraints (typically one per
+department, as long as staff are only eligible for their own department's
+shifts). Weeks are only coupled through rest periods across the
+Sunday/Monday boundary (weekly hour caps are per week), so a month for a
+whole organization splits into independent component-week parts. The parts
+are solved concurrently in a process pool and a stitching pass then
+re-solves only the days either side of each week boundary, with every other
+assignment frozen.
+
+The stitching pass only enforces staffing limits, weekly hour caps, overlaps
+and rest periods. Custom constraints, minimum hours and
+``max_consecutive_days`` are enforced inside each partition but not by the
+boundary re-solve, and streaks running across a week boundary are not
+limited at all; use a single model or rolling-horizon solving (see
+scheduler.rolling_horizon) when those rules must hold across weeks.
+"""
+
+import logging
+import os
+import time as time_module
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .constraint_solver import Employee, ScheduleOptimizer, SchedulingConstraint, Shift
+from .eligibility import EligibilityMatrix
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Partition:
+    """Employees and shifts of one eligibility component for one week."""
+
+    component: int
+    week_start: date
+    employees: List[Employee] = field(default_factory=list)
+    shifts: List[Shift] = field(default_factory=list)
+
+
+def week_start_of(day: date) -> date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def eligibility_components(eligibility: EligibilityMatrix) -> List[Tuple[List[int], List[int]]]:
+    """
+    Connected components of the employee-shift eligibility graph as (rows, columns).
+
+    Components are numbered in the order of their first shift. Shifts no
+    employee is eligible for form components without employees; employees
+    eligible for no shift are left out.
+    """
+    matrix = eligibility.matrix
+    # Union-find over shift columns, joining all shifts one employee may work
+    parent = list(range(matrix.shape[1]))
+
+    def find(column: int) -> int:
+        while parent[column] != column:
+            parent[column] = parent[parent[column]]
+            column = parent[column]
+        return column
+
+    for row in range(matrix.shape[0]):
+        columns = np.flatnonzero(matrix[row]).tolist()
+        for column in columns[1:]:
+            parent[find(column)] = find(columns[0])
+
+    components: Dict[int, Tuple[List[int], List[int]]] = {}
+    for column in range(matrix.shape[1]):
+        components.setdefault(find(column), ([], []))[1].append(column)
+    for row in range(matrix.shape[0]):
+        columns = np.flatnonzero(matrix[row])
+        if columns.size:
+            components[find(int(columns[0]))][0].append(row)
+
+    return list(components.values())
+
+
+def partition_instance(employees: List[Employee], shifts: List[Shift]) -> List[Partition]:
+    """
+    Split an instance into component-week partitions.
+
+    Shifts are grouped by eligibility component (see eligibility_components)
+    and Monday-based week; each partition gets the employees of its component
+    eligible for at least one of its shifts.
+    """
+    eligibility = EligibilityMatrix(employees, shifts)
+    partitions = []
+    for component, (rows, columns) in enumerate(eligibility_components(eligibility)):
+        weeks: Dict[date, List[int]] = defaultdict(list)
+        for column in columns:
+            weeks[week_start_of(shifts[column].date)].append(column)
+        for week_start in sorted(weeks):
+            week_columns = weeks[week_start]
+            staffed = eligibility.matrix[np.ix_(rows, week_columns)].any(axis=1) if rows else []
+            partitions.append(
+                Partition(
+                    component,
+                    week_start,
+                    [employees[row] for row, eligible in zip(rows, staffed) if eligible],
+                    [shifts[column] for column in week_columns],
+                )
+            )
+    return partitions
+
+
+def boundary_dates(shifts: List[Shift]) -> Set[date]:
+    """Sundays and Mondays on either side of every week boundary inside the horizon."""
+    dates = {shift.date for shift in shifts}
+    return {
+        day
+        for day in dates
+        if (day.weekday() == 6 and day + timedelta(days=1) in dates)
+        or (day.weekday() == 0 and day - timedelta(days=1) in dates)
+    }
+
+
+def solve_partition(
+    config: Dict[str, Any], employees: List[Employee], shifts: List[Shift], constraints: List[SchedulingConstraint]
+) -> Dict[str, Any]:
+    """Solve one partition inside a pool worker process."""
+    return ScheduleOptimizer(config=config).generate_schedule(employees=employees, shifts=shifts, constraints=constraints)
+
+
+def stitch_component(
+    config: Dict[str, Any],
+    employees: List[Employee],
+    shifts: List[Shift],
+    assignments: Set[Tuple[str, str]],
+    free_shift_ids: Set[str],
+) -> Dict[str, Any]:
+    """Re-solve the boundary-day shifts of one component inside a pool worker process."""
+    return ScheduleOptimizer(config=config).resolve_window(employees, shifts, assignments, free_shift_ids)
+
+
+def solve_decomposed(
+    config: Dict[str, Any],
+    employees: List[Employee],
+    shifts: List[Shift],
+    constraints: Optional[List[SchedulingConstraint]] = None,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Solve an instance as concurrent component-week partitions.
+
+    Partitions solved with the greedy heuristic (status "fallback") keep their
+    plan; partitions nobody is eligible for are left empty. Positions still
+    unstaffed after stitching are reported in ``unfilled`` with status
+    "fallback", as for a greedy plan.
+
+    Args:
+        config: ScheduleOptimizer configuration; ``decomposition_workers`` sets the
+            pool size when no executor is given (default: CPU count)
+        employees: All employees
+        shifts: All shift instances
+        constraints: Custom constraints, applied to every partition
+        executor: Pool to run partitions in; a private pool is created if omitted
+
+    Returns:
+        Dict in the same format as ScheduleOptimizer.generate_schedule
+    """
+    started = time_module.monotonic()
+    partitions = partition_instance(employees, shifts)
+    if not partitions:
+        return {"status": "error", "message": "No shifts to schedule", "schedule": []}
+
+    cores = os.cpu_count() or 1
+    workers = min(config.get("decomposition_workers") or cores, len(partitions))
+    # Share the cores between concurrent partitions instead of oversubscribing them
+    config = {**config, "num_search_workers": max(1, cores // workers)}
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        # Shifts nobody may work have nothing to solve and stay unfilled
+        solvable = [part for part in partitions if part.employees]
+        futures = [
+            executor.submit(solve_partition, config, part.employees, part.shifts, constraints or []) for part in solvable
+        ]
+        results = [future.result() for future in futures]
+
+        # Components share no employees, so a partition without any plan means the whole instance has none
+        for part, result in zip(solvable, results):
+            if result["status"] not in ["optimal", "feasible", "fallback"]:
+                return {
+                    "status": result["status"],
+                    "message": f"Partition {part.component}, week of {part.week_start}: {result.get('message')}",
+                    "schedule": [],
+                }
+
+        assignments = {
+            (emp["id"], entry["shift_id"])
+            for result in results
+            for entry in result["schedule"]
+            for emp in entry["assigned_employees"]
+        }
+        solved = time_module.monotonic()
+        stitch_stats = _stitch(config, partitions, shifts, assignments, executor)
+        stitched = time_module.monotonic()
+
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    names = {emp.id: emp.name for emp in employees}
+    assigned = defaultdict(list)
+    for emp_id, shift_id in sorted(assignments):
+        assigned[shift_id].append({"id": emp_id, "name": names[emp_id]})
+
+    schedule = [
+        {
+            "shift_id": shift.id,
+            "date": shift.date.isoformat(),
+            "start_time": shift.start_time.isoformat(),
+            "end_time": shift.end_time.isoformat(),
+            "assigned_employees": assigned[shift.id],
+        }
+        for shift in shifts
+    ]
+
+    staffed = defaultdict(int)
+    for _, shift_id in assignments:
+        staffed[shift_id] += 1
+    unfilled = [
+        {"shift_id": shift.id, "missing": shift.min_employees - staffed[shift.id]}
+        for shift in shifts
+        if staffed[shift.id] < shift.min_employees
+    ]
+
+    all_optimal = len(partitions) == 1 and bool(results) and results[0]["status"] == "optimal"
+    result = {
+        "status": "optimal" if all_optimal else "feasible",
+        "schedule": schedule,
+        "statistics": {
+            "solve_time": time_module.monotonic() - started,
+            "partitions": len(partitions),
+            "partition_solve_time": sum(result["statistics"]["solve_time"] for result in results),
+            "num_variables": sum(result["statistics"].get("num_variables", 0) for result in results),
+            **stitch_stats,
+            "phases": {"solve": solved - started, "stitch": stitched - solved},
+        },
+    }
+    if unfilled:
+        result["status"] = "fallback"
+        result["unfilled"] = unfilled
+        result["message"] = f"Decomposed solve left {len(unfilled)} shifts understaffed"
+    return result
+
+
+def _stitch(
+    config: Dict[str, Any],
+    partitions: List[Partition],
+    shifts: List[Shift],
+    assignments: Set[Tuple[str, str]],
+    executor: Executor,
+) -> Dict[str, Any]:
+    """
+    Re-solve the boundary days of every component and patch ``assignments`` in place.
+
+    A component whose stitch fails keeps its partition solutions.
+    """
+    boundaries = boundary_dates(shifts)
+    if not boundaries:
+        return {"stitched_days": 0, "stitch_changes": 0}
+
+    components = {}
+    for part in partitions:
+        employees, component_shifts = components.setdefault(part.component, ({}, []))
+        employees.update((emp.id, emp) for emp in part.employees)
+        component_shifts.extend(part.shifts)
+
+    futures = []
+    for employees, component_shifts in components.values():
+        free = {shift.id for shift in component_shifts if shift.date in boundaries}
+        if not free or not employees:
+            continue
+        shift_ids = {shift.id for shift in component_shifts}
+        current = {key for key in assignments if key[1] in shift_ids}
+        futures.append(executor.submit(stitch_component, config, list(employees.values()), component_shifts, current, free))
+
+    changes = 0
+    for future in futures:
+        stitch = future.result()
+        if stitch["status"] not in ["optimal", "feasible"]:
+            logger.warning(f"Boundary stitching failed: {stitch.get('message')}")
+            continue
+        for change in stitch["removed"]:
+            assignments.discard((change["employee_id"], change["shift_id"]))
+        for change in stitch["added"]:
+            assignments.add((change["employee_id"], change["shift_id"]))
+        changes += len(stitch["added"]) + len(stitch["removed"])
+
+    return {"stitched_days": len(boundaries), "stitch_changes": changes}
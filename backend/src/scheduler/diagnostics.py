@@ -0,0 +1,163 @@
+"""
+Fast infeasibility diagnostics.
+
+Before a model is built, staffing demand is compared with the capacity that
+could possibly meet it, grouped by shift, by window of overlapping shifts, by
+required qualification, by day and by week. Demand is required heads (x hours);
+capacity counts only eligible employees, each contributing at most their
+``max_hours_per_week``. Every check is a necessary condition, so a reported
+bottleneck proves the instance infeasible without running the solver.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .eligibility import EligibilityMatrix
+from .instance import SolverInstance
+from .intervals import IntervalIndex
+
+
+def capacity_bottlenecks(
+    instance: SolverInstance, eligibility: EligibilityMatrix, constrained: Optional[Sequence[bool]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Find staffing demand that eligible employees cannot cover.
+
+    Args:
+        instance: Compact instance of the solve
+        eligibility: Eligibility matrix of the same employees and shifts
+        constrained: Per shift, whether its minimum staffing is enforced (default: all)
+
+    Returns:
+        Bottlenecks, most specific first, each with a ``kind`` (shift, window,
+        qualification, day or week), a ``description`` and the ``demand`` and
+        ``supply`` compared
+    """
+    shifts = instance.shifts
+    if not shifts or not instance.employees:
+        return []
+
+    matrix = eligibility.matrix
+    hours = np.asarray(instance.hours, dtype=np.int64)
+    max_hours = np.asarray(instance.max_hours, dtype=np.int64)
+    min_staff = np.array([shift.min_employees for shift in shifts], dtype=np.int64)
+    active = np.ones(len(shifts), dtype=bool) if constrained is None else np.asarray(constrained, dtype=bool)
+
+    def hours_check(columns: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Required hours of ``columns`` against what eligible employees could work on them."""
+        columns = columns & active
+        if not columns.any():
+            return None
+        demand = int(min_staff[columns] @ hours[columns])
+        eligible_hours = matrix[:, columns].astype(np.int64) @ hours[columns]
+        supply = int(np.minimum(eligible_hours, max_hours).sum())
+        return {"demand": demand, "supply": supply} if demand > supply else None
+
+    bottlenecks = []
+
+    # Single shifts: not enough eligible employees, or inconsistent limits
+    eligible_counts = matrix.sum(axis=0)
+    for column, shift in enumerate(shifts):
+        if not active[column]:
+            continue
+        if shift.min_employees > shift.max_employees:
+            bottlenecks.append(
+                {
+                    "kind": "shift",
+                    "shift_id": shift.id,
+                    "description": f"Shift {shift.id} needs at least {shift.min_employees} employees "
+                    f"but allows at most {shift.max_employees}",
+                    "demand": shift.min_employees,
+                    "supply": shift.max_employees,
+                }
+            )
+        elif eligible_counts[column] < shift.min_employees:
+            bottlenecks.append(
+                {
+                    "kind": "shift",
+                    "shift_id": shift.id,
+                    "description": f"Shift {shift.id} needs {shift.min_employees} employees "
+                    f"but only {eligible_counts[column]} are qualified and available",
+                    "demand": shift.min_employees,
+                    "supply": int(eligible_counts[column]),
+                }
+            )
+
+    # Windows of mutually overlapping shifts: one employee covers at most one of them
+    for clique in IntervalIndex(instance.intervals()).overlap_cliques():
+        columns = [instance.shift_index[shift_id] for shift_id in clique if active[instance.shift_index[shift_id]]]
+        if len(columns) < 2:
+            continue
+        demand = int(min_staff[columns].sum())
+        supply = int(matrix[:, columns].any(axis=1).sum())
+        if demand > supply:
+            first = shifts[min(columns, key=lambda column: instance.start[column])]
+            bottlenecks.append(
+                {
+                    "kind": "window",
+                    "shift_ids": [shifts[column].id for column in columns],
+                    "description": f"{len(columns)} overlapping shifts around {first.date} {first.start_time:%H:%M} "
+                    f"need {demand} employees at once but only {supply} are eligible for any of them",
+                    "demand": demand,
+                    "supply": supply,
+                }
+            )
+
+    # Required qualifications, per week
+    week = np.asarray(instance.week)
+    week_start = instance.horizon_start - timedelta(days=instance.horizon_start.weekday())
+    requiring = defaultdict(lambda: np.zeros(len(shifts), dtype=bool))
+    for column, shift in enumerate(shifts):
+        for qualification in shift.required_qualifications:
+            requiring[qualification][column] = True
+
+    for qualification in sorted(requiring):
+        for w in np.unique(week[requiring[qualification]]).tolist():
+            check = hours_check(requiring[qualification] & (week == w))
+            if check:
+                start = week_start + timedelta(weeks=w)
+                bottlenecks.append(
+                    {
+                        "kind": "qualification",
+                        "qualification": qualification,
+                        "week_start": start.isoformat(),
+                        "description": f"Shifts requiring {qualification} in the week of {start} need {check['demand']} "
+                        f"hours but qualified employees can work at most {check['supply']}",
+                        **check,
+                    }
+                )
+
+    # Days and weeks
+    day = np.asarray(instance.day)
+    for d in np.unique(day).tolist():
+        check = hours_check(day == d)
+        if check:
+            on = instance.horizon_start + timedelta(days=d)
+            bottlenecks.append(
+                {
+                    "kind": "day",
+                    "date": on.isoformat(),
+                    "description": f"Shifts on {on} need {check['demand']} hours "
+                    f"but eligible employees can work at most {check['supply']}",
+                    **check,
+                }
+            )
+
+    for w in np.unique(week).tolist():
+        check = hours_check(week == w)
+        if check:
+            start = week_start + timedelta(weeks=w)
+            bottlenecks.append(
+                {
+                    "kind": "week",
+                    "week_start": start.isoformat(),
+                    "description": f"Shifts in the week of {start} need {check['demand']} hours but eligible "
+                    f"employees can work at most {check['supply']} under their weekly limits",
+                    **check,
+                }
+            )
+
+    return bottlenecks
@@ -0,0 +1,151 @@
+"""
+Vectorized employee x shift eligibility.
+
+Availability is encoded as one bitmap of the minutes of the week per distinct
+availability pattern and qualifications as integer bitsets over the
+qualifications any shift requires. Shifts generated from the same template
+share a time window and requirement set, so the full E x S matrix is expanded
+from a handful of (pattern x window) and (employee x requirement) products.
+"""
+
+from datetime import time
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .intervals import MINUTES_PER_DAY
+
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def _minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def availability_bitmap(availability: Dict[str, List[Tuple[time, time]]]) -> np.ndarray:
+    """
+    Encode weekly availability as a boolean array over the minutes of the week.
+
+    Windows ending at or before their start run past midnight into the next
+    day, and an end of 23:59 counts as midnight. Empty availability means
+    always available.
+    """
+    if not availability:
+        return np.ones(MINUTES_PER_WEEK, dtype=bool)
+
+    bitmap = np.zeros(MINUTES_PER_WEEK, dtype=bool)
+    for day, name in enumerate(DAY_NAMES):
+        for start, end in availability.get(name, ()):
+            first = day * MINUTES_PER_DAY + _minute(start)
+            last = day * MINUTES_PER_DAY + (MINUTES_PER_DAY if end == time(23, 59) else _minute(end))
+            if last <= first:
+                last += MINUTES_PER_DAY
+            bitmap[np.arange(first, last) % MINUTES_PER_WEEK] = True
+    return bitmap
+
+
+def qualification_bitsets(qualifications: Iterable[Iterable[str]], vocabulary: Dict[str, int]) -> np.ndarray:
+    """
+    Encode qualification lists as rows of 64-bit words.
+
+    Bit ``i`` is set when the list contains the qualification numbered ``i`` in
+    ``vocabulary``; qualifications outside the vocabulary are ignored.
+    """
+    words = max(1, -(-len(vocabulary) // _WORD_BITS))
+    rows = []
+    for quals in qualifications:
+        mask = 0
+        for qual in quals:
+            if qual in vocabulary:
+                mask |= 1 << vocabulary[qual]
+        rows.append([(mask >> (_WORD_BITS * word)) & _WORD_MASK for word in range(words)])
+    return np.array(rows, dtype=np.uint64).reshape(len(rows), words)
+
+
+class EligibilityMatrix:
+    """
+    Boolean matrix of which employee may work which shift.
+
+    An employee is eligible when they hold every required qualification, are
+    available for the whole shift window and the shift alone does not exceed
+    their weekly hour limit. Rows follow the order of ``employees`` and columns
+    the order of ``shifts``.
+    """
+
+    def __init__(self, employees: Sequence, shifts: Sequence):
+        """Build the matrix for solver employees and shifts."""
+        self.employee_ids = [emp.id for emp in employees]
+        self.shift_ids = [shift.id for shift in shifts]
+        self.employee_index = {emp_id: row for row, emp_id in enumerate(self.employee_ids)}
+        self.shift_index = {shift_id: column for column, shift_id in enumerate(self.shift_ids)}
+        self.matrix = self._build(employees, shifts)
+
+    def _build(self, employees: Sequence, shifts: Sequence) -> np.ndarray:
+        if not employees or not shifts:
+            return np.zeros((len(employees), len(shifts)), dtype=bool)
+
+        # Distinct shift windows as [start, end) minutes of the week
+        durations = np.array([round(shift.get_duration_hours() * 60) for shift in shifts])
+        window_keys = [
+            (shift.date.weekday() * MINUTES_PER_DAY + _minute(shift.start_time), int(length))
+            for shift, length in zip(shifts, durations)
+        ]
+        windows, window_of_shift = _factorize(window_keys)
+        starts = np.array([start for start, _ in windows])
+        ends = starts + np.array([length for _, length in windows])
+
+        # Coverage of every window by every distinct availability pattern, from
+        # prefix sums over the pattern bitmaps (windows may wrap past Sunday)
+        pattern_keys = [tuple(sorted((day, tuple(hours)) for day, hours in emp.availability.items())) for emp in employees]
+        patterns, pattern_of_employee = _factorize(pattern_keys)
+        bitmaps = np.stack([availability_bitmap({day: list(hours) for day, hours in pattern}) for pattern in patterns])
+        counts = np.zeros((len(patterns), MINUTES_PER_WEEK + 1), dtype=np.int32)
+        np.cumsum(bitmaps, axis=1, out=counts[:, 1:])
+        wrapped = np.maximum(ends - MINUTES_PER_WEEK, 0)
+        covered = counts[:, np.minimum(ends, MINUTES_PER_WEEK)] - counts[:, starts] + counts[:, wrapped]
+        available = covered == (ends - starts)
+
+        # Qualification bitsets: an employee covers a requirement when no required bit is missing
+        requirement_keys = [tuple(sorted(set(shift.required_qualifications))) for shift in shifts]
+        requirements, requirement_of_shift = _factorize(requirement_keys)
+        vocabulary = {qual: bit for bit, qual in enumerate(sorted({qual for req in requirements for qual in req}))}
+        held = qualification_bitsets((emp.qualifications for emp in employees), vocabulary)
+        required = qualification_bitsets(requirements, vocabulary)
+        qualified = ((held[:, None, :] & required[None, :, :]) == required[None, :, :]).all(axis=2)
+
+        max_minutes = np.array([emp.max_hours_per_week * 60 for emp in employees])
+
+        return (
+            available[pattern_of_employee][:, window_of_shift]
+            & qualified[:, requirement_of_shift]
+            & (durations[None, :] <= max_minutes[:, None])
+        )
+
+    def is_eligible(self, employee_id: str, shift_id: str) -> bool:
+        """Look up a single (employee, shift) pair."""
+        return bool(self.matrix[self.employee_index[employee_id], self.shift_index[shift_id]])
+
+    def pair_count(self) -> int:
+        """Number of eligible (employee, shift) pairs."""
+        return int(np.count_nonzero(self.matrix))
+
+    def pairs(self) -> Iterable[Tuple[int, int]]:
+        """Row and column of every eligible pair, employee-major."""
+        rows, columns = np.nonzero(self.matrix)
+        return zip(rows.tolist(), columns.tolist())
+
+    def by_shift(self) -> Dict[str, set]:
+        """Eligible employee IDs per shift ID."""
+        employee_ids = np.array(self.employee_ids, dtype=object)
+        return {shift_id: set(employee_ids[self.matrix[:, column]].tolist()) for column, shift_id in enumerate(self.shift_ids)}
+
+
+def _factorize(keys: List[Hashable]) -> Tuple[List[Hashable], np.ndarray]:
+    """Return the distinct keys in first-seen order and the position of every key among them."""
+    positions: Dict[Hashable, int] = {}
+    codes = np.array([positions.setdefault(key, len(positions)) for key in keys], dtype=np.intp)
+    return list(positions), codes
@@ -0,0 +1,191 @@
+"""
+Greedy construction heuristic for schedules.
+
+Builds a plan that satisfies the same hard constraints as the CP-SAT model
+(eligibility, per-shift staffing limits, weekly hour limits, no overlapping
+shifts, minimum rest and maximum consecutive days) without a solver. It is used when OR-Tools is missing, for
+instances too large to model, and to seed CP-SAT with a solution hint.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .instance import SolverInstance
+from .intervals import clashes
+
+
+class GreedyScheduler:
+    """
+    Most-constrained-shift-first construction heuristic.
+
+    Shifts are filled in order of increasing slack (eligible employees minus
+    required staff), so scarce skills are placed before flexible shifts use up
+    the people who have them. Each shift takes its least loaded eligible
+    employees from a heap keyed by assigned hours, skipping anyone the shift
+    would double book, deprive of rest or push over their hour limit. Each
+    employee's assigned intervals are kept sorted, so a clash check is a binary
+    search plus a scan of the intervals within the rest window.
+    """
+
+    def __init__(
+        self,
+        employees: List,
+        shifts: List,
+        eligibility: Dict[str, Set[str]],
+        instance: SolverInstance,
+        min_rest_minutes: int = 0,
+        max_consecutive_days: Optional[int] = None,
+        carried_streaks: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            employees: Solver employees
+            shifts: Solver shifts
+            eligibility: Eligible employee IDs per shift ID
+            instance: Compact form of the shifts (absolute intervals and hours)
+            min_rest_minutes: Minimum rest between two shifts of one employee
+            max_consecutive_days: Most days an employee may work in a row (default: no limit)
+            carried_streaks: Days worked in a row up to the day before the first shift, per employee ID
+        """
+        self.employees = {emp.id: emp for emp in employees}
+        self.shifts = shifts
+        self.eligibility = eligibility
+        self.instance = instance
+        self.columns = instance.shift_index
+        self.min_rest = min_rest_minutes
+        self.max_consecutive_days = max_consecutive_days
+        self.carried_streaks = carried_streaks or {}
+
+        self.hours: Dict[str, int] = {emp.id: 0 for emp in employees}
+        self.weekly_hours: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.days: Dict[str, Set[int]] = defaultdict(set)
+        self.timelines: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.staffed: Dict[str, int] = defaultdict(int)
+        self.assignments: Set[Tuple[str, str]] = set()
+
+    def build(self) -> Set[Tuple[str, str]]:
+        """Construct the plan and return it as (employee_id, shift_id) pairs."""
+        order = [
+            (len(self.eligibility[shift.id]) - shift.min_employees, self.instance.start[self.columns[shift.id]], index)
+            for index, shift in enumerate(self.shifts)
+        ]
+        heapq.heapify(order)
+
+        while order:
+            _, _, index = heapq.heappop(order)
+            self._fill(self.shifts[index], self.shifts[index].min_employees)
+
+        self._top_up_min_hours()
+        return self.assignments
+
+    def unfilled(self) -> Dict[str, int]:
+        """Staff still missing per shift ID after build()."""
+        return {
+            shift.id: shift.min_employees - self.staffed[shift.id]
+            for shift in self.shifts
+            if self.staffed[shift.id] < shift.min_employees
+        }
+
+    def _fill(self, shift, target: int, candidates: Iterable[str] = None):
+        """Assign the least loaded feasible candidates until the shift has ``target`` staff."""
+        if self.staffed[shift.id] >= target:
+            return
+
+        column = self.columns[shift.id]
+        hours = self.instance.hours[column]
+        pool = [
+            (self.hours[emp_id], self.instance.preference_penalty(self.employees[emp_id], column), emp_id)
+            for emp_id in (candidates if candidates is not None else self.eligibility[shift.id])
+            if (emp_id, shift.id) not in self.assignments
+        ]
+        heapq.heapify(pool)
+
+        while pool and self.staffed[shift.id] < target:
+            _, _, emp_id = heapq.heappop(pool)
+            if self._can_take(emp_id, shift.id, hours):
+                self._assign(emp_id, shift.id, hours)
+
+    def _top_up_min_hours(self):
+        """
+        Give employees below their minimum hours extra shifts that still have room.
+
+        Minimums apply per calendar week and are pro-rated for weeks the horizon
+        only partly covers, as in the CP-SAT model.
+        """
+        coverage = self.instance.week_coverage()
+        by_week = defaultdict(list)
+        for shift in sorted(self.shifts, key=lambda s: self.instance.start[self.columns[s.id]]):
+            by_week[self.instance.week[self.columns[shift.id]]].append(shift)
+
+        for emp in self.employees.values():
+            if not emp.min_hours_per_week:
+                continue
+            for week, week_shifts in by_week.items():
+                min_hours = emp.min_hours_per_week * coverage[week] // 7
+                for shift in week_shifts:
+                    if self.weekly_hours[(emp.id, week)] >= min_hours:
+                        break
+                    if self.staffed[shift.id] < shift.max_employees and emp.id in self.eligibility[shift.id]:
+                        self._fill(shift, self.staffed[shift.id] + 1, [emp.id])
+
+    def _can_take(self, emp_id: str, shift_id: str, hours: int) -> bool:
+        """Check weekly hour limits, consecutive days, overlaps and rest periods for one more assignment."""
+        column = self.columns[shift_id]
+        if self.weekly_hours[(emp_id, self.instance.week[column])] + hours > self.employees[emp_id].max_hours_per_week:
+            return False
+        if self.max_consecutive_days and self._streak_with(emp_id, self.instance.day[column]) > self.max_consecutive_days:
+            return False
+
+        interval = self.instance.interval(column)
+        timeline = self.timelines[emp_id]
+        position = bisect_left(timeline, interval)
+
+        # Assigned intervals don't overlap, so their ends are sorted too and the
+        # scans stop at the first interval outside the rest window
+        index = position - 1
+        while index >= 0 and timeline[index][1] + self.min_rest > interval[0]:
+            if clashes(interval, timeline[index], self.min_rest):
+                return False
+            index -= 1
+
+        index = position
+        while index < len(timeline) and timeline[index][0] < interval[1] + self.min_rest:
+            if clashes(interval, timeline[index], self.min_rest):
+                return False
+            index += 1
+
+        return True
+
+    def _streak_with(self, emp_id: str, day: int) -> int:
+        """
+        Length of the run of worked days through ``day`` if the employee also worked it.
+
+        A run reaching back to day 0 continues the employee's carried streak.
+        """
+        days = self.days[emp_id]
+        if day in days:
+            return 0
+
+        before = day - 1
+        while before in days:
+            before -= 1
+        after = day + 1
+        while after in days:
+            after += 1
+
+        streak = after - before - 1
+        if before < 0:
+            streak += self.carried_streaks.get(emp_id, 0)
+        return streak
+
+    def _assign(self, emp_id: str, shift_id: str, hours: int):
+        """Record an assignment."""
+        column = self.columns[shift_id]
+        self.assignments.add((emp_id, shift_id))
+        self.hours[emp_id] += hours
+        self.weekly_hours[(emp_id, self.instance.week[column])] += hours
+        self.days[emp_id].add(self.instance.day[column])
+        self.staffed[shift_id] += 1
+        insort(self.timelines[emp_id], self.instance.interval(column))
@@ -0,0 +1,128 @@
+"""
+Compact solver instance representation.
+
+Model builders visit every (employee, shift) pair, so per-shift facts they
+need (absolute interval, whole-hour duration, day, calendar week, weekday and
+shift type) are computed once into flat integer arrays indexed by shift
+position instead of being derived from date and time objects on every visit.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .eligibility import DAY_NAMES
+from .intervals import absolute_interval
+
+_WEEKDAY_NAMES = [name.lower() for name in DAY_NAMES]
+
+
+class SolverInstance:
+    """
+    Array-backed view of the employees and shifts of one solve.
+
+    Shift arrays are indexed by the shift's position in ``shifts`` (see
+    ``shift_index``) and employee arrays by the employee's position in
+    ``employees``. Minutes and days count from the earliest shift date; weeks
+    are Monday-based calendar weeks counted from the week containing it.
+    """
+
+    __slots__ = (
+        "employees",
+        "shifts",
+        "horizon_start",
+        "shift_index",
+        "employee_index",
+        "start",
+        "end",
+        "hours",
+        "day",
+        "week",
+        "weekday",
+        "type_code",
+        "shift_types",
+        "max_hours",
+        "min_hours",
+    )
+
+    def __init__(self, employees: Sequence, shifts: Sequence):
+        """Convert solver employees and shifts."""
+        self.employees = list(employees)
+        self.shifts = list(shifts)
+        self.horizon_start = min((shift.date for shift in self.shifts), default=None)
+        self.shift_index: Dict[str, int] = {shift.id: column for column, shift in enumerate(self.shifts)}
+        self.employee_index: Dict[str, int] = {emp.id: row for row, emp in enumerate(self.employees)}
+
+        self.start = array("l")
+        self.end = array("l")
+        self.hours = array("l")
+        self.day = array("l")
+        self.week = array("l")
+        self.weekday = array("b")
+        self.type_code = array("b")
+        self.shift_types: List[str] = []
+
+        type_codes: Dict[str, int] = {}
+        for shift in self.shifts:
+            day = (shift.date - self.horizon_start).days
+            start, end = absolute_interval(
+                shift.date,
+                shift.start_time.hour * 60 + shift.start_time.minute,
+                shift.end_time.hour * 60 + shift.end_time.minute,
+                self.horizon_start,
+            )
+            self.start.append(start)
+            self.end.append(end)
+            self.hours.append((end - start) // 60)
+            self.day.append(day)
+            self.week.append((day + self.horizon_start.weekday()) // 7)
+            self.weekday.append(shift.date.weekday())
+
+            type_value = shift.shift_type.value
+            if type_value not in type_codes:
+                type_codes[type_value] = len(self.shift_types)
+                self.shift_types.append(type_value)
+            self.type_code.append(type_codes[type_value])
+
+        self.max_hours = array("l", (emp.max_hours_per_week for emp in self.employees))
+        self.min_hours = array("l", (emp.min_hours_per_week for emp in self.employees))
+
+    def matches(self, employees: Sequence, shifts: Sequence) -> bool:
+        """Whether this instance was built from exactly these employees and shifts."""
+        return (
+            len(employees) == len(self.employees)
+            and len(shifts) == len(self.shifts)
+            and all(ours is theirs for ours, theirs in zip(self.employees, employees))
+            and all(ours is theirs for ours, theirs in zip(self.shifts, shifts))
+        )
+
+    def interval(self, column: int) -> Tuple[int, int]:
+        """Absolute (start, end) minutes of a shift."""
+        return self.start[column], self.end[column]
+
+    def intervals(self, shift_ids: Optional[Sequence[str]] = None) -> List[Tuple[str, int, int]]:
+        """(shift_id, start, end) for the given shifts (default: all)."""
+        columns = range(len(self.shifts)) if shift_ids is None else (self.shift_index[sid] for sid in shift_ids)
+        return [(self.shifts[column].id, self.start[column], self.end[column]) for column in columns]
+
+    def week_coverage(self) -> List[int]:
+        """Number of days of every week, from the earliest to the latest shift date, inside the horizon."""
+        if not self.shifts:
+            return []
+        offset = self.horizon_start.weekday()
+        last = max(self.day) + offset
+        return [min(7, last - 7 * week + 1) - (offset if week == 0 else 0) for week in range(last // 7 + 1)]
+
+    def preference_penalty(self, employee, column: int) -> int:
+        """Objective penalty for assigning ``employee`` to a shift against their preferences."""
+        preferences = employee.preferences
+        if not preferences:
+            return 0
+
+        penalty = 0
+        if "preferred_shift_type" in preferences:
+            if self.shift_types[self.type_code[column]] != preferences["preferred_shift_type"]:
+                penalty += 10
+        if "preferred_days" in preferences:
+            if _WEEKDAY_NAMES[self.weekday[column]] not in preferences["preferred_days"]:
+                penalty += 5
+        return penalty
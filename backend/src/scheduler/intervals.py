@@ -0,0 +1,170 @@
+"""Interval helpers for building time-based scheduling constraints."""
+
+import heapq
+from bisect import bisect_right
+from collections import deque
+from datetime import date
+from typing import Hashable, Iterator, List, Sequence, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def absolute_interval(shift_date: date, start_minute: int, end_minute: int, horizon_start: date) -> Tuple[int, int]:
+    """
+    Convert a shift to absolute minutes since the start of the horizon.
+
+    Shifts whose end time is earlier than their start time cross midnight and
+    end on the following day.
+    """
+    offset = (shift_date - horizon_start).days * MINUTES_PER_DAY
+    start = offset + start_minute
+    end = offset + end_minute
+    if end_minute < start_minute:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def within_gap(first: Tuple[int, int], second: Tuple[int, int], gap: int = 0) -> bool:
+    """
+    Check whether two ``(start, end)`` intervals overlap or are separated by
+    less than ``gap`` minutes.
+    """
+    return first[0] < second[1] + gap and second[0] < first[1] + gap
+
+
+def clashes(first: Tuple[int, int], second: Tuple[int, int], min_rest: int = 0) -> bool:
+    """
+    Check whether one employee cannot work both ``(start, end)`` intervals.
+
+    They clash when they overlap or when one starts less than ``min_rest``
+    minutes after the other ends. Back-to-back intervals do not clash, matching
+    the rest cliques of IntervalIndex.
+    """
+    if first[0] < second[1] and second[0] < first[1]:
+        return True
+    gap = second[0] - first[1] if second[0] >= first[1] else first[0] - second[1]
+    return 0 < gap < min_rest
+
+
+def overlap_cliques(intervals: Sequence[Tuple[Hashable, int, int]]) -> List[List[Hashable]]:
+    """
+    Compute the maximal cliques of mutually overlapping intervals.
+
+    Uses a sweep line over half-open ``(key, start, end)`` intervals sorted by
+    start. In an interval graph every maximal clique is the active set just
+    before an end event that follows at least one start event, so all cliques
+    are found in O(n log n + output). Only cliques with two or more members are
+    returned.
+    """
+    events = []
+    for key, start, end in intervals:
+        if start < end:
+            # Ends sort before starts at the same minute: back-to-back shifts don't overlap
+            events.append((start, 1, key))
+            events.append((end, 0, key))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    cliques = []
+    active = {}
+    grown = False
+
+    for _, is_start, key in events:
+        if is_start:
+            active[key] = None
+            grown = True
+        else:
+            if grown and len(active) > 1:
+                cliques.append(list(active))
+            grown = False
+            del active[key]
+
+    return cliques
+
+
+def sweep_conflicts(
+    intervals: Sequence[Tuple[Hashable, int, int]], min_rest: int = 0
+) -> Iterator[Tuple[Hashable, Hashable, int]]:
+    """
+    Yield ``(earlier, later, gap)`` for every pair of one employee's intervals
+    that overlap or leave less than ``min_rest`` minutes of rest.
+
+    ``gap`` is the later start minus the earlier end, negative for overlaps.
+    Intervals are swept in start order with a heap of the ends of the active
+    ones: whatever is still active when an interval starts overlaps it. Ended
+    intervals move to a queue ordered by end and are dropped once they ended
+    ``min_rest`` or more before the current start, so every interval left in
+    the queue is too close to it (back-to-back intervals excepted). Runs in
+    O(n log n + k) for k reported pairs.
+    """
+    active = []
+    ended = deque()
+    for order, (key, start, end) in enumerate(sorted(intervals, key=lambda interval: (interval[1], interval[2]))):
+        while active and active[0][0] <= start:
+            ended_end, _, ended_key = heapq.heappop(active)
+            ended.append((ended_end, ended_key))
+        while ended and start - ended[0][0] >= min_rest:
+            ended.popleft()
+
+        for other_end, _, other_key in active:
+            yield other_key, key, start - other_end
+        for other_end, other_key in ended:
+            if other_end < start:
+                yield other_key, key, start - other_end
+
+        heapq.heappush(active, (end, order, key))
+
+
+class IntervalIndex:
+    """
+    Index of absolute shift intervals, built once per solve.
+
+    Intervals are kept sorted by start so that every interval starting inside a
+    window after another interval's end can be found with a binary search.
+    """
+
+    def __init__(self, intervals: Sequence[Tuple[Hashable, int, int]]):
+        """Index ``(key, start, end)`` intervals."""
+        self.intervals = sorted(intervals, key=lambda interval: interval[1])
+        self.starts = [start for _, start, _ in self.intervals]
+
+    def overlap_cliques(self) -> List[List[Hashable]]:
+        """Maximal cliques of mutually overlapping intervals."""
+        return overlap_cliques(self.intervals)
+
+    def starting_within(self, minute: int, window: int) -> List[Tuple[Hashable, int, int]]:
+        """Intervals starting strictly after ``minute`` and strictly before ``minute + window``."""
+        lo = bisect_right(self.starts, minute)
+        hi = bisect_right(self.starts, minute + window - 1)
+        return self.intervals[lo:hi]
+
+    def short_rest_pairs(self, min_rest: int) -> Iterator[Tuple[Hashable, List[Tuple[Hashable, int, int]]]]:
+        """
+        Yield ``(key, followers)`` for every interval with followers that start
+        less than ``min_rest`` minutes after it ends.
+
+        Runs in O(S log S + k) where k is the number of short-rest pairs.
+        """
+        for key, _, end in self.intervals:
+            followers = self.starting_within(end, min_rest)
+            if followers:
+                yield key, followers
+
+    def rest_cliques(self, min_rest: int) -> List[List[Hashable]]:
+        """
+        Group short-rest pairs into cliques of mutually exclusive intervals.
+
+        Every follower conflicts with the interval it follows, and followers that
+        overlap each other conflict too, so each overlap clique among the
+        followers forms a clique together with the preceding interval. Followers
+        that overlap no other follower are paired with it directly.
+        """
+        cliques = []
+        for key, followers in self.short_rest_pairs(min_rest):
+            covered = set()
+            for clique in overlap_cliques(followers):
+                cliques.append([key] + clique)
+                covered.update(clique)
+            for follower_key, _, _ in followers:
+                if follower_key not in covered:
+                    cliques.append([key, follower_key])
+        return cliques
@@ -0,0 +1,226 @@
+"""
+Rolling-horizon solving of long date ranges.
+
+A month or quarter is solved one window at a time: each window covers the
+weeks being committed plus a few look-ahead days of the following week, so
+the solver sees what comes right after the boundary. Only the committed weeks
+are kept; the next window starts where they end and receives the state they
+leave behind (last shift and working-day streak per employee, hours and
+weekend shifts worked so far) as a CarryOver. Only one window's model exists
+at a time, so memory stays bounded however long the range is.
+"""
+
+import logging
+import time as time_module
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .constraint_solver import CarryOver, Employee, ScheduleOptimizer, SchedulingConstraint, Shift
+from .decomposition import week_start_of
+
+logger = logging.getLogger(__name__)
+
+
+def use_rolling_horizon(config: Dict[str, Any], shifts: List[Shift]) -> bool:
+    """Whether the shifts span more days than ``config["rolling_horizon_days"]``."""
+    threshold = config.get("rolling_horizon_days")
+    if not threshold or not shifts:
+        return False
+    dates = [shift.date for shift in shifts]
+    return (max(dates) - min(dates)).days + 1 > threshold
+
+
+def horizon_windows(shifts: List[Shift], window_weeks: int = 1, overlap_days: int = 0) -> List[Tuple[List[Shift], Set[str]]]:
+    """
+    Split shifts into rolling windows.
+
+    Returns:
+        (window shifts, IDs of the shifts committed by the window) per window, in
+        date order. Committed shifts are ``window_weeks`` Monday-based weeks; the
+        window adds the first ``overlap_days`` days after them.
+    """
+    weeks = defaultdict(list)
+    for shift in shifts:
+        weeks[week_start_of(shift.date)].append(shift)
+
+    starts = sorted(weeks)
+    windows = []
+    for index in range(0, len(starts), window_weeks):
+        committed = [shift for week in starts[index : index + window_weeks] for shift in weeks[week]]
+        lookahead_end = starts[index] + timedelta(weeks=window_weeks, days=overlap_days)
+        lookahead = [
+            shift
+            for week in starts[index + window_weeks :]
+            if week < lookahead_end
+            for shift in weeks[week]
+            if shift.date < lookahead_end
+        ]
+        windows.append((committed + lookahead, {shift.id for shift in committed}))
+    return windows
+
+
+def advance_carry_over(
+    carry_over: CarryOver, shifts: List[Shift], assignments: Iterable[Tuple[str, str]], next_start: date
+) -> CarryOver:
+    """
+    State after committing ``assignments`` to ``shifts``, for a window starting on ``next_start``.
+
+    Streaks count the days worked in a row up to ``next_start - 1``; a streak
+    covering every committed day continues the carried one.
+    """
+    shift_map = {shift.id: shift for shift in shifts}
+    first_day = min(shift.date for shift in shifts)
+
+    last_shift = dict(carry_over.last_shift)
+    hours = dict(carry_over.hours)
+    weekend_shifts = dict(carry_over.weekend_shifts)
+    worked_days = defaultdict(set)
+
+    for emp_id, shift_id in assignments:
+        shift = shift_map[shift_id]
+        start = datetime.combine(shift.date, shift.start_time)
+        end = start + timedelta(hours=shift.get_duration_hours())
+        if emp_id not in last_shift or end > last_shift[emp_id][1]:
+            last_shift[emp_id] = (start, end)
+        hours[emp_id] = hours.get(emp_id, 0) + int(shift.get_duration_hours())
+        if shift.date.weekday() >= 5:
+            weekend_shifts[emp_id] = weekend_shifts.get(emp_id, 0) + 1
+        worked_days[emp_id].add(shift.date)
+
+    consecutive_days = {}
+    for emp_id, days in worked_days.items():
+        day, streak = next_start - timedelta(days=1), 0
+        while day in days:
+            streak += 1
+            day -= timedelta(days=1)
+        if streak and day < first_day:
+            streak += carry_over.consecutive_days.get(emp_id, 0)
+        if streak:
+            consecutive_days[emp_id] = streak
+
+    return CarryOver(last_shift, consecutive_days, hours, weekend_shifts)
+
+
+def solve_rolling(
+    config: Dict[str, Any],
+    employees: List[Employee],
+    shifts: List[Shift],
+    constraints: Optional[List[SchedulingConstraint]] = None,
+    existing_assignments: Optional[Iterable[Tuple[str, str]]] = None,
+    minimal_change_weight: int = 0,
+    stop_event: Any = None,
+) -> Dict[str, Any]:
+    """
+    Solve a long range window by window with carried-over state.
+
+    Args:
+        config: ScheduleOptimizer configuration; ``rolling_window_weeks`` (default 1)
+            sets the weeks committed per window and ``rolling_overlap_days``
+            (default 2) the look-ahead days solved but not committed
+        employees: All employees
+        shifts: All shift instances
+        constraints: Custom constraints, applied to every window
+        existing_assignments: Current plan as (employee_id, shift_id) pairs, passed
+            to the windows it falls into
+        minimal_change_weight: Penalty per deviation from the current plan
+        stop_event: Checked between windows; when set, solving stops early
+
+    Returns:
+        Dict in the same format as ScheduleOptimizer.generate_schedule. Windows
+        solved with the greedy heuristic (status "fallback") are committed like
+        any other; their understaffed shifts are reported in ``unfilled`` and the
+        status is then "fallback".
+    """
+    started = time_module.monotonic()
+    windows = horizon_windows(shifts, config.get("rolling_window_weeks", 1), config.get("rolling_overlap_days", 2))
+    if not windows:
+        return {"status": "error", "message": "No shifts to schedule", "schedule": []}
+
+    existing = set(existing_assignments or ())
+    carry_over = CarryOver()
+    assignments: Set[Tuple[str, str]] = set()
+    statuses = []
+    unfilled = []
+    build_time = solve_time = 0.0
+    max_window_variables = 0
+
+    for index, (window_shifts, committed) in enumerate(windows):
+        if stop_event is not None and stop_event.is_set():
+            return {"status": "unknown", "message": "Stopped before all windows were solved", "schedule": []}
+
+        window_ids = {shift.id for shift in window_shifts}
+        optimizer = ScheduleOptimizer(config=config)
+        result = optimizer.generate_schedule(
+            employees=employees,
+            shifts=window_shifts,
+            constraints=constraints or [],
+            existing_assignments={key for key in existing if key[1] in window_ids},
+            minimal_change_weight=minimal_change_weight,
+            carry_over=carry_over,
+        )
+
+        window_start = min(shift.date for shift in window_shifts)
+        if result["status"] not in ["optimal", "feasible", "fallback"]:
+            failure = {
+                "status": result["status"],
+                "message": f"Window starting {window_start}: {result.get('message')}",
+                "schedule": [],
+                "statistics": result.get("statistics", {}),
+            }
+            failure.update({key: result[key] for key in ("bottlenecks", "conflicts") if key in result})
+            return failure
+
+        kept = {
+            (emp["id"], entry["shift_id"])
+            for entry in result["schedule"]
+            if entry["shift_id"] in committed
+            for emp in entry["assigned_employees"]
+        }
+        assignments |= kept
+        statuses.append(result["status"])
+        unfilled.extend(entry for entry in result.get("unfilled", []) if entry["shift_id"] in committed)
+
+        statistics = result.get("statistics", {})
+        build_time += statistics.get("build_time", 0.0)
+        solve_time += statistics.get("solve_time", 0.0)
+        max_window_variables = max(max_window_variables, statistics.get("num_variables", 0))
+
+        if index + 1 < len(windows):
+            committed_shifts = [shift for shift in window_shifts if shift.id in committed]
+            next_start = min(shift.date for shift in windows[index + 1][0])
+            carry_over = advance_carry_over(carry_over, committed_shifts, kept, next_start)
+            logger.debug(f"Committed window starting {window_start}: {len(kept)} assignments")
+
+    names = {emp.id: emp.name for emp in employees}
+    assigned = defaultdict(list)
+    for emp_id, shift_id in sorted(assignments):
+        assigned[shift_id].append({"id": emp_id, "name": names[emp_id]})
+
+    schedule = [
+        {
+            "shift_id": shift.id,
+            "date": shift.date.isoformat(),
+            "start_time": shift.start_time.isoformat(),
+            "end_time": shift.end_time.isoformat(),
+            "assigned_employees": assigned[shift.id],
+        }
+        for shift in shifts
+    ]
+
+    result = {
+        "status": "optimal" if statuses == ["optimal"] else "feasible",
+        "schedule": schedule,
+        "statistics": {
+            "method": "rolling_horizon",
+            "solve_time": time_module.monotonic() - started,
+            "windows": len(windows),
+            "max_window_variables": max_window_variables,
+            "phases": {"build_model": build_time, "solve": solve_time},
+        },
+    }
+    if unfilled:
+        result["status"] = "fallback"
+        result["unfilled"] = unfilled
+        result["message"] = f"Rolling-horizon solve left {len(unfilled)} shifts understaffed"
+    return result
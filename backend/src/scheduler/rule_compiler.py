@@ -0,0 +1,373 @@
+"""
+Compilation of stored scheduling rules into model constraints.
+
+A Rule's ``rule_type`` and JSON ``constraints`` payload (days, times, shift
+types and hour limits, in the shapes produced by the rule parser, the
+import/validation layer or written by hand) are interpreted once into
+RuleTemplates: a shift selector plus a linear limit such as "no assignments"
+or "at most N hours per week". The templates of a rule are cached by
+(rule_id, updated_at), so later generations reuse them until the rule is
+edited.
+
+Applying a template to a model only touches arrays: the selector is
+evaluated as a boolean mask over the SolverInstance shift arrays, and each
+(employee, period) group becomes one row of assignment variables with
+coefficients (1 per shift or the shift's hours) and a bound, added as a
+single weighted sum. Strict rules are hard constraints; other rules get a
+slack variable whose every unit costs the rule's priority in the objective.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .constraint_solver import SchedulingConstraint
+from .instance import SolverInstance
+from .intervals import MINUTES_PER_DAY, IntervalIndex
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+logger = logging.getLogger(__name__)
+
+_DAYS = {
+    "monday": (0,),
+    "tuesday": (1,),
+    "wednesday": (2,),
+    "thursday": (3,),
+    "friday": (4,),
+    "saturday": (5,),
+    "sunday": (6,),
+    "weekday": (0, 1, 2, 3, 4),
+    "weekend": (5, 6),
+}
+_DAYS.update({name[:3]: days for name, days in list(_DAYS.items())[:7]})
+_SHIFT_TYPES = {"evening": ("evening", "night"), "night": ("night", "evening")}
+_RESTRICTING_ACTIONS = ("restrict", "forbid", "exclude", "avoid", "block")
+_TIME = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?")
+
+# Payload row: (variables, coefficients, lower bound, upper bound)
+Row = Tuple[List[Any], List[int], Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class ShiftSelector:
+    """Shifts a rule talks about: all facets given must match (none given: every shift)."""
+
+    weekdays: FrozenSet[int] = frozenset()
+    window: Optional[Tuple[int, int]] = None  # Minutes of the day; shifts overlapping it match
+    shift_types: FrozenSet[str] = frozenset()
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no facet is given."""
+        return not self.weekdays and self.window is None and not self.shift_types
+
+    def mask(self, instance: SolverInstance) -> np.ndarray:
+        """Boolean mask over the instance's shifts."""
+        selected = np.ones(len(instance.shifts), dtype=bool)
+
+        if self.weekdays:
+            selected &= np.isin(np.asarray(instance.weekday), list(self.weekdays))
+
+        if self.shift_types:
+            codes = [code for code, name in enumerate(instance.shift_types) if name in self.shift_types]
+            selected &= np.isin(np.asarray(instance.type_code), codes)
+
+        if self.window is not None:
+            start = np.asarray(instance.start) % MINUTES_PER_DAY
+            end = start + (np.asarray(instance.end) - np.asarray(instance.start))
+            first, last = self.window
+            if last <= first:
+                last += MINUTES_PER_DAY
+            # Compare on two days so windows and shifts running past midnight overlap correctly
+            overlaps = np.zeros(len(instance.shifts), dtype=bool)
+            for shift_by in (-MINUTES_PER_DAY, 0, MINUTES_PER_DAY):
+                overlaps |= (start + shift_by < last) & (first < end + shift_by)
+            selected &= overlaps
+
+        return selected
+
+
+@dataclass(frozen=True)
+class RuleTemplate:
+    """
+    One linear limit of a rule over the shifts picked by its selector.
+
+    Kinds:
+        forbid: no assignments to selected shifts
+        only: no assignments to unselected shifts
+        max_hours / min_hours: hours on selected shifts per ``period`` (day or week)
+        max_consecutive: at most ``limit`` selected shifts in any ``limit + 1`` consecutive days
+        min_rest: at least ``limit`` hours between selected shifts
+    """
+
+    kind: str
+    selector: ShiftSelector = field(default_factory=ShiftSelector)
+    limit: int = 0
+    period: str = "week"
+
+    def rows(
+        self, instance: SolverInstance, employees: Iterable[Any], assignments: Dict[Tuple[str, str], Any]
+    ) -> Iterator[Row]:
+        """Variable rows of this template for each employee."""
+        mask = self.selector.mask(instance)
+        if self.kind == "only":
+            mask = ~mask
+        columns = np.flatnonzero(mask)
+        if not len(columns):
+            return
+
+        shift_ids = [instance.shifts[column].id for column in columns.tolist()]
+        if self.kind in ("forbid", "only"):
+            groups = [(shift_ids, [1] * len(shift_ids))]
+            lower, upper = None, 0
+        elif self.kind in ("max_hours", "min_hours"):
+            periods = np.asarray(instance.day if self.period == "day" else instance.week)[columns]
+            groups = _grouped(shift_ids, periods, np.asarray(instance.hours)[columns])
+            lower, upper = (None, self.limit) if self.kind == "max_hours" else (self.limit, None)
+        elif self.kind == "max_consecutive":
+            days = np.asarray(instance.day)[columns]
+            groups = [
+                ([sid for sid, inside in zip(shift_ids, (days >= first) & (days <= first + self.limit)) if inside], None)
+                for first in range(int(days.min()), int(days.max()) - self.limit + 1)
+            ]
+            lower, upper = None, self.limit
+        elif self.kind == "min_rest":
+            cliques = IntervalIndex(instance.intervals(shift_ids)).rest_cliques(self.limit * 60)
+            groups = [(clique, None) for clique in cliques]
+            lower, upper = None, 1
+        else:
+            return
+
+        for emp in employees:
+            for group_ids, coefficients in groups:
+                pairs = [
+                    (assignments[(emp.id, sid)], 1 if coefficients is None else coefficients[index])
+                    for index, sid in enumerate(group_ids)
+                    if (emp.id, sid) in assignments
+                ]
+                if not pairs:
+                    continue
+                variables, weights = [var for var, _ in pairs], [weight for _, weight in pairs]
+                # Skip rows that cannot bind
+                if upper is not None and lower is None and sum(weights) <= upper:
+                    continue
+                yield variables, weights, lower, upper
+
+
+def _grouped(shift_ids: List[str], keys: np.ndarray, hours: np.ndarray) -> List[Tuple[List[str], List[int]]]:
+    """Shift IDs and hours per distinct key."""
+    groups = []
+    for key in np.unique(keys).tolist():
+        inside = np.flatnonzero(keys == key).tolist()
+        groups.append(([shift_ids[index] for index in inside], [int(hours[index]) for index in inside]))
+    return groups
+
+
+@dataclass
+class CompiledRule(SchedulingConstraint):
+    """A stored rule with its compiled templates (preferences are never strict)."""
+
+    templates: Tuple[RuleTemplate, ...] = ()
+    employee_id: Optional[str] = None  # Only this employee's assignments are constrained
+    strict: bool = False  # Hard constraint; otherwise violations are penalized by priority
+    updated_at: Optional[datetime] = None
+
+    def apply(self, model: Any, variables: Dict, context: Dict) -> bool:
+        """
+        Add every template row to the model.
+
+        Non-strict rules append their slack penalties to ``context["penalties"]``;
+        without that list (e.g. while explaining infeasibility) they add nothing.
+        """
+        instance = context["instance"]
+        employees = [emp for emp in context["employees"] if self.employee_id is None or emp.id == self.employee_id]
+        penalties = context.get("penalties")
+        if not employees or not self.templates or (penalties is None and not self.strict):
+            return True
+
+        for template in self.templates:
+            for index, (row_vars, coefficients, lower, upper) in enumerate(
+                template.rows(instance, employees, variables["assignments"])
+            ):
+                expression = cp_model.LinearExpr.WeightedSum(row_vars, coefficients)
+                if self.strict:
+                    if lower is None:
+                        model.Add(expression <= upper)
+                    else:
+                        model.Add(expression >= lower)
+                    continue
+
+                slack = model.NewIntVar(0, sum(coefficients) if lower is None else lower, f"rule_{self.id}_{index}")
+                if lower is None:
+                    model.Add(expression - slack <= upper)
+                else:
+                    model.Add(expression + slack >= lower)
+                penalties.append(slack * max(1, self.priority))
+        return True
+
+
+class RuleCompiler:
+    """Compiles Rule rows, caching templates by (rule_id, updated_at)."""
+
+    def __init__(self):
+        """Start with an empty cache."""
+        self._templates: Dict[Any, Tuple[Any, Tuple[RuleTemplate, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, rule: Any) -> CompiledRule:
+        """Compiled constraint of a Rule row, from the cache while the rule is unchanged."""
+        with self._lock:
+            cached = self._templates.get(rule.id)
+            if cached is not None and cached[0] == rule.updated_at:
+                self.hits += 1
+                templates = cached[1]
+            else:
+                self.misses += 1
+                templates = compile_templates(rule.rule_type, rule.constraints or {})
+                self._templates[rule.id] = (rule.updated_at, templates)
+
+        parameters = dict(rule.constraints or {})
+        employee_id = str(rule.employee_id) if rule.employee_id is not None else None
+        if employee_id is not None:
+            parameters["employee_id"] = employee_id
+
+        return CompiledRule(
+            id=str(rule.id),
+            name=rule.rule_text,
+            type=rule.rule_type,
+            parameters=parameters,
+            priority=rule.priority,
+            templates=templates,
+            employee_id=employee_id,
+            strict=bool(rule.strict) and rule.rule_type != "preference",
+            updated_at=rule.updated_at,
+        )
+
+    def clear(self):
+        """Forget all compiled rules."""
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every generation in this process
+rule_compiler = RuleCompiler()
+
+
+def compile_templates(rule_type: str, constraints: Dict[str, Any]) -> Tuple[RuleTemplate, ...]:
+    """
+    Interpret a rule payload.
+
+    availability and preference rules allow only the selected shifts and
+    restriction rules (or any with a restricting ``action``, e.g. "restrict")
+    forbid them; with hour limits in the payload they limit hours on those
+    shifts instead. workload, overtime and requirement rules limit hours, and
+    consecutive_days and rest_period rules take their limit from the payload. Qualification rules
+    are already covered by shift eligibility. Payloads that select nothing
+    compile to no templates.
+    """
+    selector = _selector(constraints)
+    limits = _hour_limits(constraints, minimum_by_default=rule_type == "requirement")
+    restricts = rule_type == "restriction" or str(constraints.get("action", "")).lower() in _RESTRICTING_ACTIONS
+    templates: List[RuleTemplate] = []
+
+    if rule_type in ("workload", "overtime", "requirement") or (rule_type in ("restriction", "availability") and limits):
+        templates.extend(RuleTemplate(kind, selector, limit, period) for kind, limit, period in limits)
+    if rule_type in ("restriction", "availability", "preference") and not limits and not selector.is_empty:
+        templates.append(RuleTemplate("forbid" if restricts else "only", selector))
+    if rule_type == "consecutive_days":
+        limit = _first_number(constraints, ("max_consecutive_days", "max_days", "days", "value"))
+        if limit:
+            templates.append(RuleTemplate("max_consecutive", selector, limit))
+    if rule_type == "rest_period":
+        limit = _first_number(constraints, ("min_rest_hours", "rest_hours", "hours", "value"))
+        if limit:
+            templates.append(RuleTemplate("min_rest", selector, limit))
+
+    if not templates:
+        logger.debug(f"Rule of type {rule_type} with payload {constraints} compiles to no constraints")
+    return tuple(templates)
+
+
+def _values(raw: Any) -> List[Any]:
+    """Payload list entries, unwrapping {"value": ...} items."""
+    if raw is None:
+        return []
+    items = raw if isinstance(raw, (list, tuple)) else [raw]
+    return [item.get("value") if isinstance(item, dict) else item for item in items]
+
+
+def _minutes(value: Any) -> Optional[int]:
+    """Minutes of the day of "9:00", "9 pm" or "21:30"."""
+    match = _TIME.search(str(value).lower())
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem == "pm" and hour < 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    return (hour * 60 + minute) % MINUTES_PER_DAY
+
+
+def _selector(constraints: Dict[str, Any]) -> ShiftSelector:
+    weekdays = set()
+    for day in _values(constraints.get("days")):
+        day = str(day).lower()
+        weekdays.update(_DAYS.get(day) or _DAYS.get(day[:3], ()))
+
+    shift_types = set()
+    for shift_type in _values(constraints.get("shifts")) + _values(constraints.get("shift_types")):
+        shift_type = str(shift_type).lower()
+        shift_types.update(_SHIFT_TYPES.get(shift_type, (shift_type,)))
+
+    times = [_minutes(value) for value in _values(constraints.get("times"))]
+    if "startTime" in constraints and "endTime" in constraints:
+        times = [_minutes(constraints["startTime"]), _minutes(constraints["endTime"])]
+    times = [minutes for minutes in times if minutes is not None]
+    window = (times[0], times[1]) if len(times) >= 2 else None
+
+    return ShiftSelector(frozenset(weekdays), window, frozenset(shift_types))
+
+
+def _hour_limits(constraints: Dict[str, Any], minimum_by_default: bool) -> List[Tuple[str, int, str]]:
+    """(kind, hours, period) of every hour limit in the payload."""
+    entries = constraints.get("hours")
+    entries = entries if isinstance(entries, list) else [] if entries is None else [entries]
+
+    limits = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            value, text = entry.get("value"), str(entry.get("constraint", "")).lower()
+        else:
+            value, text = entry, ""
+        if not isinstance(value, (int, float)) or value <= 0:
+            continue
+        if text.startswith("min"):
+            kind = "min_hours"
+        elif text.startswith(("max", "no more")):
+            kind = "max_hours"
+        else:
+            kind = "min_hours" if minimum_by_default else "max_hours"
+        period = "day" if "per day" in text or constraints.get("period") == "day" else "week"
+        limits.append((kind, int(value), period))
+    return limits
+
+
+def _first_number(constraints: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[int]:
+    for key in keys:
+        values = _values(constraints.get(key))
+        if values and isinstance(values[0], (int, float)) and values[0] > 0:
+            return int(values[0])
+    return None
@@ -0,0 +1,172 @@
+"""
+Adaptive solve-time budgeting and early termination.
+
+The configured ``max_solve_time`` is a ceiling. Within it, each solve gets a
+soft time limit derived from the model size, or from how long earlier solves
+of similar size took to reach their best solution, and a number of CP-SAT
+workers that grows with the model. Once a solution exists the search stops at
+the soft limit, when the relative gap drops below ``relative_gap_limit``, or
+when ``stall_time`` seconds pass without an improving solution. A search that
+has not found any solution yet keeps going until the ceiling.
+"""
+
+import os
+import threading
+import time as time_module
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Workers by model size: (variables below, workers)
+WORKER_TIERS = [(1_000, 1), (20_000, 4)]
+MAX_WORKERS = 8
+
+
+@dataclass
+class SolvePlan:
+    """Limits for one CP-SAT search."""
+
+    time_limit: float  # Soft limit, applied once a solution exists
+    max_time: float  # Hard limit
+    num_workers: int  # 0 lets CP-SAT decide
+    relative_gap_limit: float = 0.0
+    stall_time: Optional[float] = None
+
+    @property
+    def needs_watcher(self) -> bool:
+        """Whether stopping early needs a watcher beyond CP-SAT's own limits."""
+        return self.time_limit < self.max_time or bool(self.stall_time)
+
+
+@dataclass
+class SolveRecord:
+    """Outcome of one solve, for budgeting later ones."""
+
+    num_variables: int
+    solve_time: float
+    first_solution_time: Optional[float] = None
+    best_solution_time: Optional[float] = None
+
+
+class SolveHistory:
+    """Recent solve outcomes of this process."""
+
+    def __init__(self, max_records: int = 200):
+        """Keep at most ``max_records`` outcomes."""
+        self.records: Deque[SolveRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, record: SolveRecord):
+        """Remember a solve outcome."""
+        with self._lock:
+            self.records.append(record)
+
+    def similar(self, num_variables: int, ratio: float = 2.0) -> List[SolveRecord]:
+        """Outcomes of solves with between 1/ratio and ratio times as many variables."""
+        with self._lock:
+            return [
+                record for record in self.records if num_variables / ratio <= record.num_variables <= num_variables * ratio
+            ]
+
+    def clear(self):
+        """Forget all outcomes."""
+        with self._lock:
+            self.records.clear()
+
+
+# Shared by every optimizer in this process (pool workers keep theirs across jobs)
+solve_history = SolveHistory()
+
+
+def plan_solve(
+    config: Dict[str, Any], num_variables: int, history: Optional[SolveHistory] = None, cores: Optional[int] = None
+) -> SolvePlan:
+    """
+    Choose the limits of a solve from the optimizer config and the model size.
+
+    Without ``config["adaptive_time_limit"]`` the plan is the static
+    ``max_solve_time`` and ``num_search_workers`` of the config.
+    """
+    max_time = config.get("max_solve_time", 30)
+    gap_limit = config.get("relative_gap_limit") or 0.0
+    stall_time = config.get("stall_time")
+
+    if not config.get("adaptive_time_limit"):
+        return SolvePlan(max_time, max_time, config.get("num_search_workers") or 0, gap_limit, stall_time)
+
+    # Time to the best solution of similar solves, scaled to this size, with headroom
+    history = solve_history if history is None else history
+    observed = [
+        record.best_solution_time * num_variables / max(1, record.num_variables)
+        for record in history.similar(num_variables)
+        if record.best_solution_time is not None
+    ]
+    if observed:
+        estimate = max(observed) * config.get("history_headroom", 1.5)
+    else:
+        estimate = config.get("solve_seconds_per_1k_variables", 1.0) * num_variables / 1000
+
+    time_limit = min(max_time, max(config.get("min_solve_time", 2), estimate))
+
+    workers = config.get("num_search_workers")
+    if not workers:
+        workers = next((count for below, count in WORKER_TIERS if num_variables < below), MAX_WORKERS)
+        workers = max(1, min(workers, cores or os.cpu_count() or 1))
+
+    return SolvePlan(time_limit, max_time, workers, gap_limit, stall_time)
+
+
+class EarlyStop:
+    """
+    Stop a running search at the plan's soft limit or after a stall.
+
+    Call ``on_solution`` for every improving solution; use as a context manager
+    around the solve. Neither limit applies before the first solution, and a
+    search whose first solution came after the soft limit only stops on a stall
+    (or at the hard limit), so it still gets to improve on it.
+    """
+
+    def __init__(self, plan: SolvePlan, stop: Callable[[], None], poll_interval: float = 0.1):
+        """Watch the search on behalf of ``stop``, usually CpSolver.StopSearch."""
+        self.plan = plan
+        self.stop_reason: Optional[str] = None
+        self.first_solution_time: Optional[float] = None
+        self.best_solution_time: Optional[float] = None
+        self._stop = stop
+        self._poll_interval = poll_interval
+        self._started = 0.0
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_solution(self):
+        """Record an improving solution."""
+        elapsed = time_module.monotonic() - self._started
+        if self.first_solution_time is None:
+            self.first_solution_time = elapsed
+        self.best_solution_time = elapsed
+
+    def __enter__(self) -> "EarlyStop":
+        self._started = time_module.monotonic()
+        if self.plan.needs_watcher:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self):
+        while not self._done.wait(self._poll_interval):
+            if self.best_solution_time is None:
+                continue
+            elapsed = time_module.monotonic() - self._started
+            if elapsed >= self.plan.time_limit and self.first_solution_time < self.plan.time_limit:
+                self.stop_reason = "time_limit"
+            elif self.plan.stall_time and elapsed - self.best_solution_time >= self.plan.stall_time:
+                self.stop_reason = "stall"
+            else:
+                continue
+            self._stop()
+            return
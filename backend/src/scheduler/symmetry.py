@@ -0,0 +1,124 @@
+"""
+Symmetry breaking for interchangeable employees.
+
+Employees with the same eligible shifts, hour limits, preferences, carried
+state and current assignments are indistinguishable to the model: swapping
+the schedules of two of them gives a solution of the same cost. Such
+employees form an equivalence class, and within a class their assignment
+vectors (over the shifts they are eligible for, in start order) are required
+to be in non-increasing lexicographic order. Any solution can be permuted
+into that order, so the optimum stays reachable while the search no longer
+explores the other permutations.
+"""
+
+import json
+from collections import defaultdict
+from typing import Any, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .eligibility import EligibilityMatrix
+
+
+def employee_classes(
+    employees: Sequence[Any],
+    eligibility: EligibilityMatrix,
+    existing_assignments: Iterable[Tuple[str, str]] = (),
+    carry_over: Optional[Any] = None,
+    constraints: Iterable[Any] = (),
+) -> List[List[int]]:
+    """
+    Group interchangeable employees.
+
+    Args:
+        employees: Employees in matrix row order
+        eligibility: Eligibility matrix of the employees
+        existing_assignments: Current plan as (employee_id, shift_id) pairs
+        carry_over: CarryOver of a rolling-horizon window, if any
+        constraints: Custom constraints; employees named by a constraint's
+            ``employee_id`` parameter are never grouped
+
+    Returns:
+        Row indexes of every class with at least two employees, in row order
+    """
+    current = defaultdict(set)
+    for emp_id, shift_id in existing_assignments:
+        current[emp_id].add(shift_id)
+
+    singled_out = {
+        str(constraint.parameters["employee_id"])
+        for constraint in constraints
+        if (constraint.parameters or {}).get("employee_id") is not None
+    }
+
+    classes = defaultdict(list)
+    for row, emp in enumerate(employees):
+        if emp.id in singled_out:
+            continue
+        key = (
+            np.packbits(eligibility.matrix[row]).tobytes(),
+            emp.max_hours_per_week,
+            emp.min_hours_per_week,
+            json.dumps(emp.preferences, sort_keys=True, default=str),
+            frozenset(current[emp.id]),
+            _carried_state(carry_over, emp.id),
+        )
+        classes[key].append(row)
+
+    return [rows for rows in classes.values() if len(rows) > 1]
+
+
+def _carried_state(carry_over: Optional[Any], emp_id: str) -> Tuple:
+    if carry_over is None:
+        return ()
+    return (
+        carry_over.last_shift.get(emp_id),
+        carry_over.consecutive_days.get(emp_id, 0),
+        carry_over.hours.get(emp_id, 0),
+        carry_over.weekend_shifts.get(emp_id, 0),
+    )
+
+
+def add_lex_leader(model: Any, first: List[Any], second: List[Any], name: str):
+    """
+    Require ``first`` >= ``second`` lexicographically (Boolean vectors, same length).
+
+    ``agreed`` holds exactly when the vectors are equal up to and including
+    the current entry; while they agree, ``first`` may not be 0 where
+    ``second`` is 1.
+    """
+    equal = []  # Negated literal of "equal so far", empty before the first entry
+    for k, (x, y) in enumerate(zip(first, second)):
+        model.AddBoolOr(equal + [y.Not(), x])
+        if k == len(first) - 1:
+            break
+
+        agreed = model.NewBoolVar(f"{name}_eq_{k}")
+        model.AddBoolOr(equal + [x.Not(), y.Not(), agreed])
+        model.AddBoolOr(equal + [x, y, agreed])
+        model.AddBoolOr([agreed.Not(), x.Not(), y])
+        model.AddBoolOr([agreed.Not(), x, y.Not()])
+        if equal:
+            model.AddBoolOr([agreed.Not(), equal[0].Not()])
+        equal = [agreed.Not()]
+
+
+def canonical_plan(plan: Set[Tuple[str, str]], classes: List[Tuple[List[str], List[str]]]) -> Set[Tuple[str, str]]:
+    """
+    Permute ``plan`` within each class so it satisfies the lexicographic order.
+
+    Args:
+        plan: (employee_id, shift_id) pairs, e.g. a greedy warm start
+        classes: (employee IDs, shift IDs) per class, both in constraint order
+
+    Returns:
+        A plan of the same cost and feasibility as ``plan``
+    """
+    canonical = set(plan)
+    for members, order in classes:
+        vectors = {emp_id: tuple((emp_id, sid) in plan for sid in order) for emp_id in members}
+        ranked = sorted(members, key=lambda emp_id: vectors[emp_id], reverse=True)
+        for emp_id, source in zip(members, ranked):
+            canonical -= {(emp_id, sid) for sid in order}
+            canonical |= {(emp_id, sid) for sid, taken in zip(order, vectors[source]) if taken}
+    return canonical
@@ -0,0 +1,165 @@
+"""
+Synthetic scheduling instances for benchmarking the optimizer.
+
+Instances are generated from a seed, so the same spec always yields the same
+employees, shifts and rules and benchmark runs stay comparable.
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Dict, List, Tuple
+
+from .constraint_solver import Employee, SchedulingConstraint, Shift, ShiftType
+from .eligibility import DAY_NAMES
+
+# (start, end, type) of the shift windows templates are drawn from
+SHIFT_WINDOWS = [
+    (time(6, 0), time(14, 0), ShiftType.MORNING),
+    (time(7, 0), time(15, 0), ShiftType.MORNING),
+    (time(9, 0), time(17, 0), ShiftType.FULL_DAY),
+    (time(10, 0), time(14, 0), ShiftType.FULL_DAY),
+    (time(12, 0), time(20, 0), ShiftType.AFTERNOON),
+    (time(14, 0), time(22, 0), ShiftType.AFTERNOON),
+    (time(16, 0), time(0, 0), ShiftType.EVENING),
+    (time(22, 0), time(6, 0), ShiftType.NIGHT),
+]
+
+# Typical availability windows of employees with restricted availability
+AVAILABILITY_WINDOWS = [
+    (time(6, 0), time(15, 0)),
+    (time(8, 0), time(18, 0)),
+    (time(12, 0), time(23, 59)),
+    (time(0, 0), time(0, 0)),
+]
+
+
+@dataclass
+class InstanceSpec:
+    """Parameters of a synthetic instance."""
+
+    employees: int = 50
+    templates: int = 8
+    days: int = 14
+    start_date: date = date(2024, 1, 1)
+    departments: int = 1
+    # Target share of total weekly capacity that shift minimums consume
+    utilization: float = 0.6
+    qualifications: int = 5
+    # Chance that an employee holds a given qualification
+    qualification_rate: float = 0.3
+    # Chance that a template requires a qualification
+    required_qualification_rate: float = 0.3
+    # Share of employees with restricted availability, and their available days per week
+    restricted_availability_rate: float = 0.4
+    available_days: int = 5
+    part_time_rate: float = 0.25
+    preference_rate: float = 0.3
+    # Number of rules and their mix of rule types
+    rules: int = 10
+    rule_mix: Dict[str, float] = field(
+        default_factory=lambda: {"availability": 0.3, "preference": 0.4, "requirement": 0.2, "restriction": 0.1}
+    )
+    seed: int = 0
+
+
+def generate_instance(spec: InstanceSpec) -> Tuple[List[Employee], List[Shift], List[SchedulingConstraint]]:
+    """Generate employees, shift instances and rules for ``spec``."""
+    rng = random.Random(spec.seed)
+    qualifications = [f"qual_{index}" for index in range(spec.qualifications)]
+
+    employees = [_employee(rng, spec, index, qualifications) for index in range(spec.employees)]
+    shifts = _shifts(rng, spec, employees, qualifications)
+    constraints = _rules(rng, spec, employees)
+    return employees, shifts, constraints
+
+
+def _employee(rng: random.Random, spec: InstanceSpec, index: int, qualifications: List[str]) -> Employee:
+    availability = {}
+    if rng.random() < spec.restricted_availability_rate:
+        window = rng.choice(AVAILABILITY_WINDOWS)
+        for day in rng.sample(DAY_NAMES, min(spec.available_days, len(DAY_NAMES))):
+            availability[day] = [window]
+
+    preferences = {}
+    if rng.random() < spec.preference_rate:
+        preferences["preferred_shift_type"] = rng.choice(list(ShiftType)).value
+        preferences["preferred_days"] = [day.lower() for day in rng.sample(DAY_NAMES, 4)]
+
+    return Employee(
+        id=str(index + 1),
+        name=f"Employee {index + 1}",
+        qualifications=[qual for qual in qualifications if rng.random() < spec.qualification_rate],
+        availability=availability,
+        preferences=preferences,
+        max_hours_per_week=24 if rng.random() < spec.part_time_rate else 40,
+        department_id=index % spec.departments + 1,
+    )
+
+
+def _shifts(rng: random.Random, spec: InstanceSpec, employees: List[Employee], qualifications: List[str]) -> List[Shift]:
+    windows = [rng.choice(SHIFT_WINDOWS) for _ in range(spec.templates)]
+    template_hours = sum(_window_hours(start, end) for start, end, _ in windows)
+
+    # Size minimum staffing so demand uses the target share of weekly capacity
+    daily_capacity = sum(emp.max_hours_per_week for emp in employees) / 7
+    staff = max(1, math.floor(spec.utilization * daily_capacity / template_hours)) if template_hours else 1
+
+    templates = []
+    for index, (start, end, shift_type) in enumerate(windows):
+        required = [rng.choice(qualifications)] if qualifications and rng.random() < spec.required_qualification_rate else []
+        # Qualified shifts need fewer people than there are holders of the qualification
+        min_employees = max(1, staff // 4) if required else staff
+        templates.append((index + 1, start, end, shift_type, required, min_employees))
+
+    shifts = []
+    for offset in range(spec.days):
+        day = spec.start_date + timedelta(days=offset)
+        for template_id, start, end, shift_type, required, min_employees in templates:
+            shifts.append(
+                Shift(
+                    id=f"{template_id}_{day.isoformat()}",
+                    date=day,
+                    start_time=start,
+                    end_time=end,
+                    required_qualifications=list(required),
+                    min_employees=min_employees,
+                    max_employees=min_employees + 2,
+                    shift_type=shift_type,
+                    department_id=(template_id - 1) % spec.departments + 1,
+                )
+            )
+    return shifts
+
+
+def _rules(rng: random.Random, spec: InstanceSpec, employees: List[Employee]) -> List[SchedulingConstraint]:
+    rule_types = list(spec.rule_mix)
+    weights = [spec.rule_mix[rule_type] for rule_type in rule_types]
+
+    rules = []
+    for index in range(spec.rules):
+        rule_type = rng.choices(rule_types, weights)[0]
+        parameters = {"days": [day.lower() for day in rng.sample(DAY_NAMES, rng.randint(1, 3))]}
+        if rule_type in ("availability", "restriction"):
+            parameters["times"] = [rng.choice(["06:00", "09:00", "14:00"]), rng.choice(["17:00", "22:00"])]
+        if rule_type in ("requirement", "restriction"):
+            parameters["hours"] = rng.choice([4, 8, 12])
+        if employees and rng.random() < 0.5:
+            parameters["employee_id"] = rng.choice(employees).id
+
+        rules.append(
+            SchedulingConstraint(
+                id=str(index + 1),
+                name=f"Synthetic {rule_type} rule {index + 1}",
+                type=rule_type,
+                parameters=parameters,
+                priority=rng.randint(1, 10),
+            )
+        )
+    return rules
+
+
+def _window_hours(start: time, end: time) -> int:
+    minutes = (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+    return (minutes if minutes > 0 else minutes + 24 * 60) // 60
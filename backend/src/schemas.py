@@ -1017,6 +1017,8 @@ class GenerationRequirements(BaseModel):
     employee_ids: Optional[List[int]] = Field(None, description="Specific employees to include (optional)")
     shift_template_ids: Optional[List[int]] = Field(None, description="Shift templates to use (optional)")
     constraints: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional constraints")
+    stream_incumbents: bool = Field(True, description="Stream improving solutions over WebSocket while solving")
+    decompose: bool = Field(False, description="Solve independent component-week partitions in parallel and stitch week boundaries")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -1058,6 +1060,28 @@ class GenerationResponse(BaseModel):
     conflicts: Optional[List[ConflictDetail]] = Field(default_factory=list, description="Detected conflicts")
     coverage: Optional[CoverageStats] = Field(None, description="Coverage statistics")
     optimization_score: Optional[float] = Field(None, description="Overall schedule quality score (0-100)")
+    statistics: Optional[Dict[str, Any]] = Field(None, description="Solver statistics and per-phase timings")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GenerationJobResponse(BaseModel):
+    """Status of a queued schedule generation job."""
+
+    job_id: str = Field(..., description="Generation job ID")
+    status: str = Field(..., description="Job status (queued, running, completed, failed, cancelled)")
+    phase: str = Field(..., description="Current phase (loading, solving, saving, ...)")
+    progress: float = Field(..., description="Estimated progress (0-100)")
+    message: Optional[str] = Field(None, description="Status message")
+    start_date: date = Field(..., description="Schedule start date")
+    end_date: date = Field(..., description="Schedule end date")
+    created_at: datetime = Field(..., description="When the job was queued")
+    started_at: Optional[datetime] = Field(None, description="When the job started running")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished")
+    incumbent: Optional[Dict[str, Any]] = Field(
+        None, description="Best solution so far (objective, best_bound, gap, elapsed, assignment_count)"
+    )
+    accepted: bool = Field(False, description="Whether the incumbent was accepted before the search completed")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -1114,6 +1138,22 @@ class OptimizationResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RepairResponse(BaseModel):
+    """Response from repairing a schedule after a call-out."""
+
+    schedule_id: int = Field(..., description="Schedule ID repaired")
+    assignment_id: int = Field(..., description="Assignment that was called out")
+    status: str = Field(..., description="Repair status (optimal, feasible, rejected, infeasible)")
+    message: Optional[str] = Field(None, description="Status message")
+    added: List[Dict[str, Any]] = Field(default_factory=list, description="Assignments added as (employee_id, shift_id)")
+    removed: List[Dict[str, Any]] = Field(default_factory=list, description="Assignments removed as (employee_id, shift_id)")
+    unfilled: List[Dict[str, Any]] = Field(default_factory=list, description="Shifts left short of staff")
+    conflicts: List[Dict[str, Any]] = Field(default_factory=list, description="Blocking conflicts that rejected the repair")
+    statistics: Optional[Dict[str, Any]] = Field(None, description="Solver statistics for the repair")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PublishSettings(BaseModel):
     """Settings for publishing a schedule."""
 
@@ -1869,6 +1909,17 @@ class ConflictReport(BaseModel):
     recommendations: List[str] = Field(default_factory=list, description="Actionable recommendations")
 
 
+class ScheduleAudit(BaseModel):
+    """Rest period and hour limit violations of a department's employees."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    department_id: int = Field(..., description="Department audited")
+    period: ConflictReportPeriod = Field(..., description="Date range audited")
+    total_conflicts: int = Field(..., description="Total violations found")
+    conflicts: List[ConflictDetail] = Field(default_factory=list, description="Violations by employee and start time")
+
+
 class ValidateAssignmentRequest(BaseModel):
     """Request to validate employee assignment to shift."""
 
@@ -1890,6 +1941,48 @@ class ValidateAssignmentResponse(BaseModel):
     warnings: List[str] = Field(default_factory=list, description="Warning messages")
 
 
+class ProposedAssignmentChange(BaseModel):
+    """A proposed add, remove or move of an assignment."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    action: str = Field(..., description="add, remove or move")
+    assignment_id: Optional[int] = Field(None, description="Assignment to remove or move", gt=0)
+    employee_id: Optional[int] = Field(None, description="Employee to assign (add) or move to", gt=0)
+    shift_id: Optional[int] = Field(None, description="Shift to assign to (add) or move to", gt=0)
+
+    @field_validator('action')
+    @classmethod
+    def validate_action(cls, v):
+        """Validate change action."""
+        valid_actions = ["add", "remove", "move"]
+        if v not in valid_actions:
+            raise ValueError(f"action must be one of: {', '.join(valid_actions)}")
+        return v
+
+
+class WhatIfValidationRequest(BaseModel):
+    """Request to validate a batch of proposed assignment changes without saving them."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    changes: List[ProposedAssignmentChange] = Field(..., min_length=1, description="Changes applied in order")
+
+
+class WhatIfValidationResponse(BaseModel):
+    """Conflict delta of a batch of proposed assignment changes."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    valid: bool = Field(..., description="Whether the changes introduce no critical conflicts")
+    total_changes: int = Field(..., description="Number of proposed changes")
+    applied_changes: int = Field(..., description="Number of changes that could be applied")
+    new_conflicts: List[ConflictDetail] = Field(default_factory=list, description="Conflicts the changes introduce")
+    resolved_conflicts: List[ConflictDetail] = Field(default_factory=list, description="Conflicts the changes resolve")
+    unchanged_conflicts: int = Field(0, description="Conflicts in the affected scope that remain")
+    errors: List[Dict[str, Any]] = Field(default_factory=list, description="Changes that could not be applied")
+
+
 class CheckCoverageRequest(BaseModel):
     """Request to check department coverage."""
 
@@ -9,15 +9,31 @@ This module provides functions to detect and analyze scheduling conflicts includ
 - Rest period violations
 """
 
+import math
+import threading
+from collections import defaultdict
 from datetime import datetime, time, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from time import monotonic
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import case, event, func, inspect, select, and_, or_
+from sqlalchemy.orm import Session as OrmSession, selectinload
 
+from ..core.redis_cache import cache
 from ..models import Shift, ScheduleAssignment, Employee, Department
 
 
+# Statuses of assignments the employee will work (ScheduleAssignment.is_active)
+_ACTIVE_STATUSES = ("assigned", "confirmed")
+
+# Session.info key of the changes assignment_index applies on commit
+_CHANGES_KEY = "assignment_index_changes"
+
+# Redis counters of committed changes, bumped by every process so the others drop stale timelines
+_SHIFTS_VERSION_KEY = "assignment_index:shifts"
+_EMPLOYEE_VERSION_PREFIX = "assignment_index:employee"
+
+
 class ConflictType:
     """Enum-like class for conflict types"""
     OVERLAPPING_SHIFTS = "overlapping_shifts"
@@ -69,7 +85,7 @@ async def detect_overlapping_shifts(
         .where(
             and_(
                 ScheduleAssignment.employee_id == employee_id,
-                ScheduleAssignment.status == "assigned",
+                ScheduleAssignment.status.in_(_ACTIVE_STATUSES),
                 Shift.date == shift_date
             )
         )
@@ -81,25 +97,11 @@ async def detect_overlapping_shifts(
     result = await db.execute(query)
     existing_assignments = result.scalars().all()
 
-    conflicts = []
-    for assignment in existing_assignments:
-        shift = assignment.shift
-
-        # Check for time overlap
-        if _times_overlap(start_time, end_time, shift.start_time, shift.end_time):
-            conflicts.append({
-                "assignment_id": assignment.id,
-                "shift_id": shift.id,
-                "shift_date": shift.date.isoformat(),
-                "shift_start": shift.start_time.isoformat(),
-                "shift_end": shift.end_time.isoformat(),
-                "conflict_type": ConflictType.OVERLAPPING_SHIFTS,
-                "severity": ConflictSeverity.CRITICAL,
-                "message": f"Employee already assigned to overlapping shift on {shift.date}",
-                "suggested_resolution": "Reassign employee or adjust shift times"
-            })
-
-    return conflicts
+    return [
+        _overlap_conflict(assignment.id, assignment.shift)
+        for assignment in existing_assignments
+        if _times_overlap(start_time, end_time, assignment.shift.start_time, assignment.shift.end_time)
+    ]
 
 
 async def detect_double_booking(
@@ -124,7 +126,7 @@ async def detect_double_booking(
             and_(
                 ScheduleAssignment.employee_id == employee_id,
                 ScheduleAssignment.shift_id == shift_id,
-                ScheduleAssignment.status == "assigned"
+                ScheduleAssignment.status.in_(_ACTIVE_STATUSES)
             )
         )
     )
@@ -133,14 +135,7 @@ async def detect_double_booking(
     existing = result.scalar_one_or_none()
 
     if existing:
-        return {
-            "assignment_id": existing.id,
-            "shift_id": shift_id,
-            "conflict_type": ConflictType.DOUBLE_BOOKING,
-            "severity": ConflictSeverity.CRITICAL,
-            "message": "Employee already assigned to this shift",
-            "suggested_resolution": "Remove duplicate assignment"
-        }
+        return _double_booking_conflict(existing.id, shift_id)
 
     return None
 
@@ -167,10 +162,29 @@ async def validate_shift_duration_limits(
     Returns:
         List of conflicts if limits exceeded
     """
+    daily_hours = await _get_employee_daily_hours(db, employee_id, shift_date)
+
+    week_start = shift_date - timedelta(days=shift_date.weekday())
+    week_end = week_start + timedelta(days=6)
+    weekly_hours = await _get_employee_weekly_hours(db, employee_id, week_start, week_end)
+
+    return _hours_conflicts(
+        shift_date, daily_hours, weekly_hours, shift_duration_hours, max_hours_per_day, max_hours_per_week
+    )
+
+
+def _hours_conflicts(
+    shift_date: datetime.date,
+    daily_hours: float,
+    weekly_hours: float,
+    shift_duration_hours: float,
+    max_hours_per_day: float,
+    max_hours_per_week: float
+) -> List[Dict[str, Any]]:
+    """Daily and weekly hour limit conflicts of adding a shift to already scheduled hours."""
     conflicts = []
 
     # Check daily hours
-    daily_hours = await _get_employee_daily_hours(db, employee_id, shift_date)
     total_daily_hours = daily_hours + shift_duration_hours
 
     if total_daily_hours > max_hours_per_day:
@@ -190,8 +204,6 @@ async def validate_shift_duration_limits(
     # Check weekly hours
     week_start = shift_date - timedelta(days=shift_date.weekday())
     week_end = week_start + timedelta(days=6)
-
-    weekly_hours = await _get_employee_weekly_hours(db, employee_id, week_start, week_end)
     total_weekly_hours = weekly_hours + shift_duration_hours
 
     if total_weekly_hours > max_hours_per_week:
@@ -235,24 +247,45 @@ async def validate_rest_period(
     Returns:
         List of conflicts if rest period insufficient
     """
-    conflicts = []
-
-    # Check previous day's shifts
+    # Load the previous and next day's shifts together
     prev_date = shift_date - timedelta(days=1)
-    prev_query = (
+    next_date = shift_date + timedelta(days=1)
+    query = (
         select(Shift)
         .join(ScheduleAssignment)
         .where(
             and_(
                 ScheduleAssignment.employee_id == employee_id,
-                ScheduleAssignment.status == "assigned",
-                Shift.date == prev_date
+                ScheduleAssignment.status.in_(_ACTIVE_STATUSES),
+                Shift.date.in_((prev_date, next_date))
             )
         )
     )
 
-    result = await db.execute(prev_query)
-    prev_shifts = result.scalars().all()
+    result = await db.execute(query)
+    shifts = result.scalars().all()
+    prev_shifts = [shift for shift in shifts if shift.date == prev_date]
+    next_shifts = [shift for shift in shifts if shift.date == next_date]
+
+    return _rest_conflicts(shift_date, start_time, end_time, prev_shifts, next_shifts, minimum_rest_hours)
+
+
+def _rest_conflicts(
+    shift_date: datetime.date,
+    start_time: time,
+    end_time: time,
+    prev_shifts: List[Any],
+    next_shifts: List[Any],
+    minimum_rest_hours: float
+) -> List[Dict[str, Any]]:
+    """
+    Rest period conflicts of a shift with the previous and next day's shifts.
+
+    ``prev_shifts`` and ``next_shifts`` need ``id``, ``start_time`` and ``end_time``.
+    """
+    conflicts = []
+    prev_date = shift_date - timedelta(days=1)
+    next_date = shift_date + timedelta(days=1)
 
     for prev_shift in prev_shifts:
         # Calculate rest hours
@@ -280,23 +313,6 @@ async def validate_rest_period(
                 "suggested_resolution": "Delay shift start time or reassign employee"
             })
 
-    # Check next day's shifts
-    next_date = shift_date + timedelta(days=1)
-    next_query = (
-        select(Shift)
-        .join(ScheduleAssignment)
-        .where(
-            and_(
-                ScheduleAssignment.employee_id == employee_id,
-                ScheduleAssignment.status == "assigned",
-                Shift.date == next_date
-            )
-        )
-    )
-
-    result = await db.execute(next_query)
-    next_shifts = result.scalars().all()
-
     for next_shift in next_shifts:
         # Calculate rest hours
         curr_end = datetime.combine(shift_date, end_time)
@@ -372,41 +388,55 @@ async def check_department_coverage(
     ]
 
     for shift in overlapping_shifts:
+        conflict = _coverage_conflict(shift)
+        if conflict:
+            conflicts.append(conflict)
+
+    return conflicts
+
+
+def _coverage_conflict(shift: Shift, assigned_count: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Understaffed or overstaffed conflict of a shift, if any.
+
+    Without ``assigned_count`` the shift's loaded assignments are counted.
+    """
+    if assigned_count is None:
         assigned_count = len([
             a for a in shift.schedule_assignments
-            if a.status == "assigned"
+            if a.status in _ACTIVE_STATUSES
         ])
 
-        if assigned_count < shift.required_staff:
-            conflicts.append({
-                "conflict_type": ConflictType.UNDERSTAFFED,
-                "severity": ConflictSeverity.HIGH,
-                "shift_id": shift.id,
-                "shift_date": shift.date.isoformat(),
-                "shift_start": shift.start_time.isoformat(),
-                "shift_end": shift.end_time.isoformat(),
-                "required_staff": shift.required_staff,
-                "assigned_staff": assigned_count,
-                "shortage": shift.required_staff - assigned_count,
-                "message": f"Understaffed: {assigned_count}/{shift.required_staff} staff assigned",
-                "suggested_resolution": f"Assign {shift.required_staff - assigned_count} more employee(s)"
-            })
-        elif assigned_count > shift.required_staff:
-            conflicts.append({
-                "conflict_type": ConflictType.OVERSTAFFED,
-                "severity": ConflictSeverity.LOW,
-                "shift_id": shift.id,
-                "shift_date": shift.date.isoformat(),
-                "shift_start": shift.start_time.isoformat(),
-                "shift_end": shift.end_time.isoformat(),
-                "required_staff": shift.required_staff,
-                "assigned_staff": assigned_count,
-                "excess": assigned_count - shift.required_staff,
-                "message": f"Overstaffed: {assigned_count}/{shift.required_staff} staff assigned",
-                "suggested_resolution": f"Reassign {assigned_count - shift.required_staff} employee(s)"
-            })
+    if assigned_count < shift.required_staff:
+        return {
+            "conflict_type": ConflictType.UNDERSTAFFED,
+            "severity": ConflictSeverity.HIGH,
+            "shift_id": shift.id,
+            "shift_date": shift.date.isoformat(),
+            "shift_start": shift.start_time.isoformat(),
+            "shift_end": shift.end_time.isoformat(),
+            "required_staff": shift.required_staff,
+            "assigned_staff": assigned_count,
+            "shortage": shift.required_staff - assigned_count,
+            "message": f"Understaffed: {assigned_count}/{shift.required_staff} staff assigned",
+            "suggested_resolution": f"Assign {shift.required_staff - assigned_count} more employee(s)"
+        }
+    if assigned_count > shift.required_staff:
+        return {
+            "conflict_type": ConflictType.OVERSTAFFED,
+            "severity": ConflictSeverity.LOW,
+            "shift_id": shift.id,
+            "shift_date": shift.date.isoformat(),
+            "shift_start": shift.start_time.isoformat(),
+            "shift_end": shift.end_time.isoformat(),
+            "required_staff": shift.required_staff,
+            "assigned_staff": assigned_count,
+            "excess": assigned_count - shift.required_staff,
+            "message": f"Overstaffed: {assigned_count}/{shift.required_staff} staff assigned",
+            "suggested_resolution": f"Reassign {assigned_count - shift.required_staff} employee(s)"
+        }
 
-    return conflicts
+    return None
 
 
 async def validate_employee_assignment(
@@ -426,6 +456,9 @@ async def validate_employee_assignment(
     - Duration limits
     - Rest periods
 
+    The employee's other assignments come from ``assignment_index``, so a
+    cached employee is validated without touching the database.
+
     Args:
         db: Database session
         employee_id: Employee to assign
@@ -435,17 +468,9 @@ async def validate_employee_assignment(
     Returns:
         List of all detected conflicts
     """
-    conflicts = []
-
-    # Get employee and shift details
-    employee_query = select(Employee).where(Employee.id == employee_id)
-    shift_query = select(Shift).where(Shift.id == shift_id)
-
-    employee_result = await db.execute(employee_query)
-    shift_result = await db.execute(shift_query)
-
-    employee = employee_result.scalar_one_or_none()
-    shift = shift_result.scalar_one_or_none()
+    # Usually already in the session's identity map, so no query is needed
+    employee = await db.get(Employee, employee_id)
+    shift = await db.get(Shift, shift_id)
 
     if not employee:
         return [{
@@ -461,62 +486,12 @@ async def validate_employee_assignment(
             "message": "Shift not found"
         }]
 
-    # Check double booking
-    double_booking = await detect_double_booking(db, employee_id, shift_id)
-    if double_booking:
-        conflicts.append(double_booking)
-
-    # Check overlapping shifts
-    overlapping = await detect_overlapping_shifts(
-        db, employee_id, shift.date, shift.start_time, shift.end_time, exclude_assignment_id
-    )
-    conflicts.extend(overlapping)
-
-    # Check duration limits
-    shift_duration = shift.duration_hours
-    duration_conflicts = await validate_shift_duration_limits(
-        db, employee_id, shift.date, shift_duration
-    )
-    conflicts.extend(duration_conflicts)
-
-    # Check rest periods
-    rest_conflicts = await validate_rest_period(
-        db, employee_id, shift.date, shift.start_time, shift.end_time
-    )
-    conflicts.extend(rest_conflicts)
-
-    # Check employee availability
-    day_name = shift.date.strftime("%A").lower()
-    shift_start = shift.start_time.strftime("%H:%M")
-
-    if not employee.is_available_at(day_name, shift_start):
-        conflicts.append({
-            "conflict_type": ConflictType.UNAVAILABLE_EMPLOYEE,
-            "severity": ConflictSeverity.MEDIUM,
-            "day": day_name,
-            "time": shift_start,
-            "message": f"Employee not available on {day_name} at {shift_start}",
-            "suggested_resolution": "Choose an available employee or update availability"
-        })
-
-    # Check qualifications if shift has requirements
-    if shift.requirements:
-        required_quals = shift.requirements.get("qualifications", [])
-        if required_quals:
-            missing_quals = [
-                qual for qual in required_quals
-                if not employee.has_qualification(qual)
-            ]
+    # Double booking, overlaps, duration limits and rest periods from the indexed timeline
+    timeline = await assignment_index.timeline(db, employee_id, shift.date)
+    conflicts = timeline.conflicts(exclude_assignment_id, shift)
 
-            if missing_quals:
-                conflicts.append({
-                    "conflict_type": ConflictType.MISSING_QUALIFICATION,
-                    "severity": ConflictSeverity.HIGH,
-                    "required_qualifications": required_quals,
-                    "missing_qualifications": missing_quals,
-                    "message": f"Employee missing qualifications: {', '.join(missing_quals)}",
-                    "suggested_resolution": "Assign employee with required qualifications"
-                })
+    # Check employee availability and qualifications
+    conflicts.extend(_employee_fit_conflicts(employee, shift))
 
     return conflicts
 
@@ -530,6 +505,13 @@ async def generate_conflict_report(
     """
     Generate comprehensive conflict report for department schedule.
 
+    Every assignment in the range gets the checks of validate_employee_assignment
+    against the rest of the plan, but from data loaded up front: the department's
+    shifts with their assignments and employees, and in one more query every
+    assignment of those employees from the Monday of the first week to the Sunday
+    of the last (covering weekly hours and rest across the range boundaries). The
+    checks then run in memory over per-employee timelines.
+
     Args:
         db: Database session
         department_id: Department to analyze
@@ -555,24 +537,30 @@ async def generate_conflict_report(
     result = await db.execute(query)
     shifts = result.scalars().all()
 
+    employee_ids = {
+        assignment.employee_id
+        for shift in shifts
+        for assignment in shift.schedule_assignments
+        if assignment.status in _ACTIVE_STATUSES
+    }
+    timelines = await _load_employee_timelines(db, employee_ids, start_date, end_date)
+
     all_conflicts = []
     coverage_issues = []
 
-    # Check coverage for each shift
     for shift in shifts:
-        coverage_conflicts = await check_department_coverage(
-            db, department_id, shift.date, shift.start_time, shift.end_time, shift.required_staff
-        )
-        coverage_issues.extend(coverage_conflicts)
+        # Check coverage of the shift
+        coverage_conflict = _coverage_conflict(shift)
+        if coverage_conflict:
+            coverage_issues.append(coverage_conflict)
 
         # Check each assignment for conflicts
         for assignment in shift.schedule_assignments:
-            if assignment.status != "assigned":
+            if assignment.status not in _ACTIVE_STATUSES:
                 continue
 
-            assignment_conflicts = await validate_employee_assignment(
-                db, assignment.employee_id, shift.id, assignment.id
-            )
+            assignment_conflicts = timelines[assignment.employee_id].conflicts(assignment.id, shift)
+            assignment_conflicts.extend(_employee_fit_conflicts(assignment.employee, shift))
 
             # Add context to conflicts
             for conflict in assignment_conflicts:
@@ -614,8 +602,757 @@ async def generate_conflict_report(
     }
 
 
+async def evaluate_assignment_changes(
+    db: AsyncSession,
+    changes: List[Dict[str, Any]],
+    department_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    What-if validation of a batch of proposed assignment changes. Nothing is written.
+
+    Each change is an ``add`` (employee_id and shift_id), a ``remove``
+    (assignment_id) or a ``move`` (assignment_id with a new employee_id,
+    shift_id or both). The touched employees' timelines are loaded once
+    (from assignment_index when cached) and the changes are applied, in
+    order, to copies of them. Every assignment whose checks look at a changed
+    day is evaluated before and after, together with the availability and
+    qualifications of the moved assignments and the coverage of the touched
+    shifts.
+
+    Args:
+        db: Database session
+        changes: Proposed changes as dicts with action, assignment_id, employee_id and shift_id
+        department_id: If given, changes touching shifts of other departments are rejected
+
+    Returns:
+        Conflicts introduced and resolved by the changes, the number of
+        unchanged conflicts in the affected scope, and the changes that
+        could not be applied
+    """
+    assignment_ids = {
+        change.get("assignment_id") for change in changes if change.get("action") in ("remove", "move")
+    } - {None}
+    existing = {}
+    if assignment_ids:
+        query = select(
+            ScheduleAssignment.id,
+            ScheduleAssignment.employee_id,
+            ScheduleAssignment.shift_id,
+            ScheduleAssignment.status
+        ).where(ScheduleAssignment.id.in_(assignment_ids))
+        result = await db.execute(query)
+        existing = {row.id: row for row in result.all()}
+
+    shift_ids = {change.get("shift_id") for change in changes} | {row.shift_id for row in existing.values()}
+    shift_ids.discard(None)
+    shifts = {}
+    if shift_ids:
+        query = select(Shift).options(selectinload(Shift.schedule_assignments)).where(Shift.id.in_(shift_ids))
+        result = await db.execute(query)
+        shifts = {shift.id: shift for shift in result.scalars().all()}
+
+    employee_ids = {change.get("employee_id") for change in changes} | {row.employee_id for row in existing.values()}
+    employee_ids.discard(None)
+    employees = {}
+    if employee_ids:
+        result = await db.execute(select(Employee).where(Employee.id.in_(employee_ids)))
+        employees = {employee.id: employee for employee in result.scalars().all()}
+
+    # Resolve every change into the assignment it takes away and the one it puts in place
+    errors = []
+    proposals: List[Tuple[Optional[_ProposedAssignment], Optional[_ProposedAssignment]]] = []
+    changed: Set[int] = set()
+    for index, change in enumerate(changes):
+        action = change.get("action")
+        removed = added = None
+        error = None
+
+        if action not in ("add", "remove", "move"):
+            error = f"Unknown action {action}"
+        elif action in ("remove", "move"):
+            row = existing.get(change.get("assignment_id"))
+            if row is None or row.shift_id not in shifts:
+                error = f"Assignment {change.get('assignment_id')} not found"
+            elif row.id in changed:
+                error = f"Assignment {row.id} is already changed by an earlier change"
+            elif department_id is not None and shifts[row.shift_id].department_id != department_id:
+                error = f"Assignment {row.id} is not in department {department_id}"
+            else:
+                removed = _ProposedAssignment(row.id, row.employee_id, shifts[row.shift_id], row.status)
+
+        if error is None and action in ("add", "move"):
+            employee_id = change.get("employee_id") or (removed.employee_id if removed else None)
+            shift_id = change.get("shift_id") or (removed.shift.id if removed else None)
+            if employee_id not in employees:
+                error = f"Employee {employee_id} not found"
+            elif shift_id not in shifts:
+                error = f"Shift {shift_id} not found"
+            elif department_id is not None and shifts[shift_id].department_id != department_id:
+                error = f"Shift {shift_id} is not in department {department_id}"
+            elif removed:
+                added = _ProposedAssignment(removed.assignment_id, employee_id, shifts[shift_id], removed.status)
+            else:
+                # Proposed assignments get negative IDs until they are saved
+                added = _ProposedAssignment(-(index + 1), employee_id, shifts[shift_id], "assigned")
+
+        if error is not None:
+            errors.append({"index": index, "action": action, "error": error})
+            continue
+        if removed:
+            changed.add(removed.assignment_id)
+        proposals.append((removed, added))
+
+    # Days whose conflicts can change, per employee, and the touched shifts
+    changed_days = defaultdict(set)
+    touched_shifts = {}
+    for removed, added in proposals:
+        for proposed in (removed, added):
+            if proposed:
+                changed_days[proposed.employee_id].add(proposed.shift.date)
+                touched_shifts[proposed.shift.id] = proposed.shift
+
+    before_timelines = {}
+    if changed_days:
+        days = [day for employee_days in changed_days.values() for day in employee_days]
+        before_timelines = await assignment_index.timelines(
+            db, set(changed_days), min(days) - timedelta(days=1), max(days) + timedelta(days=1)
+        )
+    after_timelines = {employee_id: timeline.copy() for employee_id, timeline in before_timelines.items()}
+
+    assigned_delta = defaultdict(int)
+    for removed, added in proposals:
+        if removed:
+            after_timelines[removed.employee_id].discard(removed.assignment_id)
+            assigned_delta[removed.shift.id] -= removed.status in _ACTIVE_STATUSES
+        if added and added.status in _ACTIVE_STATUSES:
+            after_timelines[added.employee_id].add(_TimelineShift(
+                added.shift.id, added.shift.date, added.shift.start_time, added.shift.end_time,
+                added.assignment_id, added.shift.duration_hours
+            ))
+        if added:
+            assigned_delta[added.shift.id] += added.status in _ACTIVE_STATUSES
+
+    before, after = {}, {}
+    for employee_id, days in changed_days.items():
+        scope = _affected_days(days)
+        before.update(_scoped_conflicts(before_timelines[employee_id], employees[employee_id], scope))
+        after.update(_scoped_conflicts(after_timelines[employee_id], employees[employee_id], scope))
+
+    for removed, added in proposals:
+        for proposed, found in ((removed, before), (added, after)):
+            if proposed and proposed.status in _ACTIVE_STATUSES:
+                employee = employees[proposed.employee_id]
+                for conflict in _employee_fit_conflicts(employee, proposed.shift):
+                    key = (proposed.employee_id, proposed.assignment_id, proposed.shift.id, conflict["conflict_type"])
+                    found[key] = _with_subject(conflict, employee, proposed.shift)
+
+    for shift in touched_shifts.values():
+        assigned_count = len([a for a in shift.schedule_assignments if a.status in _ACTIVE_STATUSES])
+        for count, found in ((assigned_count, before), (assigned_count + assigned_delta[shift.id], after)):
+            conflict = _coverage_conflict(shift, count)
+            if conflict:
+                found[(None, None, shift.id, conflict["conflict_type"])] = conflict
+
+    new_conflicts = [conflict for key, conflict in after.items() if key not in before]
+    resolved_conflicts = [conflict for key, conflict in before.items() if key not in after]
+
+    return {
+        "valid": not any(c.get("severity") == ConflictSeverity.CRITICAL for c in new_conflicts),
+        "total_changes": len(changes),
+        "applied_changes": len(proposals),
+        "new_conflicts": new_conflicts,
+        "resolved_conflicts": resolved_conflicts,
+        "unchanged_conflicts": len(before.keys() & after.keys()),
+        "errors": errors
+    }
+
+
+async def audit_employee_schedules(
+    db: AsyncSession,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    employee_ids: Optional[Set[int]] = None,
+    department_id: Optional[int] = None,
+    minimum_rest_hours: float = 8.0,
+    max_hours_per_day: float = 12.0,
+    max_hours_per_week: float = 40.0
+) -> List[Dict[str, Any]]:
+    """
+    Find every rest period violation and hour overrun in a date range with one query.
+
+    Each employee's assignments are ordered by absolute start timestamp, and
+    ``MAX(end_at)`` over the preceding rows gives the end each shift rests
+    after, however many days apart and including shifts on the same day. A
+    short shift nested inside a long one therefore does not hide the long
+    shift's end from the next one. Each short rest is reported on both
+    shifts from the later shift's row. Daily and weekly hours
+    are ``SUM(...) OVER`` the employee's shifts of the day and of the week.
+    The database returns only the shifts with a violation, which makes the
+    audit suitable for large ranges such as nightly checks.
+
+    Overlapping shifts are not rest violations; they are reported by the
+    overlap checks.
+
+    Args:
+        db: Database session
+        start_date: First date to audit
+        end_date: Last date to audit
+        employee_ids: Employees to audit (default: all)
+        department_id: Only audit employees of this department
+        minimum_rest_hours: Minimum rest hours required (default: 8)
+        max_hours_per_day: Maximum hours per day (default: 12)
+        max_hours_per_week: Maximum hours per week (default: 40)
+
+    Returns:
+        Rest conflicts of each shift with the shift before and after it, and
+        one hour conflict per employee day and week over the limit
+    """
+    query = _schedule_audit_query(
+        start_date, end_date, employee_ids, department_id,
+        minimum_rest_hours, max_hours_per_day, max_hours_per_week
+    )
+    result = await db.execute(query)
+
+    conflicts = []
+    seen_periods = set()
+    minimum_rest = timedelta(hours=minimum_rest_hours)
+    for row in result.all():
+        subject = {
+            "employee_id": row.employee_id,
+            "employee_name": f"{row.first_name} {row.last_name}",
+            "shift_id": row.shift_id,
+            "shift_date": row.date.isoformat()
+        }
+
+        if row.prev_end is not None and row.prev_end <= row.start_at < row.prev_end + minimum_rest:
+            rest_hours = _interval_hours(row.start_at - row.prev_end)
+            rest = {
+                "conflict_type": ConflictType.INSUFFICIENT_REST,
+                "severity": ConflictSeverity.HIGH,
+                "rest_hours": round(rest_hours, 2),
+                "required_rest_hours": minimum_rest_hours,
+                "shortage_hours": round(minimum_rest_hours - rest_hours, 2)
+            }
+            if start_date <= row.prev_date <= end_date:
+                conflicts.append({
+                    **rest,
+                    "next_shift_id": row.shift_id,
+                    "next_shift_date": row.date.isoformat(),
+                    "next_shift_start": row.start_at.time().isoformat(),
+                    "current_shift_end": row.prev_end.time().isoformat(),
+                    "message": f"Insufficient rest before next shift ({rest_hours:.1f}h < {minimum_rest_hours}h)",
+                    "suggested_resolution": "Adjust shift end time or reassign next shift",
+                    **subject,
+                    "shift_id": row.prev_shift_id,
+                    "shift_date": row.prev_date.isoformat()
+                })
+            if start_date <= row.date <= end_date:
+                conflicts.append({
+                    **rest,
+                    "previous_shift_id": row.prev_shift_id,
+                    "previous_shift_date": row.prev_date.isoformat(),
+                    "previous_shift_end": row.prev_end.time().isoformat(),
+                    "current_shift_start": row.start_at.time().isoformat(),
+                    "message": f"Insufficient rest period ({rest_hours:.1f}h < {minimum_rest_hours}h)",
+                    "suggested_resolution": "Delay shift start time or reassign employee",
+                    **subject
+                })
+
+        if not start_date <= row.date <= end_date:
+            continue
+
+        daily_hours = _interval_hours(row.daily_hours)
+        if daily_hours > max_hours_per_day and ("daily", row.employee_id, row.date) not in seen_periods:
+            seen_periods.add(("daily", row.employee_id, row.date))
+            conflicts.append({
+                "conflict_type": ConflictType.EXCESSIVE_HOURS,
+                "severity": ConflictSeverity.HIGH,
+                "period": "daily",
+                "total_hours": daily_hours,
+                "limit": max_hours_per_day,
+                "excess_hours": daily_hours - max_hours_per_day,
+                "message": f"Scheduled {daily_hours:.1f}h exceeds maximum daily hours ({max_hours_per_day}h)",
+                "suggested_resolution": "Reduce shift duration or reassign to another employee",
+                **subject
+            })
+
+        weekly_hours = _interval_hours(row.weekly_hours)
+        week_start = _week_start(row.date)
+        if weekly_hours > max_hours_per_week and ("weekly", row.employee_id, week_start) not in seen_periods:
+            seen_periods.add(("weekly", row.employee_id, week_start))
+            conflicts.append({
+                "conflict_type": ConflictType.EXCESSIVE_HOURS,
+                "severity": ConflictSeverity.MEDIUM,
+                "period": "weekly",
+                "week_start": week_start.isoformat(),
+                "week_end": (week_start + timedelta(days=6)).isoformat(),
+                "total_hours": weekly_hours,
+                "limit": max_hours_per_week,
+                "excess_hours": weekly_hours - max_hours_per_week,
+                "message": f"Scheduled {weekly_hours:.1f}h exceeds maximum weekly hours ({max_hours_per_week}h)",
+                "suggested_resolution": "Redistribute hours across multiple employees",
+                **subject
+            })
+
+    return conflicts
+
+
+class _IndexEntry(NamedTuple):
+    """A cached timeline, complete for assignments between ``first`` and ``last``."""
+    timeline: "_EmployeeTimeline"
+    first: datetime.date
+    last: datetime.date
+    loaded_at: float
+    # Published (employee, shifts) change counters the timeline is current with
+    version: Tuple[int, int]
+
+
+class AssignmentIndex:
+    """
+    In-process index of employee timelines for validating single assignments.
+
+    The index lives in one worker process. A timeline is loaded on a miss with
+    one query covering ``window_days`` on either side of the requested dates.
+    After that it is kept current from the sessions committed in this
+    process: flushed assignment inserts, updates and deletes are recorded on
+    the session and applied to the cached timelines when it commits, or
+    dropped when it rolls back.
+
+    Other workers learn about those commits through Redis: each commit bumps a
+    change counter per employee (and one for shift edits) in ``cache``, and a
+    cached timeline is only trusted while the counters still match the ones
+    it was loaded or last updated with. When Redis is disabled nothing is
+    published, so with several workers a timeline can be stale for up to
+    ``max_age`` seconds, after which it is reloaded. Writes that bypass the
+    ORM should go through ``invalidate_on_commit``.
+    """
+
+    def __init__(self, window_days: int = 28, max_age: float = 300.0):
+        self.window_days = window_days
+        self.max_age = max_age
+        self._entries: Dict[int, _IndexEntry] = {}
+        # Bumped on every change, so a load racing with a commit is not cached
+        self._versions: Dict[int, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def timeline(self, db: AsyncSession, employee_id: int, shift_date: datetime.date) -> "_EmployeeTimeline":
+        """Timeline with everything the checks of a shift on ``shift_date`` look at."""
+        return (await self.timelines(db, {employee_id}, shift_date, shift_date))[employee_id]
+
+    async def timelines(
+        self,
+        db: AsyncSession,
+        employee_ids: Set[int],
+        start_date: datetime.date,
+        end_date: datetime.date
+    ) -> Dict[int, "_EmployeeTimeline"]:
+        """
+        Timelines for checking shifts in the range, loading the missing ones with one query.
+
+        Employees with flushed but uncommitted changes in ``db`` get a timeline
+        read inside its transaction, which is not cached.
+        """
+        first, last = _context_range(start_date, end_date)
+        changes = db.info.get(_CHANGES_KEY, [])
+        uncommitted = {employee_id for _, employee_id, _ in changes}
+        shifts_changed = any(kind == "shift" for kind, _, _ in changes)
+        now = monotonic()
+        # Read before loading, so a commit published during the load makes the entry stale
+        published = _published_versions(employee_ids)
+
+        found, missing, versions = {}, set(), {}
+        with self._lock:
+            for employee_id in employee_ids:
+                entry = self._entries.get(employee_id)
+                if shifts_changed or employee_id in uncommitted:
+                    missing.add(employee_id)
+                elif (
+                    entry and entry.first <= first and last <= entry.last
+                    and now - entry.loaded_at < self.max_age and entry.version == published[employee_id]
+                ):
+                    found[employee_id] = entry.timeline
+                    self.hits += 1
+                else:
+                    missing.add(employee_id)
+                    versions[employee_id] = self._versions[employee_id]
+                    self.misses += 1
+
+        if missing:
+            window = timedelta(days=self.window_days)
+            loaded = await _load_employee_timelines(db, missing, start_date - window, end_date + window)
+            covered = _context_range(start_date - window, end_date + window)
+            with self._lock:
+                for employee_id, version in versions.items():
+                    if self._versions[employee_id] == version:
+                        self._entries[employee_id] = _IndexEntry(loaded[employee_id], *covered, now, published[employee_id])
+            found.update({employee_id: loaded[employee_id] for employee_id in missing})
+
+        return found
+
+    def apply(self, changes: List[Tuple[str, Optional[int], Any]]):
+        """Apply the recorded changes of a committed session and publish them to the other processes."""
+        counted = {
+            employee_id: cache.incr(f"{_EMPLOYEE_VERSION_PREFIX}:{employee_id}")
+            for employee_id in {employee_id for kind, employee_id, _ in changes if kind != "shift"}
+        }
+        shifts_counted = cache.incr(_SHIFTS_VERSION_KEY) if any(kind == "shift" for kind, _, _ in changes) else None
+
+        with self._lock:
+            for kind, employee_id, payload in changes:
+                if kind == "shift":
+                    stale = [
+                        cached_id for cached_id, entry in self._entries.items()
+                        if any(shifted.id == payload for shifted in entry.timeline.by_assignment.values())
+                    ]
+                else:
+                    stale = [employee_id]
+
+                for cached_id in stale:
+                    self._versions[cached_id] += 1
+                    entry = self._entries.get(cached_id)
+                    if entry is None:
+                        continue
+                    if kind == "discard":
+                        entry.timeline.discard(payload)
+                    elif kind == "add" and entry.first <= payload.date <= entry.last:
+                        entry.timeline.add(payload)
+                    elif kind in ("invalidate", "shift"):
+                        del self._entries[cached_id]
+
+            # Entries stay current only if no other process committed since they were loaded
+            published = list(self._entries) if shifts_counted is not None else [
+                cached_id for cached_id in counted if cached_id in self._entries
+            ]
+            for cached_id in published:
+                entry = self._entries[cached_id]
+                employee_version, shifts_version = entry.version
+                employee_count = counted.get(cached_id)
+                if employee_count is not None:
+                    if employee_count != employee_version + 1:
+                        del self._entries[cached_id]
+                        continue
+                    employee_version = employee_count
+                if shifts_counted is not None:
+                    if shifts_counted != shifts_version + 1:
+                        del self._entries[cached_id]
+                        continue
+                    shifts_version = shifts_counted
+                self._entries[cached_id] = entry._replace(version=(employee_version, shifts_version))
+
+    def invalidate_on_commit(self, db: AsyncSession, employee_ids: Set[int]):
+        """Reload these employees once ``db`` commits (for writes that bypass the ORM, e.g. bulk upserts)."""
+        db.info.setdefault(_CHANGES_KEY, []).extend(("invalidate", employee_id, None) for employee_id in employee_ids)
+
+    def invalidate(self, employee_ids: Optional[Set[int]] = None):
+        """Forget the given employees (all when omitted)."""
+        with self._lock:
+            for employee_id in list(self._entries) if employee_ids is None else employee_ids:
+                self._versions[employee_id] += 1
+                self._entries.pop(employee_id, None)
+
+
+# Shared by every request in this process
+assignment_index = AssignmentIndex()
+
+
+def _published_versions(employee_ids: Set[int]) -> Dict[int, Tuple[int, int]]:
+    """The (employee, shifts) change counters published in Redis, all 0 when it is disabled."""
+    shifts_version = cache.get(_SHIFTS_VERSION_KEY) or 0
+    return {
+        employee_id: (cache.get(f"{_EMPLOYEE_VERSION_PREFIX}:{employee_id}") or 0, shifts_version)
+        for employee_id in employee_ids
+    }
+
+
 # Helper functions
 
+class _TimelineShift(NamedTuple):
+    """An assigned shift in an employee timeline (``id`` is the shift ID)."""
+    id: int
+    date: datetime.date
+    start_time: time
+    end_time: time
+    assignment_id: int
+    hours: float
+
+    @property
+    def duration_hours(self) -> float:
+        """Same as Shift.duration_hours, so entries can be checked like shifts."""
+        return self.hours
+
+
+class _EmployeeTimeline:
+    """Assigned shifts of one employee, sorted by date and start time, with hour totals."""
+
+    def __init__(self, entries: List[_TimelineShift]):
+        self.by_date: Dict[datetime.date, List[_TimelineShift]] = defaultdict(list)
+        self.by_assignment: Dict[int, _TimelineShift] = {}
+        self.daily_hours: Dict[datetime.date, float] = defaultdict(float)
+        self.weekly_hours: Dict[datetime.date, float] = defaultdict(float)
+
+        for entry in entries:
+            self.add(entry)
+
+    def copy(self) -> "_EmployeeTimeline":
+        """Independent timeline with the same assignments."""
+        return _EmployeeTimeline(list(self.by_assignment.values()))
+
+    def add(self, entry: _TimelineShift):
+        """Insert an assigned shift, replacing an earlier version of the same assignment."""
+        self.discard(entry.assignment_id)
+        day = self.by_date[entry.date]
+        day.append(entry)
+        day.sort(key=lambda other: other.start_time)
+        self.by_assignment[entry.assignment_id] = entry
+        self.daily_hours[entry.date] += entry.hours
+        self.weekly_hours[_week_start(entry.date)] += entry.hours
+
+    def discard(self, assignment_id: int):
+        """Remove an assignment if present."""
+        entry = self.by_assignment.pop(assignment_id, None)
+        if entry is None:
+            return
+        self.by_date[entry.date].remove(entry)
+        self.daily_hours[entry.date] -= entry.hours
+        self.weekly_hours[_week_start(entry.date)] -= entry.hours
+
+    def overlapping(self, shift: Shift, exclude_assignment_id: Optional[int] = None) -> List[_TimelineShift]:
+        """Other assigned shifts on the shift's date whose times overlap it."""
+        return [
+            entry for entry in self.by_date.get(shift.date, [])
+            if entry.assignment_id != exclude_assignment_id
+            and _times_overlap(shift.start_time, shift.end_time, entry.start_time, entry.end_time)
+        ]
+
+    def conflicts(
+        self,
+        assignment_id: int,
+        shift: Shift,
+        max_hours_per_day: float = 12.0,
+        max_hours_per_week: float = 40.0,
+        minimum_rest_hours: float = 8.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Double booking, overlap, hour limit and rest conflicts of an assignment
+        with the employee's other assignments, as validate_employee_assignment
+        reports them.
+        """
+        conflicts = []
+        own = self.by_assignment.get(assignment_id)
+        own_day_hours = own.hours if own and own.date == shift.date else 0.0
+        own_week_hours = own.hours if own and _week_start(own.date) == _week_start(shift.date) else 0.0
+        same_day = [entry for entry in self.by_date.get(shift.date, []) if entry.assignment_id != assignment_id]
+
+        duplicate = next((entry for entry in same_day if entry.id == shift.id), None)
+        if duplicate:
+            conflicts.append(_double_booking_conflict(duplicate.assignment_id, shift.id))
+
+        conflicts.extend(
+            _overlap_conflict(entry.assignment_id, entry) for entry in self.overlapping(shift, assignment_id)
+        )
+
+        conflicts.extend(_hours_conflicts(
+            shift.date,
+            self.daily_hours.get(shift.date, 0.0) - own_day_hours,
+            self.weekly_hours.get(_week_start(shift.date), 0.0) - own_week_hours,
+            shift.duration_hours,
+            max_hours_per_day,
+            max_hours_per_week
+        ))
+
+        conflicts.extend(_rest_conflicts(
+            shift.date,
+            shift.start_time,
+            shift.end_time,
+            self.by_date.get(shift.date - timedelta(days=1), []),
+            self.by_date.get(shift.date + timedelta(days=1), []),
+            minimum_rest_hours
+        ))
+
+        return conflicts
+
+
+async def _load_employee_timelines(
+    db: AsyncSession,
+    employee_ids: Set[int],
+    start_date: datetime.date,
+    end_date: datetime.date
+) -> Dict[int, _EmployeeTimeline]:
+    """Timelines of the employees' assigned shifts in the weeks of the range, plus a day on either side."""
+    first, last = _context_range(start_date, end_date)
+
+    entries = defaultdict(list)
+    if employee_ids:
+        query = (
+            select(
+                ScheduleAssignment.employee_id,
+                ScheduleAssignment.id,
+                Shift.id,
+                Shift.date,
+                Shift.start_time,
+                Shift.end_time
+            )
+            .join(Shift, ScheduleAssignment.shift_id == Shift.id)
+            .where(
+                and_(
+                    ScheduleAssignment.employee_id.in_(employee_ids),
+                    ScheduleAssignment.status.in_(_ACTIVE_STATUSES),
+                    Shift.date >= first,
+                    Shift.date <= last
+                )
+            )
+        )
+
+        result = await db.execute(query)
+        for employee_id, assignment_id, shift_id, shift_date, start_time, end_time in result.all():
+            entries[employee_id].append(_TimelineShift(
+                shift_id, shift_date, start_time, end_time, assignment_id, _duration_hours(start_time, end_time)
+            ))
+
+    return defaultdict(lambda: _EmployeeTimeline([]), {
+        employee_id: _EmployeeTimeline(employee_entries) for employee_id, employee_entries in entries.items()
+    })
+
+
+def _context_range(start_date: datetime.date, end_date: datetime.date) -> Tuple[datetime.date, datetime.date]:
+    """Dates whose assignments the checks of shifts in the range look at: their weeks and a day on either side."""
+    first = min(_week_start(start_date), start_date - timedelta(days=1))
+    last = max(_week_start(end_date) + timedelta(days=6), end_date + timedelta(days=1))
+    return first, last
+
+
+class _ProposedAssignment(NamedTuple):
+    """An assignment taken away or put in place by a what-if change."""
+    assignment_id: int
+    employee_id: int
+    shift: Shift
+    status: str
+
+
+def _affected_days(days: Set[datetime.date]) -> Set[datetime.date]:
+    """Days whose assignments' checks look at one of ``days``: the day either side and the rest of the week."""
+    affected = set()
+    for day in days:
+        affected.update((day - timedelta(days=1), day + timedelta(days=1)))
+        affected.update(_week_start(day) + timedelta(days=offset) for offset in range(7))
+    return affected
+
+
+def _scoped_conflicts(
+    timeline: "_EmployeeTimeline",
+    employee: Employee,
+    days: Set[datetime.date]
+) -> Dict[Tuple, Dict[str, Any]]:
+    """Timeline conflicts of the employee's assignments on ``days``, keyed by what they are about."""
+    found = {}
+    for day in days:
+        for entry in timeline.by_date.get(day, []):
+            for conflict in timeline.conflicts(entry.assignment_id, entry):
+                key = (
+                    employee.id,
+                    entry.assignment_id,
+                    entry.id,
+                    conflict["conflict_type"],
+                    conflict.get("period"),
+                    conflict.get("assignment_id"),
+                    conflict.get("previous_shift_id"),
+                    conflict.get("next_shift_id")
+                )
+                found[key] = _with_subject(conflict, employee, entry)
+    return found
+
+
+def _with_subject(conflict: Dict[str, Any], employee: Employee, shift: Any) -> Dict[str, Any]:
+    """Add the employee and shift a conflict is about, as the conflict report does."""
+    conflict["employee_id"] = employee.id
+    conflict["employee_name"] = f"{employee.first_name} {employee.last_name}"
+    conflict["shift_id"] = shift.id
+    conflict["shift_date"] = shift.date.isoformat()
+    return conflict
+
+
+def _week_start(day: datetime.date) -> datetime.date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def _duration_hours(start_time: time, end_time: time) -> float:
+    """Shift duration in hours, as Shift.duration_hours computes it."""
+    minutes = (end_time.hour * 60 + end_time.minute) - (start_time.hour * 60 + start_time.minute)
+    if minutes < 0:
+        minutes += 24 * 60
+    return minutes / 60
+
+
+def _overlap_conflict(assignment_id: int, shift: Any) -> Dict[str, Any]:
+    """Conflict with an overlapping assignment to ``shift`` (needs id, date, start_time and end_time)."""
+    return {
+        "assignment_id": assignment_id,
+        "shift_id": shift.id,
+        "shift_date": shift.date.isoformat(),
+        "shift_start": shift.start_time.isoformat(),
+        "shift_end": shift.end_time.isoformat(),
+        "conflict_type": ConflictType.OVERLAPPING_SHIFTS,
+        "severity": ConflictSeverity.CRITICAL,
+        "message": f"Employee already assigned to overlapping shift on {shift.date}",
+        "suggested_resolution": "Reassign employee or adjust shift times"
+    }
+
+
+def _double_booking_conflict(assignment_id: int, shift_id: int) -> Dict[str, Any]:
+    """Conflict with an existing assignment of the employee to the same shift."""
+    return {
+        "assignment_id": assignment_id,
+        "shift_id": shift_id,
+        "conflict_type": ConflictType.DOUBLE_BOOKING,
+        "severity": ConflictSeverity.CRITICAL,
+        "message": "Employee already assigned to this shift",
+        "suggested_resolution": "Remove duplicate assignment"
+    }
+
+
+def _employee_fit_conflicts(employee: Employee, shift: Shift) -> List[Dict[str, Any]]:
+    """Availability and qualification conflicts of assigning an employee to a shift."""
+    conflicts = []
+
+    # Check employee availability
+    day_name = shift.date.strftime("%A").lower()
+    shift_start = shift.start_time.strftime("%H:%M")
+
+    if not employee.is_available_at(day_name, shift_start):
+        conflicts.append({
+            "conflict_type": ConflictType.UNAVAILABLE_EMPLOYEE,
+            "severity": ConflictSeverity.MEDIUM,
+            "day": day_name,
+            "time": shift_start,
+            "message": f"Employee not available on {day_name} at {shift_start}",
+            "suggested_resolution": "Choose an available employee or update availability"
+        })
+
+    # Check qualifications if shift has requirements
+    if shift.requirements:
+        required_quals = shift.requirements.get("qualifications", [])
+        if required_quals:
+            missing_quals = [
+                qual for qual in required_quals
+                if not employee.has_qualification(qual)
+            ]
+
+            if missing_quals:
+                conflicts.append({
+                    "conflict_type": ConflictType.MISSING_QUALIFICATION,
+                    "severity": ConflictSeverity.HIGH,
+                    "required_qualifications": required_quals,
+                    "missing_qualifications": missing_quals,
+                    "message": f"Employee missing qualifications: {', '.join(missing_quals)}",
+                    "suggested_resolution": "Assign employee with required qualifications"
+                })
+
+    return conflicts
+
+
 def _times_overlap(start1: time, end1: time, start2: time, end2: time) -> bool:
     """
     Check if two time ranges overlap.
@@ -644,22 +1381,7 @@ async def _get_employee_daily_hours(
     date: datetime.date
 ) -> float:
     """Get total hours employee is scheduled for on a specific date."""
-    query = (
-        select(Shift)
-        .join(ScheduleAssignment)
-        .where(
-            and_(
-                ScheduleAssignment.employee_id == employee_id,
-                ScheduleAssignment.status == "assigned",
-                Shift.date == date
-            )
-        )
-    )
-
-    result = await db.execute(query)
-    shifts = result.scalars().all()
-
-    return sum(shift.duration_hours for shift in shifts)
+    return await _get_employee_scheduled_hours(db, employee_id, date, date)
 
 
 async def _get_employee_weekly_hours(
@@ -669,23 +1391,157 @@ async def _get_employee_weekly_hours(
     week_end: datetime.date
 ) -> float:
     """Get total hours employee is scheduled for in a week."""
+    return await _get_employee_scheduled_hours(db, employee_id, week_start, week_end)
+
+
+async def _get_employee_scheduled_hours(
+    db: AsyncSession,
+    employee_id: int,
+    start_date: datetime.date,
+    end_date: datetime.date
+) -> float:
+    """Total hours of the employee's assigned shifts on the dates, summed by the database."""
     query = (
-        select(Shift)
-        .join(ScheduleAssignment)
+        select(func.sum(_shift_end_at() - _shift_start_at()))
+        .select_from(ScheduleAssignment)
+        .join(Shift, ScheduleAssignment.shift_id == Shift.id)
         .where(
             and_(
                 ScheduleAssignment.employee_id == employee_id,
-                ScheduleAssignment.status == "assigned",
-                Shift.date >= week_start,
-                Shift.date <= week_end
+                ScheduleAssignment.status.in_(_ACTIVE_STATUSES),
+                Shift.date >= start_date,
+                Shift.date <= end_date
             )
         )
     )
 
     result = await db.execute(query)
-    shifts = result.scalars().all()
+    return _interval_hours(result.scalar())
+
+
+def _schedule_audit_query(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    employee_ids: Optional[Set[int]],
+    department_id: Optional[int],
+    minimum_rest_hours: float,
+    max_hours_per_day: float,
+    max_hours_per_week: float
+):
+    """
+    Windowed query of the assigned shifts in the range that break a rest or hour limit.
+
+    The inner queries also read the rest of the range's weeks and enough days
+    before and after it for the window functions to see every neighbour and
+    weekly hour that matters. A shift rests after the latest end among the
+    employee's earlier shifts, and ``prev_shift_id`` is the shift holding
+    that end. The outer query keeps the shifts of the range with a violation
+    and the shifts right after a range shift that is left short of rest.
+    """
+    margin = timedelta(days=1 + math.ceil(minimum_rest_hours / 24))
+    first = min(_week_start(start_date), start_date - margin)
+    last = max(_week_start(end_date) + timedelta(days=6), end_date + margin)
+
+    conditions = [
+        ScheduleAssignment.status.in_(_ACTIVE_STATUSES),
+        Shift.date >= first,
+        Shift.date <= last
+    ]
+    if employee_ids is not None:
+        conditions.append(ScheduleAssignment.employee_id.in_(employee_ids))
+    if department_id is not None:
+        conditions.append(Employee.department_id == department_id)
+
+    spans = (
+        select(
+            ScheduleAssignment.id.label("assignment_id"),
+            ScheduleAssignment.employee_id.label("employee_id"),
+            Employee.first_name.label("first_name"),
+            Employee.last_name.label("last_name"),
+            Shift.id.label("shift_id"),
+            Shift.date.label("date"),
+            _shift_start_at().label("start_at"),
+            _shift_end_at().label("end_at")
+        )
+        .select_from(ScheduleAssignment)
+        .join(Shift, ScheduleAssignment.shift_id == Shift.id)
+        .join(Employee, ScheduleAssignment.employee_id == Employee.id)
+        .where(and_(*conditions))
+        .subquery("spans")
+    )
+
+    by_employee = dict(partition_by=spans.c.employee_id, order_by=(spans.c.start_at, spans.c.end_at, spans.c.assignment_id))
+    hours = spans.c.end_at - spans.c.start_at
+    reaches = select(
+        spans,
+        func.max(spans.c.end_at).over(**by_employee, rows=(None, -1)).label("prev_end"),
+        func.max(spans.c.end_at).over(**by_employee, rows=(None, 0)).label("reach"),
+        func.sum(hours).over(partition_by=(spans.c.employee_id, spans.c.date)).label("daily_hours"),
+        func.sum(hours).over(
+            partition_by=(spans.c.employee_id, func.date_trunc("week", spans.c.date))
+        ).label("weekly_hours")
+    ).subquery("reaches")
+
+    # The first shift of each running maximum end is the one that ends last so far
+    by_reach = dict(
+        partition_by=(reaches.c.employee_id, reaches.c.reach),
+        order_by=(reaches.c.start_at, reaches.c.end_at, reaches.c.assignment_id)
+    )
+    holders = select(
+        reaches,
+        func.first_value(reaches.c.shift_id).over(**by_reach).label("reach_shift_id"),
+        func.first_value(reaches.c.date).over(**by_reach).label("reach_date")
+    ).subquery("holders")
+
+    by_holder = dict(
+        partition_by=holders.c.employee_id,
+        order_by=(holders.c.start_at, holders.c.end_at, holders.c.assignment_id)
+    )
+    timeline = select(
+        holders,
+        func.lag(holders.c.reach_shift_id).over(**by_holder).label("prev_shift_id"),
+        func.lag(holders.c.reach_date).over(**by_holder).label("prev_date")
+    ).subquery("timeline")
+
+    short_rest = and_(
+        timeline.c.start_at >= timeline.c.prev_end,
+        timeline.c.start_at < timeline.c.prev_end + timedelta(hours=minimum_rest_hours)
+    )
+    return (
+        select(timeline)
+        .where(
+            or_(
+                and_(
+                    timeline.c.date.between(start_date, end_date),
+                    or_(
+                        short_rest,
+                        timeline.c.daily_hours > timedelta(hours=max_hours_per_day),
+                        timeline.c.weekly_hours > timedelta(hours=max_hours_per_week)
+                    )
+                ),
+                and_(timeline.c.prev_date.between(start_date, end_date), short_rest)
+            )
+        )
+        .order_by(timeline.c.employee_id, timeline.c.start_at)
+    )
 
-    return sum(shift.duration_hours for shift in shifts)
+
+def _shift_start_at():
+    """SQL expression of a shift's start timestamp."""
+    return Shift.date + Shift.start_time
+
+
+def _shift_end_at():
+    """SQL expression of a shift's end timestamp, on the next day for shifts crossing midnight."""
+    return Shift.date + Shift.end_time + case(
+        (Shift.end_time < Shift.start_time, timedelta(days=1)),
+        else_=timedelta(0)
+    )
+
+
+def _interval_hours(interval: Optional[timedelta]) -> float:
+    """Hours of an interval returned by the database, 0 for NULL."""
+    return interval.total_seconds() / 3600 if interval is not None else 0.0
 
 
 def _generate_recommendations(
@@ -733,3 +1589,59 @@ def _generate_recommendations(
         recommendations.append("No conflicts detected - schedule looks good!")
 
     return recommendations
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _record_assignment_changes(session, flush_context):
+    """Record flushed assignment and shift changes; assignment_index applies them on commit."""
+    changes = session.info.setdefault(_CHANGES_KEY, [])
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ScheduleAssignment):
+            if obj not in session.new:
+                previous = set(inspect(obj).attrs.employee_id.history.deleted or ())
+                changes.extend(("discard", employee_id, obj.id) for employee_id in previous | {obj.employee_id})
+            if obj in session.deleted or obj.status not in _ACTIVE_STATUSES:
+                continue
+            shift = _loaded_shift(session, obj)
+            if shift is None:
+                changes.append(("invalidate", obj.employee_id, None))
+            else:
+                changes.append(("add", obj.employee_id, _TimelineShift(
+                    shift.id, shift.date, shift.start_time, shift.end_time, obj.id,
+                    _duration_hours(shift.start_time, shift.end_time)
+                )))
+        elif isinstance(obj, Shift):
+            state = inspect(obj)
+            if obj in session.deleted or any(
+                state.attrs[name].history.has_changes() for name in ("date", "start_time", "end_time")
+            ):
+                changes.append(("shift", None, obj.id))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_assignment_changes(session):
+    """Hand the recorded changes of a committed session to assignment_index."""
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        assignment_index.apply(changes)
+
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_assignment_changes(session, previous_transaction):
+    """Drop the recorded changes of a rolled back transaction."""
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes and previous_transaction.nested:
+        # The outer transaction may still commit what was flushed before the savepoint
+        session.info[_CHANGES_KEY] = [
+            change if change[0] == "shift" else ("invalidate", change[1], None) for change in changes
+        ]
+
+
+def _loaded_shift(session, assignment: ScheduleAssignment) -> Optional[Shift]:
+    """The assignment's shift if it is already in memory (never loads it)."""
+    shift = inspect(assignment).dict.get("shift")
+    if shift is None or shift.id != assignment.shift_id:
+        shift = session.identity_map.get(session.identity_key(Shift, assignment.shift_id))
+    if shift is None or {"date", "start_time", "end_time"} & inspect(shift).unloaded:
+        return None
+    return shift
@@ -0,0 +1,544 @@
+"""
+Background job queue for schedule generation.
+
+CP-SAT solves can run for up to a minute. Running them inside a request
+handler blocks the event loop, so generation requests are queued here and the
+solver runs in a process pool. Jobs report status and progress, stream each
+improving solution to the "schedules" WebSocket room, can be cancelled or have
+their current incumbent accepted early, and their finished results are
+persisted so clients can fetch them again without re-solving.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import threading
+import time as time_module
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.redis_cache import cache
+from ..scheduler.constraint_solver import Employee, ScheduleOptimizer, SchedulingConstraint, Shift
+from ..scheduler.decomposition import solve_decomposed
+from ..scheduler.instance import SolverInstance
+from ..scheduler.rolling_horizon import solve_rolling, use_rolling_horizon
+
+logger = logging.getLogger(__name__)
+
+JOB_CACHE_PREFIX = "schedule_job"
+JOB_RESULT_TTL = 24 * 3600  # Keep finished results for a day
+MAX_JOBS_IN_MEMORY = 200
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a generation job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+@dataclass
+class GenerationJob:
+    """State of a single schedule generation job."""
+
+    id: str
+    start_date: date
+    end_date: date
+    constraints: Dict[str, Any] = field(default_factory=dict)
+    created_by: Optional[int] = None
+    stream_incumbents: bool = True
+    decompose: bool = False
+    # Current plan as (employee_id, shift_id) solver keys, re-optimized with minimal change
+    existing_assignments: List[Tuple[str, str]] = field(default_factory=list)
+    status: JobStatus = JobStatus.QUEUED
+    phase: str = "queued"
+    progress: float = 0.0
+    message: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    incumbent: Optional[Dict[str, Any]] = None
+    accepted: bool = False
+    result: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Check if the job has reached a terminal state"""
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Serialize the job for API responses and the result cache."""
+        data = {
+            "job_id": self.id,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "constraints": self.constraints,
+            "created_by": self.created_by,
+            "stream_incumbents": self.stream_incumbents,
+            "decompose": self.decompose,
+            "existing_assignments": [list(key) for key in self.existing_assignments],
+            "status": self.status.value,
+            "phase": self.phase,
+            "progress": round(self.progress, 1),
+            "message": self.message,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "incumbent": self.incumbent,
+            "accepted": self.accepted,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GenerationJob":
+        """Rebuild a job from its cached representation."""
+        return cls(
+            id=data["job_id"],
+            start_date=date.fromisoformat(data["start_date"]),
+            end_date=date.fromisoformat(data["end_date"]),
+            constraints=data.get("constraints") or {},
+            created_by=data.get("created_by"),
+            stream_incumbents=data.get("stream_incumbents", True),
+            decompose=data.get("decompose", False),
+            existing_assignments=[tuple(key) for key in data.get("existing_assignments") or []],
+            status=JobStatus(data["status"]),
+            phase=data.get("phase", ""),
+            progress=data.get("progress", 0.0),
+            message=data.get("message"),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
+            finished_at=datetime.fromisoformat(data["finished_at"]) if data.get("finished_at") else None,
+            incumbent=data.get("incumbent"),
+            accepted=data.get("accepted", False),
+            result=data.get("result"),
+        )
+
+
+def solve_in_worker(
+    config: Dict[str, Any],
+    employees: List[Employee],
+    shifts: List[Shift],
+    constraints: List[SchedulingConstraint],
+    stop_event: Any = None,
+    incumbent_queue: Any = None,
+    instance: Optional[SolverInstance] = None,
+    existing_assignments: Optional[List[Tuple[str, str]]] = None,
+    minimal_change_weight: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run the optimizer inside a pool worker process.
+
+    A watcher thread stops the search as soon as ``stop_event`` is set; the
+    solver then returns the best solution found so far. When
+    ``incumbent_queue`` is given every improving solution is put on it.
+    ``instance`` is the compact instance converted by the service; it is
+    pickled together with ``employees`` and ``shifts`` so it still matches them.
+    ``existing_assignments`` and ``minimal_change_weight`` warm-start the solve
+    from the current plan as in ScheduleOptimizer.generate_schedule.
+    """
+    optimizer = ScheduleOptimizer(config=config)
+    done = threading.Event()
+
+    def watch_for_stop():
+        while not done.is_set():
+            if stop_event.wait(0.2):
+                # Keep signalling in case the solver was still being built
+                optimizer.stop_search()
+                done.wait(0.2)
+
+    if stop_event is not None:
+        threading.Thread(target=watch_for_stop, daemon=True).start()
+
+    try:
+        return optimizer.generate_schedule(
+            employees=employees,
+            shifts=shifts,
+            constraints=constraints,
+            solution_callback=incumbent_queue.put if incumbent_queue is not None else None,
+            existing_assignments=existing_assignments,
+            minimal_change_weight=minimal_change_weight,
+            instance=instance,
+        )
+    finally:
+        done.set()
+
+
+_SCHEDULE_EVENTS: Any = None
+
+
+def _schedule_events() -> Any:
+    """Return the WebSocket ScheduleEvents emitter, or None if WebSockets are unavailable."""
+    global _SCHEDULE_EVENTS
+    if _SCHEDULE_EVENTS is None:
+        try:
+            from ..websocket.events import ScheduleEvents
+
+            _SCHEDULE_EVENTS = ScheduleEvents
+        except ImportError as e:
+            logger.warning(f"WebSocket events unavailable, incumbents will not be streamed: {e}")
+            _SCHEDULE_EVENTS = False
+    return _SCHEDULE_EVENTS or None
+
+
+class ScheduleJobManager:
+    """Queues schedule generation jobs and runs their solves in a process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the job manager; the pool is created on first use."""
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._sync_manager = None
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stop_events: Dict[str, Any] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool and the cross-process event manager lazily."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._sync_manager = multiprocessing.Manager()
+        return self._executor
+
+    async def submit(
+        self,
+        start_date: date,
+        end_date: date,
+        constraints: Optional[Dict[str, Any]] = None,
+        created_by: Optional[int] = None,
+        stream_incumbents: bool = True,
+        decompose: bool = False,
+        existing_assignments: Optional[Iterable[Tuple[str, str]]] = None,
+    ) -> GenerationJob:
+        """
+        Queue a generation job and return immediately.
+
+        With ``existing_assignments`` the current plan is re-optimized, keeping
+        the new plan close to it. An identical request that is still queued or
+        running is returned instead of starting a second solve.
+        """
+        constraints = constraints or {}
+        existing_assignments = sorted(existing_assignments or ())
+        for job in self._jobs.values():
+            if (
+                not job.is_finished
+                and job.start_date == start_date
+                and job.end_date == end_date
+                and job.constraints == constraints
+                and job.decompose == decompose
+                and job.existing_assignments == existing_assignments
+            ):
+                return job
+
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            start_date=start_date,
+            end_date=end_date,
+            constraints=constraints,
+            created_by=created_by,
+            stream_incumbents=stream_incumbents,
+            decompose=decompose,
+            existing_assignments=existing_assignments,
+        )
+        self._remember(job)
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+        logger.info(f"Queued schedule generation job {job.id} for {start_date} - {end_date}")
+        return job
+
+    async def wait(self, job_id: str) -> Optional[GenerationJob]:
+        """
+        Wait until a job reaches a terminal state and return it.
+
+        The solve keeps running in the pool while waiting, so request handlers
+        that answer with the finished schedule don't block the event loop. If
+        the waiter is cancelled (e.g. the client disconnects) the job still runs
+        to completion.
+        """
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.wait({task})
+        return self.get(job_id)
+
+    async def run(self, start_date: date, end_date: date, **options: Any) -> Dict[str, Any]:
+        """
+        Queue a job (see submit), wait for it and return its result.
+
+        Jobs that end without a result (e.g. cancelled) are reported with
+        their status and message in the same format as a generation result.
+        """
+        job = await self.wait((await self.submit(start_date, end_date, **options)).id)
+        if job.result is not None:
+            return job.result
+        return {"status": job.status.value, "message": job.message, "schedule": []}
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Look up a job in memory, falling back to the persisted copy."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        cached = cache.get(f"{JOB_CACHE_PREFIX}:{job_id}")
+        return GenerationJob.from_dict(cached) if cached else None
+
+    def list_jobs(self, limit: int = 20) -> List[GenerationJob]:
+        """Return the most recent jobs known to this worker."""
+        jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return jobs[:limit]
+
+    async def cancel(self, job_id: str) -> Optional[GenerationJob]:
+        """
+        Cancel a queued or running job.
+
+        Jobs that have not reached the solver are cancelled outright. A running
+        solve is asked to stop; its partial result is discarded. Jobs that are
+        already saving assignments run to completion.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return job or self.get(job_id)
+
+        if job.phase == "saving":
+            # Assignments are already being written; let the job complete
+            return job
+
+        stop_event = self._stop_events.get(job_id)
+        if stop_event is not None:
+            stop_event.set()
+        else:
+            task = self._tasks.get(job_id)
+            if task is not None:
+                task.cancel()
+
+        self._finish(job, JobStatus.CANCELLED, "Cancelled by user")
+        return job
+
+    async def accept(self, job_id: str) -> Optional[GenerationJob]:
+        """
+        Accept the current incumbent of a solving job.
+
+        The search stops and the best solution found so far is saved as the
+        job result. Jobs without an incumbent are returned unchanged.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return job or self.get(job_id)
+
+        stop_event = self._stop_events.get(job_id)
+        if job.phase == "solving" and job.incumbent is not None and stop_event is not None:
+            job.accepted = True
+            stop_event.set()
+            self._persist(job)
+
+        return job
+
+    async def _run(self, job: GenerationJob):
+        """Load input, solve in the pool, then persist the result."""
+        from ..database import AsyncSessionLocal
+        from .schedule_service import schedule_service
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        self._update(job, "loading", 5.0)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                generation_input, error = await schedule_service.load_generation_input(db, job.start_date, job.end_date)
+                if error:
+                    self._finish(job, JobStatus.FAILED, error["message"], error)
+                    return
+
+                config = dict(schedule_service.optimizer.config)
+                variant = {"decompose": job.decompose, "existing_assignments": job.existing_assignments}
+                result = schedule_service.get_cached_result(generation_input, variant)
+
+                if result is None:
+                    result = await self._solve(job, config, generation_input)
+                    if job.status == JobStatus.CANCELLED:
+                        return
+                    # An incumbent accepted early is not the solver's answer for this instance
+                    if not job.accepted:
+                        schedule_service.cache_result(generation_input, variant, result)
+
+                self._update(job, "saving", 90.0)
+                result = await schedule_service.persist_result(db, result, generation_input)
+
+            status = JobStatus.COMPLETED if result["status"] in ["optimal", "feasible"] else JobStatus.FAILED
+            self._finish(job, status, result.get("message", "Schedule generation completed"), result)
+
+        except asyncio.CancelledError:
+            if not job.is_finished:
+                self._finish(job, JobStatus.CANCELLED, "Cancelled by user")
+        except Exception as e:
+            logger.error(f"Schedule generation job {job.id} failed: {e}", exc_info=True)
+            self._finish(job, JobStatus.FAILED, f"Schedule generation failed: {str(e)}")
+        finally:
+            self._tasks.pop(job.id, None)
+            self._stop_events.pop(job.id, None)
+
+    async def _solve(self, job: GenerationJob, config: Dict[str, Any], generation_input: Any) -> Dict[str, Any]:
+        """Submit the solve to the pool and report time-based progress until it returns."""
+        executor = self._get_executor()
+        minimal_change_weight = config.get("minimal_change_weight", 0) if job.existing_assignments else 0
+
+        if job.decompose:
+            # Partitions are fanned out over the same pool; no incumbents are streamed
+            incumbent_queue = None
+            future = asyncio.ensure_future(
+                asyncio.to_thread(
+                    solve_decomposed,
+                    config,
+                    generation_input.employees,
+                    generation_input.shifts,
+                    generation_input.constraints,
+                    executor,
+                )
+            )
+        elif use_rolling_horizon(config, generation_input.shifts):
+            # Windows are solved one after another in a single worker; cancelling
+            # stops between windows and no incumbents are streamed
+            stop_event = self._sync_manager.Event()
+            self._stop_events[job.id] = stop_event
+            incumbent_queue = None
+            future = asyncio.wrap_future(
+                executor.submit(
+                    solve_rolling,
+                    config,
+                    generation_input.employees,
+                    generation_input.shifts,
+                    generation_input.constraints,
+                    existing_assignments=job.existing_assignments,
+                    minimal_change_weight=minimal_change_weight,
+                    stop_event=stop_event,
+                )
+            )
+        else:
+            stop_event = self._sync_manager.Event()
+            self._stop_events[job.id] = stop_event
+            incumbent_queue = self._sync_manager.Queue() if job.stream_incumbents else None
+
+            future = asyncio.wrap_future(
+                executor.submit(
+                    solve_in_worker,
+                    config,
+                    generation_input.employees,
+                    generation_input.shifts,
+                    generation_input.constraints,
+                    stop_event,
+                    incumbent_queue,
+                    generation_input.instance,
+                    job.existing_assignments,
+                    minimal_change_weight,
+                )
+            )
+
+        time_limit = max(1, config.get("max_solve_time", 30))
+        started = time_module.monotonic()
+        self._update(job, "solving", 10.0)
+
+        while not future.done():
+            await asyncio.wait({future}, timeout=0.5)
+            if incumbent_queue is not None:
+                await self._publish_incumbents(job, incumbent_queue)
+            elapsed = time_module.monotonic() - started
+            if not job.is_finished:
+                self._update(job, "solving", 10.0 + 80.0 * min(1.0, elapsed / time_limit), persist=False)
+
+        if incumbent_queue is not None:
+            await self._publish_incumbents(job, incumbent_queue)
+
+        result = future.result()
+        if job.accepted and result["status"] in ["optimal", "feasible"]:
+            result["message"] = "Accepted incumbent solution before search completed"
+        return result
+
+    async def _publish_incumbents(self, job: GenerationJob, incumbent_queue: Any):
+        """Drain incumbents reported by the worker and push them to WebSocket clients."""
+        while True:
+            try:
+                incumbent = incumbent_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            # Pollers only get the summary; the assignment diff is streamed
+            job.incumbent = {key: value for key, value in incumbent.items() if key not in ("added", "removed")}
+            if job.is_finished:
+                continue
+
+            events = _schedule_events()
+            if events is not None:
+                try:
+                    await events.generation_incumbent(job.id, incumbent)
+                except Exception as e:
+                    logger.warning(f"Failed to publish incumbent for job {job.id}: {e}")
+
+    def _update(self, job: GenerationJob, phase: str, progress: float, persist: bool = True):
+        """Record a phase change and optionally persist it."""
+        job.phase = phase
+        job.progress = progress
+        if persist:
+            self._persist(job)
+
+    def _finish(self, job: GenerationJob, status: JobStatus, message: Optional[str], result: Optional[Dict[str, Any]] = None):
+        """Move a job to a terminal state and persist it with its result."""
+        job.status = status
+        job.phase = status.value
+        job.message = message
+        job.finished_at = datetime.utcnow()
+        if status == JobStatus.COMPLETED:
+            job.progress = 100.0
+        if result is not None:
+            job.result = result
+        self._persist(job)
+        logger.info(f"Schedule generation job {job.id} {status.value}: {message}")
+
+        asyncio.ensure_future(self._publish_finished(job))
+
+    async def _publish_finished(self, job: GenerationJob):
+        """Notify WebSocket clients that a job reached a terminal state."""
+        events = _schedule_events()
+        if events is None:
+            return
+        try:
+            await events.generation_finished(job.id, job.status.value, job.message)
+        except Exception as e:
+            logger.warning(f"Failed to publish completion of job {job.id}: {e}")
+
+    def _persist(self, job: GenerationJob):
+        """Store the job (and any result) so other workers and reloads can read it."""
+        cache.set(f"{JOB_CACHE_PREFIX}:{job.id}", job.to_dict(include_result=True), JOB_RESULT_TTL)
+
+    def _remember(self, job: GenerationJob):
+        """Track a job in memory, evicting the oldest finished jobs past the limit."""
+        self._jobs[job.id] = job
+        if len(self._jobs) > MAX_JOBS_IN_MEMORY:
+            finished = sorted((j for j in self._jobs.values() if j.is_finished), key=lambda j: j.created_at)
+            for old_job in finished[: len(self._jobs) - MAX_JOBS_IN_MEMORY]:
+                del self._jobs[old_job.id]
+        self._persist(job)
+
+    async def shutdown(self):
+        """Cancel outstanding jobs and stop the worker pool."""
+        for job_id in list(self._tasks):
+            await self.cancel(job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._sync_manager is not None:
+            self._sync_manager.shutdown()
+            self._sync_manager = None
+
+
+# Singleton instance
+schedule_job_manager = ScheduleJobManager()
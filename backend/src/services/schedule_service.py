@@ -2,22 +2,55 @@
 Schedule generation service using constraint solver.
 """
 
+import copy
 import logging
+from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, event, insert, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.batch_operations import BatchOperations
+from ..core.cache import get_schedule_cache
 from ..models import Employee as DBEmployee
 from ..models import Rule as DBRule
 from ..models import Schedule as DBSchedule
 from ..models import ScheduleAssignment as DBScheduleAssignment
 from ..models import Shift as DBShift
 from ..scheduler.constraint_solver import Employee, Shift, ScheduleOptimizer, ShiftType, SchedulingConstraint
+from ..scheduler.decomposition import solve_decomposed
+from ..scheduler.instance import SolverInstance
+from ..scheduler.intervals import absolute_interval, sweep_conflicts
+from ..scheduler.rolling_horizon import solve_rolling, use_rolling_horizon
+from ..scheduler.rule_compiler import rule_compiler
+from ..solver_metrics import PhaseTimer, record_generation
+from .conflict_detection import assignment_index
 
 logger = logging.getLogger(__name__)
 
+# Employee columns that feed the solver; changing any of them invalidates cached results
+SOLVER_EMPLOYEE_FIELDS = (
+    "availability",
+    "availability_pattern",
+    "qualifications",
+    "max_hours_per_week",
+    "is_active",
+    "department_id",
+)
+
+
+@dataclass
+class GenerationInput:
+    """Solver input loaded from the database for one generation run."""
+
+    employees_data: List[DBEmployee]
+    employees: List[Employee]
+    shifts: List[Shift]
+    constraints: List[SchedulingConstraint]
+    instance: Optional[SolverInstance] = None
+    timer: PhaseTimer = field(default_factory=PhaseTimer)
+
 
 class ScheduleGenerationService:
     """Service for generating schedules using constraint solver."""
@@ -26,111 +59,282 @@ class ScheduleGenerationService:
         """Initialize the schedule generation service."""
         self.optimizer = ScheduleOptimizer(
             config={
-                "max_solve_time": 60,  # 60 seconds timeout
+                "max_solve_time": 60,  # Ceiling on the solve time of any instance
+                "adaptive_time_limit": True,  # Budget time and workers by model size and past solves (scheduler.solve_budget)
+                "min_solve_time": 2,  # Smallest adaptive time limit
+                "solve_seconds_per_1k_variables": 1.0,  # Adaptive time limit without comparable past solves
+                "relative_gap_limit": 0.01,  # Stop once the solution is within 1% of the best bound
+                "stall_time": 10,  # Stop after this many seconds without an improving solution
+                "num_search_workers": None,  # CP-SAT workers (None: by model size, up to the CPU count)
                 "min_rest_hours": 8,  # Minimum rest period between shifts
+                "sparse_variables": True,  # Only model eligible (employee, shift) pairs
+                "minimal_change_weight": 20,  # Penalty per changed assignment when re-optimizing
+                "decomposition_workers": None,  # Pool size for decomposed solves (default: CPU count)
+                "result_cache_ttl": 1800,  # Seconds to keep solver results keyed by instance fingerprint
+                "greedy_variable_limit": 1_000_000,  # Above this many eligible pairs, skip CP-SAT and build greedily
+                "rolling_horizon_days": 28,  # Longer ranges are solved in rolling windows (see scheduler.rolling_horizon)
+                "rolling_window_weeks": 1,  # Weeks committed per rolling window
+                "rolling_overlap_days": 2,  # Look-ahead days solved with each window but not committed
+                "max_consecutive_days": None,  # Limit on days worked in a row (None: no limit)
+                "feasibility_precheck": True,  # Report staffing no eligible employees can cover before solving
+                "explain_infeasibility": True,  # Name a minimal set of conflicting rules when the model is infeasible
+                "explain_time_limit": 10,  # Seconds allowed for that explanation
+                "symmetry_breaking": True,  # Order the schedules of interchangeable employees (see scheduler.symmetry)
+                "symmetry_min_share": 0.5,  # ...when at least this share of employees is interchangeable with another
             }
         )
 
-    async def _get_or_create_schedule_for_week(
-        self, db: AsyncSession, shift_date: date, created_by: int = 1
-    ) -> DBSchedule:
+    async def _get_or_create_schedules_for_weeks(
+        self, db: AsyncSession, week_starts: Set[date], created_by: int = 1
+    ) -> Dict[date, int]:
         """
-        Find or create Schedule container for the week containing shift_date.
+        Find or create the Schedule containers for several weeks at once.
+
+        Existing containers are loaded with one query and all missing ones are
+        created with a single multi-row INSERT ... RETURNING.
 
         Args:
             db: Database session
-            shift_date: Date of the shift (used to determine week range)
-            created_by: User ID creating the schedule (default: 1 for system)
+            week_starts: Mondays of the weeks to cover
+            created_by: User ID creating the schedules (default: 1 for system)
 
         Returns:
-            Schedule object for the week
+            Schedule ID per week start
         """
-        # Calculate week start (Monday) and end (Sunday) from shift_date
-        week_start = shift_date - timedelta(days=shift_date.weekday())
-        week_end = week_start + timedelta(days=6)
+        if not week_starts:
+            return {}
 
-        # Try to find existing schedule for this week
-        query = select(DBSchedule).where(DBSchedule.week_start == week_start, DBSchedule.week_end == week_end)
+        query = select(DBSchedule.id, DBSchedule.week_start, DBSchedule.week_end).where(
+            DBSchedule.week_start.in_(sorted(week_starts))
+        )
         result = await db.execute(query)
-        schedule = result.scalar_one_or_none()
-
-        if not schedule:
-            # Create new schedule for this week
-            schedule = DBSchedule(
-                week_start=week_start,
-                week_end=week_end,
-                status="draft",
-                created_by=created_by,
-                version=1,
+        schedule_ids = {}
+        for schedule_id, week_start, week_end in result.all():
+            if week_end == week_start + timedelta(days=6):
+                schedule_ids.setdefault(week_start, schedule_id)
+
+        missing = sorted(week_starts - set(schedule_ids))
+        if missing:
+            now = datetime.utcnow()
+            stmt = (
+                insert(DBSchedule)
+                .values(
+                    [
+                        {
+                            "week_start": week_start,
+                            "week_end": week_start + timedelta(days=6),
+                            "status": "draft",
+                            "created_by": created_by,
+                            "version": 1,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for week_start in missing
+                    ]
+                )
+                .returning(DBSchedule.id, DBSchedule.week_start)
             )
-            db.add(schedule)
-            await db.flush()  # Get ID without committing transaction
+            result = await db.execute(stmt)
+            schedule_ids.update({week_start: schedule_id for schedule_id, week_start in result.all()})
 
-        return schedule
+        return schedule_ids
 
     async def generate_schedule(
-        self, db: AsyncSession, start_date: date, end_date: date, constraints: Optional[Dict[str, Any]] = None
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: date,
+        constraints: Optional[Dict[str, Any]] = None,
+        existing_assignments: Optional[Set[Tuple[str, str]]] = None,
+        decompose: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate a schedule for the given date range.
 
+        Runs the solver inline; long-running generations should go through
+        services.schedule_jobs so the event loop is not blocked.
+
+        In decomposition mode the instance is split by department and week, the
+        parts are solved concurrently in a process pool and the week boundaries
+        are stitched afterwards (see scheduler.decomposition). Otherwise, ranges
+        longer than ``rolling_horizon_days`` are solved in rolling windows (see
+        scheduler.rolling_horizon).
+
         Args:
             db: Database session
             start_date: Start date for schedule
             end_date: End date for schedule
             constraints: Optional additional constraints
+            existing_assignments: Current plan as (employee_id, shift_id) solver keys;
+                used as a warm start and to keep the new plan close to it
+            decompose: Solve component-week partitions (see scheduler.decomposition) in parallel instead of one model
 
         Returns:
             Dict containing schedule data and status
         """
         try:
-            # Fetch active employees from database
+            generation_input, error = await self.load_generation_input(db, start_date, end_date)
+            if error:
+                return error
+
+            variant = {"decompose": decompose, "existing_assignments": sorted(existing_assignments or ())}
+            result = self.get_cached_result(generation_input, variant)
+
+            if result is None and decompose:
+                result = solve_decomposed(
+                    self.optimizer.config,
+                    generation_input.employees,
+                    generation_input.shifts,
+                    generation_input.constraints,
+                )
+                self.cache_result(generation_input, variant, result)
+            elif result is None and use_rolling_horizon(self.optimizer.config, generation_input.shifts):
+                result = solve_rolling(
+                    self.optimizer.config,
+                    generation_input.employees,
+                    generation_input.shifts,
+                    generation_input.constraints,
+                    existing_assignments=existing_assignments,
+                    minimal_change_weight=self.optimizer.config.get("minimal_change_weight", 0) if existing_assignments else 0,
+                )
+                self.cache_result(generation_input, variant, result)
+            elif result is None:
+                result = self.optimizer.generate_schedule(
+                    employees=generation_input.employees,
+                    shifts=generation_input.shifts,
+                    constraints=generation_input.constraints,
+                    existing_assignments=existing_assignments,
+                    minimal_change_weight=self.optimizer.config.get("minimal_change_weight", 0) if existing_assignments else 0,
+                    instance=generation_input.instance,
+                )
+                self.cache_result(generation_input, variant, result)
+
+            return await self.persist_result(db, result, generation_input)
+
+        except Exception as e:
+            logger.error(f"Error generating schedule: {e}", exc_info=True)
+            return {"status": "error", "message": f"Schedule generation failed: {str(e)}", "schedule": []}
+
+    async def load_generation_input(
+        self, db: AsyncSession, start_date: date, end_date: date
+    ) -> Tuple[Optional[GenerationInput], Optional[Dict[str, Any]]]:
+        """
+        Load and convert everything the solver needs for a date range.
+
+        Returns:
+            Tuple of (generation input, None) on success or (None, error result)
+        """
+        timer = PhaseTimer()
+
+        # Fetch active employees from database
+        with timer.phase("fetch_employees"):
             employees_data = await self._fetch_employees(db)
-            if not employees_data:
-                return {"status": "error", "message": "No active employees found", "schedule": []}
+        if not employees_data:
+            return None, {"status": "error", "message": "No active employees found", "schedule": []}
 
-            # Convert DB employees to solver Employee objects
+        # Convert DB employees to solver Employee objects
+        with timer.phase("convert_employees"):
             employees = self._convert_employees(employees_data)
 
-            # Fetch shift templates from database
+        # Fetch shift templates from database
+        with timer.phase("fetch_shifts"):
             shifts_data = await self._fetch_shifts(db)
-            if not shifts_data:
-                return {"status": "error", "message": "No shift templates found", "schedule": []}
+        if not shifts_data:
+            return None, {"status": "error", "message": "No shift templates found", "schedule": []}
 
-            # Generate shifts for date range
+        # Generate shifts for date range
+        with timer.phase("generate_shifts"):
             shifts = self._generate_shifts_for_dates(shifts_data, start_date, end_date)
-            if not shifts:
-                return {"status": "error", "message": "No shifts generated for date range", "schedule": []}
+        if not shifts:
+            return None, {"status": "error", "message": "No shifts generated for date range", "schedule": []}
 
-            # Fetch rules and convert to constraints
+        # Fetch rules and convert to constraints
+        with timer.phase("fetch_rules"):
             custom_constraints = await self._fetch_constraints(db)
 
-            # Run constraint solver
-            logger.info(
-                f"Generating schedule: {len(employees)} employees, {len(shifts)} shifts, {len(custom_constraints)} constraints"
-            )
+        logger.info(
+            f"Generating schedule: {len(employees)} employees, {len(shifts)} shifts, {len(custom_constraints)} constraints"
+        )
 
-            result = self.optimizer.generate_schedule(employees=employees, shifts=shifts, constraints=custom_constraints)
+        # Convert once to the compact form every model builder reads
+        with timer.phase("build_instance"):
+            instance = SolverInstance(employees, shifts)
 
-            # If successful, save to database
-            if result["status"] in ["optimal", "feasible"]:
-                saved_count = await self._save_schedule_to_db(db, result["schedule"], employees_data)
-                result["saved_assignments"] = saved_count
-                result["message"] = f"Generated {saved_count} schedule assignments"
+        return GenerationInput(employees_data, employees, shifts, custom_constraints, instance, timer), None
 
-            return result
+    def get_cached_result(
+        self, generation_input: GenerationInput, variant: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a solver result for an identical instance.
 
-        except Exception as e:
-            logger.error(f"Error generating schedule: {e}", exc_info=True)
-            return {"status": "error", "message": f"Schedule generation failed: {str(e)}", "schedule": []}
+        Results are keyed by a fingerprint of the employees, shift instances,
+        rules and solver config; ``variant`` adds any other solve options.
+        """
+        cached = get_schedule_cache().get_schedule(
+            generation_input.employees,
+            generation_input.shifts,
+            generation_input.constraints,
+            config={**self.optimizer.config, **(variant or {})},
+        )
+        if cached is None:
+            return None
+
+        logger.info("Reusing cached solver result for identical schedule instance")
+        result = copy.deepcopy(cached)
+        result.setdefault("statistics", {})["cache_hit"] = True
+        # Phase timings belong to the run that produced the result
+        result["statistics"].pop("phases", None)
+        return result
+
+    def cache_result(self, generation_input: GenerationInput, variant: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        """Store a successful solver result under the instance fingerprint."""
+        if result["status"] not in ["optimal", "feasible"]:
+            return
+
+        get_schedule_cache().set_schedule(
+            generation_input.employees,
+            generation_input.shifts,
+            generation_input.constraints,
+            copy.deepcopy(result),
+            ttl=self.optimizer.config.get("result_cache_ttl", 1800),
+            config={**self.optimizer.config, **(variant or {})},
+        )
 
-    async def optimize_schedule(self, db: AsyncSession, schedule_ids: List[int]) -> Dict[str, Any]:
+    async def persist_result(
+        self, db: AsyncSession, result: Dict[str, Any], generation_input: GenerationInput
+    ) -> Dict[str, Any]:
+        """
+        Save a successful solver result to the database.
+
+        Also merges the solver's phase timings with those of loading and saving
+        into ``statistics["phases"]`` and records them as metrics.
+        """
+        timer = generation_input.timer
+        statistics = result.setdefault("statistics", {})
+        timer.update(statistics.get("phases", {}))
+
+        if result["status"] in ["optimal", "feasible"]:
+            with timer.phase("save_schedule"):
+                saved_count = await self._save_schedule_to_db(db, result["schedule"], generation_input.employees_data)
+            result["saved_assignments"] = saved_count
+            result["message"] = f"Generated {saved_count} schedule assignments"
+
+        statistics["phases"] = timer.as_dict()
+        record_generation(statistics["phases"], statistics)
+        return result
+
+    async def optimize_schedule(
+        self, db: AsyncSession, schedule_ids: List[int], in_background: bool = False
+    ) -> Dict[str, Any]:
         """
         Optimize existing schedule assignments.
 
         Args:
             db: Database session
             schedule_ids: List of schedule IDs to optimize (Schedule container IDs)
+            in_background: Solve as a generation job in the worker pool (see
+                services.schedule_jobs) instead of on the event loop
 
         Returns:
             Dict containing optimization results
@@ -154,12 +358,19 @@ class ScheduleGenerationService:
             start_date = min(s.week_start for s in schedules)
             end_date = max(s.week_end for s in schedules)
 
-            # Re-generate with optimization
-            result = await self.generate_schedule(db, start_date, end_date)
+            # Re-optimize starting from the current plan
+            existing = self._existing_assignment_keys(schedules)
+            if in_background:
+                from .schedule_jobs import schedule_job_manager
+
+                result = await schedule_job_manager.run(start_date, end_date, existing_assignments=existing)
+            else:
+                result = await self.generate_schedule(db, start_date, end_date, existing_assignments=existing)
 
             if result["status"] in ["optimal", "feasible"]:
                 # Calculate improvements
                 improvements = await self._calculate_improvements(db, schedules, result["schedule"])
+                improvements.update(self._assignment_diff(existing, result["schedule"]))
                 result["improvements"] = improvements
 
             return result
@@ -168,6 +379,133 @@ class ScheduleGenerationService:
             logger.error(f"Error optimizing schedule: {e}", exc_info=True)
             return {"status": "error", "message": f"Optimization failed: {str(e)}", "improvements": {}}
 
+    async def repair_assignment(self, db: AsyncSession, assignment_id: int) -> Dict[str, Any]:
+        """
+        Refill a shift after an employee calls out of an assignment.
+
+        Only the neighborhood of the affected shift is re-solved (see
+        ScheduleOptimizer.repair_schedule). The patch is applied inside the
+        session's transaction and every added assignment is checked with
+        conflict_detection.validate_employee_assignment; it is only committed
+        when no critical or high severity conflicts are found.
+
+        Args:
+            db: Database session
+            assignment_id: Assignment of the employee who called out
+
+        Returns:
+            Dict containing the applied changes or the blocking conflicts
+        """
+        from sqlalchemy.orm import selectinload
+
+        try:
+            query = (
+                select(DBScheduleAssignment)
+                .where(DBScheduleAssignment.id == assignment_id)
+                .options(
+                    selectinload(DBScheduleAssignment.shift),
+                    selectinload(DBScheduleAssignment.schedule)
+                    .selectinload(DBSchedule.assignments)
+                    .selectinload(DBScheduleAssignment.shift),
+                )
+            )
+            result = await db.execute(query)
+            called_out = result.scalar_one_or_none()
+
+            if not called_out or not called_out.shift:
+                return {"status": "error", "message": f"Assignment {assignment_id} not found", "added": [], "removed": []}
+
+            schedule = called_out.schedule
+            generation_input, error = await self.load_generation_input(db, schedule.week_start, schedule.week_end)
+            if error:
+                return error
+
+            result = self.optimizer.repair_schedule(
+                employees=generation_input.employees,
+                shifts=generation_input.shifts,
+                current_assignments=self._existing_assignment_keys([schedule]),
+                affected_shift_id=f"{called_out.shift_id}_{called_out.shift.date.isoformat()}",
+                unavailable_employee_ids=[str(called_out.employee_id)],
+            )
+
+            if result["status"] not in ["optimal", "feasible"]:
+                return result
+
+            conflicts = await self._apply_repair(db, schedule, called_out, result)
+            if conflicts:
+                await db.rollback()
+                result["status"] = "rejected"
+                result["conflicts"] = conflicts
+                result["message"] = f"Repair rejected: {len(conflicts)} blocking conflicts"
+                return result
+
+            await db.commit()
+            result["conflicts"] = []
+            result["message"] = f"Repaired with {len(result['added'])} added and {len(result['removed'])} removed assignments"
+            return result
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error repairing assignment {assignment_id}: {e}", exc_info=True)
+            return {"status": "error", "message": f"Repair failed: {str(e)}", "added": [], "removed": []}
+
+    async def _apply_repair(
+        self, db: AsyncSession, schedule: DBSchedule, called_out: DBScheduleAssignment, repair: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Stage a repair patch in the current transaction and validate it.
+
+        Removals are flushed first so the conflict checks see the patched plan;
+        each addition is validated before it is staged, so additions are also
+        checked against each other.
+
+        Returns:
+            Blocking (critical or high severity) conflicts; empty if the patch is valid
+        """
+        from .conflict_detection import ConflictSeverity, validate_employee_assignment
+
+        rows = {(str(a.employee_id), f"{a.shift_id}_{a.shift.date.isoformat()}"): a for a in schedule.assignments if a.shift}
+
+        for change in repair["removed"]:
+            assignment = rows.get((change["employee_id"], change["shift_id"]))
+            if assignment is None:
+                continue
+            if assignment.id == called_out.id:
+                assignment.status = "declined"
+                assignment.notes = "Called out; shift refilled by schedule repair"
+            else:
+                assignment.status = "cancelled"
+                assignment.notes = "Moved by schedule repair"
+        await db.flush()
+
+        blocking = []
+        for change in repair["added"]:
+            employee_id = int(change["employee_id"])
+            shift_id = int(change["shift_id"].split("_")[0])
+
+            for conflict in await validate_employee_assignment(db, employee_id, shift_id):
+                if conflict.get("severity") in [ConflictSeverity.CRITICAL, ConflictSeverity.HIGH]:
+                    conflict["employee_id"] = employee_id
+                    conflict["shift_id"] = shift_id
+                    blocking.append(conflict)
+
+            # The unique (schedule, employee, shift) row may already exist from an earlier plan
+            assignment = rows.get((change["employee_id"], change["shift_id"]))
+            if assignment is None:
+                assignment = DBScheduleAssignment(
+                    schedule_id=schedule.id,
+                    employee_id=employee_id,
+                    shift_id=shift_id,
+                    priority=1,
+                    auto_assigned=True,
+                )
+                db.add(assignment)
+            assignment.status = "assigned"
+            assignment.notes = "Assigned by schedule repair"
+            await db.flush()
+
+        return blocking
+
     async def check_conflicts(self, db: AsyncSession, start_date: date, end_date: date) -> Dict[str, Any]:
         """
         Check for conflicts in proposed schedule.
@@ -199,38 +537,15 @@ class ScheduleGenerationService:
         result = await db.execute(query)
         assignments = result.scalars().all()
 
-        # Group assignments by employee to check for conflicts
+        # Sweep each employee's shifts in start order for overlaps, short rest and long runs of days
         employee_assignments = {}
         for assignment in assignments:
-            emp_id = assignment.employee_id
-            if emp_id not in employee_assignments:
-                employee_assignments[emp_id] = []
-            employee_assignments[emp_id].append(assignment)
+            employee_assignments.setdefault(assignment.employee_id, []).append(assignment)
 
-        # Check for double bookings and time conflicts
+        min_rest = int((self.optimizer.config.get("min_rest_hours") or 0) * 60)
+        max_consecutive = self.optimizer.config.get("max_consecutive_days")
         for emp_id, emp_assignments in employee_assignments.items():
-            for i, assignment1 in enumerate(emp_assignments):
-                for assignment2 in emp_assignments[i + 1 :]:
-                    shift1 = assignment1.shift
-                    shift2 = assignment2.shift
-
-                    # Check if shifts are on the same date
-                    if shift1.date == shift2.date:
-                        # Check for time overlap
-                        if shift1.start_time < shift2.end_time and shift1.end_time > shift2.start_time:
-                            conflicts.append(
-                                {
-                                    "type": "double_booking",
-                                    "employee_id": emp_id,
-                                    "employee_name": assignment1.employee.name,
-                                    "date": shift1.date.isoformat(),
-                                    "assignment_ids": [assignment1.id, assignment2.id],
-                                    "shift_times": [
-                                        f"{shift1.start_time}-{shift1.end_time}",
-                                        f"{shift2.start_time}-{shift2.end_time}",
-                                    ],
-                                }
-                            )
+            conflicts.extend(self._employee_conflicts(emp_id, emp_assignments, start_date, min_rest, max_consecutive))
 
         # Check qualification mismatches
         for assignment in assignments:
@@ -254,6 +569,74 @@ class ScheduleGenerationService:
 
         return {"conflicts": conflicts, "conflict_count": len(conflicts)}
 
+    def _employee_conflicts(
+        self,
+        emp_id: int,
+        assignments: List[DBScheduleAssignment],
+        horizon_start: date,
+        min_rest: int,
+        max_consecutive: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """
+        Overlap, rest and consecutive-day conflicts among one employee's assignments.
+
+        Shifts are placed on an absolute minute axis (shifts ending before they
+        start run past midnight) and swept once in start order, so the cost is
+        O(n log n + k) rather than a comparison of every pair.
+        """
+        by_id = {assignment.id: assignment for assignment in assignments}
+        intervals = []
+        for assignment in assignments:
+            shift = assignment.shift
+            start, end = absolute_interval(
+                shift.date,
+                shift.start_time.hour * 60 + shift.start_time.minute,
+                shift.end_time.hour * 60 + shift.end_time.minute,
+                horizon_start,
+            )
+            intervals.append((assignment.id, start, end))
+
+        conflicts = []
+        for first_id, second_id, gap in sweep_conflicts(intervals, min_rest):
+            first, second = by_id[first_id], by_id[second_id]
+            conflict = {
+                "type": "double_booking" if gap < 0 else "insufficient_rest",
+                "employee_id": emp_id,
+                "employee_name": first.employee.name,
+                "date": second.shift.date.isoformat(),
+                "assignment_ids": [first.id, second.id],
+                "shift_times": [
+                    f"{first.shift.start_time}-{first.shift.end_time}",
+                    f"{second.shift.start_time}-{second.shift.end_time}",
+                ],
+            }
+            if gap >= 0:
+                conflict["rest_hours"] = round(gap / 60, 2)
+                conflict["min_rest_hours"] = min_rest / 60
+            conflicts.append(conflict)
+
+        if max_consecutive:
+            days = sorted({assignment.shift.date for assignment in assignments})
+            run_start = 0
+            for index in range(1, len(days) + 1):
+                if index < len(days) and days[index] - days[index - 1] == timedelta(days=1):
+                    continue
+                if index - run_start > max_consecutive:
+                    conflicts.append(
+                        {
+                            "type": "consecutive_days",
+                            "employee_id": emp_id,
+                            "employee_name": assignments[0].employee.name,
+                            "date": days[run_start].isoformat(),
+                            "end_date": days[index - 1].isoformat(),
+                            "days": index - run_start,
+                            "max_consecutive_days": max_consecutive,
+                        }
+                    )
+                run_start = index
+
+        return conflicts
+
     async def _fetch_employees(self, db: AsyncSession) -> List[DBEmployee]:
         """Fetch active employees from database."""
         query = select(DBEmployee).where(DBEmployee.is_active == True)
@@ -267,19 +650,12 @@ class ScheduleGenerationService:
         return result.scalars().all()
 
     async def _fetch_constraints(self, db: AsyncSession) -> List[SchedulingConstraint]:
-        """Fetch scheduling rules and convert to constraints."""
+        """Fetch active scheduling rules as compiled constraints (cached per rule version)."""
         query = select(DBRule).where(DBRule.active == True)
         result = await db.execute(query)
         rules = result.scalars().all()
 
-        constraints = []
-        for rule in rules:
-            constraint = SchedulingConstraint(
-                id=str(rule.id), name=rule.original_text, type=rule.rule_type, parameters=rule.constraints, priority=rule.priority
-            )
-            constraints.append(constraint)
-
-        return constraints
+        return [rule_compiler.compile(rule) for rule in rules]
 
     def _convert_employees(self, db_employees: List[DBEmployee]) -> List[Employee]:
         """Convert database Employee models to solver Employee objects."""
@@ -306,6 +682,7 @@ class ScheduleGenerationService:
                 availability=availability,
                 max_hours_per_week=db_emp.max_hours_per_week or 40,
                 min_hours_per_week=0,
+                department_id=db_emp.department_id,
             )
             employees.append(emp)
 
@@ -338,6 +715,7 @@ class ScheduleGenerationService:
                     min_employees=template.required_staff,
                     max_employees=template.required_staff + 2,  # Allow some flexibility
                     shift_type=shift_type,
+                    department_id=template.department_id,
                 )
                 shifts.append(shift)
 
@@ -352,73 +730,87 @@ class ScheduleGenerationService:
         Save generated schedule to database.
 
         Creates Schedule containers for each week and ScheduleAssignment records
-        linking employees to shifts within those schedules.
-        """
-        from sqlalchemy.orm import selectinload
-
-        saved_count = 0
+        linking employees to shifts within those schedules. Assignments are
+        written in chunks with INSERT ... ON CONFLICT DO NOTHING on
+        (schedule_id, employee_id, shift_id), so existing ones are kept as is.
 
+        Returns:
+            Number of assignments actually inserted
+        """
         # Create employee ID map
         emp_map = {str(emp.id): emp.id for emp in employees_lookup}
 
-        # Cache schedules by week to avoid recreating
-        schedules_cache = {}
-
+        # Solver shift IDs are "<template id>_<date>"
+        parsed = []
         for shift_assignment in schedule_data:
-            # Parse shift ID to get template ID and date
-            shift_id_parts = shift_assignment["shift_id"].split("_")
-            template_id = int(shift_id_parts[0])
+            template_id = int(shift_assignment["shift_id"].split("_")[0])
             shift_date = date.fromisoformat(shift_assignment["date"])
+            parsed.append((template_id, shift_date - timedelta(days=shift_date.weekday()), shift_assignment))
 
-            # Get or create Schedule for this week
-            week_start = shift_date - timedelta(days=shift_date.weekday())
-            week_key = week_start.isoformat()
-
-            if week_key not in schedules_cache:
-                schedule = await self._get_or_create_schedule_for_week(db, shift_date, created_by=1)
-                schedules_cache[week_key] = schedule
-            schedule = schedules_cache[week_key]
+        schedule_ids = await self._get_or_create_schedules_for_weeks(
+            db, {week_start for _, week_start, _ in parsed}, created_by=1
+        )
 
-            # Create assignment for each assigned employee
+        now = datetime.utcnow()
+        rows = {}
+        for template_id, week_start, shift_assignment in parsed:
             for assigned_emp in shift_assignment["assigned_employees"]:
                 emp_id = emp_map.get(assigned_emp["id"])
                 if emp_id:
-                    # Check if assignment already exists
-                    query = (
-                        select(DBScheduleAssignment)
-                        .where(
-                            and_(
-                                DBScheduleAssignment.schedule_id == schedule.id,
-                                DBScheduleAssignment.employee_id == emp_id,
-                                DBScheduleAssignment.shift_id == template_id,
-                            )
-                        )
-                        .options(
-                            selectinload(DBScheduleAssignment.schedule),
-                            selectinload(DBScheduleAssignment.employee),
-                            selectinload(DBScheduleAssignment.shift),
-                        )
+                    key = (schedule_ids[week_start], emp_id, template_id)
+                    rows.setdefault(
+                        key,
+                        {
+                            "schedule_id": key[0],
+                            "employee_id": emp_id,
+                            "shift_id": template_id,
+                            "status": "assigned",
+                            "priority": 1,
+                            "auto_assigned": True,  # Generated by AI
+                            "conflicts_resolved": False,
+                            "notes": "Auto-generated by AI schedule optimizer",
+                            "assigned_at": now,
+                            "created_at": now,
+                        },
                     )
-                    result = await db.execute(query)
-                    existing = result.scalar_one_or_none()
-
-                    if not existing:
-                        # Create new assignment
-                        assignment = DBScheduleAssignment(
-                            schedule_id=schedule.id,
-                            employee_id=emp_id,
-                            shift_id=template_id,
-                            status="assigned",
-                            priority=1,
-                            auto_assigned=True,  # Generated by AI
-                            notes="Auto-generated by AI schedule optimizer",
-                        )
-                        db.add(assignment)
-                        saved_count += 1
+
+        saved_count = await BatchOperations.bulk_upsert(
+            db,
+            DBScheduleAssignment,
+            list(rows.values()),
+            constraint_columns=["schedule_id", "employee_id", "shift_id"],
+            update_columns=[],
+            commit=False,
+        )
+        assignment_index.invalidate_on_commit(db, {row["employee_id"] for row in rows.values()})
 
         await db.commit()
         return saved_count
 
+    def _existing_assignment_keys(self, schedules: List[DBSchedule]) -> Set[Tuple[str, str]]:
+        """
+        Map active assignments to solver (employee_id, shift_id) keys.
+
+        Solver shift IDs are "<template id>_<date>" (see _generate_shifts_for_dates),
+        so each assignment is keyed by its shift's own date.
+        """
+        keys = set()
+        for schedule in schedules:
+            for assignment in schedule.assignments:
+                if assignment.status in ["assigned", "confirmed"] and assignment.shift:
+                    shift_key = f"{assignment.shift_id}_{assignment.shift.date.isoformat()}"
+                    keys.add((str(assignment.employee_id), shift_key))
+        return keys
+
+    def _assignment_diff(self, existing: Set[Tuple[str, str]], new_schedule: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Count assignments kept, added and removed relative to the current plan."""
+        new = {(emp["id"], shift["shift_id"]) for shift in new_schedule for emp in shift["assigned_employees"]}
+        return {
+            "assignments_kept": len(existing & new),
+            "assignments_added": len(new - existing),
+            "assignments_removed": len(existing - new),
+        }
+
     async def _calculate_improvements(
         self, db: AsyncSession, old_schedules: List[DBSchedule], new_schedule: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
@@ -449,3 +841,13 @@ class ScheduleGenerationService:
 
 # Singleton instance
 schedule_service = ScheduleGenerationService()
+
+
+@event.listens_for(DBEmployee, "after_update")
+def _invalidate_cached_results(mapper, connection, target):
+    """Drop cached solver results covering an employee whose solver inputs changed."""
+    state = inspect(target)
+    changed = [name for name in SOLVER_EMPLOYEE_FIELDS if name in state.attrs and state.attrs[name].history.has_changes()]
+    if changed:
+        count = get_schedule_cache().invalidate_employee_schedules(str(target.id))
+        logger.debug(f"Employee {target.id} changed {changed}; invalidated {count} cached schedule results")
@@ -0,0 +1,128 @@
+"""
+Schedule Generation Metrics
+Per-phase timings and solver model statistics, exported as Prometheus histograms.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Phases of one generation run, in execution order
+GENERATION_PHASES = [
+    "fetch_employees",
+    "convert_employees",
+    "fetch_shifts",
+    "generate_shifts",
+    "fetch_rules",
+    "build_instance",
+    "build_model",
+    "solve",
+    "stitch",
+    "save_schedule",
+]
+
+if PROMETHEUS_AVAILABLE:
+    PHASE_SECONDS = Histogram(
+        "schedule_generation_phase_seconds",
+        "Time spent in each phase of schedule generation",
+        ["phase"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+    )
+    MODEL_SIZE = Histogram(
+        "schedule_solver_model_size",
+        "Size of the CP-SAT model by kind (variables, constraints, objective_terms)",
+        ["kind"],
+        buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    )
+    SEARCH_EFFORT = Histogram(
+        "schedule_solver_search_effort",
+        "CP-SAT search effort by kind (conflicts, branches)",
+        ["kind"],
+        buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+    )
+    OPTIMALITY_GAP = Histogram(
+        "schedule_solver_gap",
+        "Relative gap between the objective and the best bound when the solver stopped",
+        buckets=(0, 0.001, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1),
+    )
+
+# Summary of the most recent generation, for the detailed health check
+_last_generation: Dict[str, Any] = {}
+
+
+class PhaseTimer:
+    """Collect wall-clock seconds per generation phase."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated phases accumulate."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def update(self, phases: Dict[str, float]):
+        """Merge phases timed elsewhere, e.g. by the optimizer."""
+        for name, seconds in phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Phases in execution order, rounded to milliseconds."""
+        ordered = sorted(self.phases, key=lambda name: (GENERATION_PHASES + [name]).index(name))
+        return {name: round(self.phases[name], 3) for name in ordered}
+
+
+def record_generation(phases: Dict[str, float], statistics: Optional[Dict[str, Any]] = None):
+    """Observe one generation run in the histograms and remember it for the health check."""
+    statistics = statistics or {}
+
+    if PROMETHEUS_AVAILABLE:
+        try:
+            for name, seconds in phases.items():
+                PHASE_SECONDS.labels(phase=name).observe(seconds)
+            for kind in ("variables", "constraints", "objective_terms"):
+                if statistics.get(f"num_{kind}") is not None:
+                    MODEL_SIZE.labels(kind=kind).observe(statistics[f"num_{kind}"])
+            for kind in ("conflicts", "branches"):
+                if statistics.get(kind) is not None:
+                    SEARCH_EFFORT.labels(kind=kind).observe(statistics[kind])
+            if statistics.get("gap") is not None:
+                OPTIMALITY_GAP.observe(statistics["gap"])
+        except Exception as e:
+            logger.error(f"Error recording schedule generation metrics: {e}")
+
+    _last_generation.clear()
+    _last_generation.update(
+        {
+            "timestamp": datetime.utcnow().isoformat(),
+            "phases": dict(phases),
+            **{key: value for key, value in statistics.items() if key != "phases"},
+        }
+    )
+
+
+def get_last_generation() -> Dict[str, Any]:
+    """Phases and statistics of the most recent generation run."""
+    return dict(_last_generation)
+
+
+def metrics_response() -> tuple:
+    """Prometheus exposition payload and content type."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client not installed\n", "text/plain; charset=utf-8"
+    return generate_latest(), CONTENT_TYPE_LATEST
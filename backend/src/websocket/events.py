@@ -27,6 +27,8 @@ class EventType(str, Enum):
     SCHEDULE_UPDATED = "schedule_updated"
     SCHEDULE_DELETED = "schedule_deleted"
     SCHEDULE_PUBLISHED = "schedule_published"
+    SCHEDULE_GENERATION_INCUMBENT = "schedule_generation_incumbent"
+    SCHEDULE_GENERATION_FINISHED = "schedule_generation_finished"
 
     # Employee events
     EMPLOYEE_STATUS_CHANGED = "employee_status_changed"
@@ -186,6 +188,33 @@ class ScheduleEvents:
             },
         )
 
+    @staticmethod
+    async def generation_incumbent(job_id: str, incumbent: Dict[str, Any]):
+        """Emit an improving solution found while a generation job is solving"""
+        await manager.broadcast_to_room(
+            "schedules",
+            {
+                "type": EventType.SCHEDULE_GENERATION_INCUMBENT,
+                "job_id": job_id,
+                "incumbent": incumbent,
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+
+    @staticmethod
+    async def generation_finished(job_id: str, status: str, message: Optional[str]):
+        """Emit generation job completion, failure or cancellation"""
+        await manager.broadcast_to_room(
+            "schedules",
+            {
+                "type": EventType.SCHEDULE_GENERATION_FINISHED,
+                "job_id": job_id,
+                "status": status,
+                "message": message,
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+
 
 class EmployeeEvents:
     """Employee-related event emitters"""
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+from datetime import date, time, timedelta
+
+import pytest
+
+from src.scheduler.constraint_solver import Shift
+
+MONDAY = date(2024, 1, 1)
+
+
+@pytest.fixture
+def make_shift():
+    """Factory of shifts ``day`` days after Monday 2024-01-01 (solver Shift unless ``model`` is given)."""
+
+    def make(shift_id, day=0, start=time(9, 0), end=time(17, 0), model=Shift, **fields):
+        return model(id=shift_id, date=MONDAY + timedelta(days=day), start_time=start, end_time=end, **fields)
+
+    return make
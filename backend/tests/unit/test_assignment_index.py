@@ -0,0 +1,160 @@
+"""
+Unit tests for the in-process assignment index used by single-assignment validation.
+"""
+
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.models import Employee, Shift
+from src.services import conflict_detection
+from src.services.conflict_detection import (
+    _CHANGES_KEY,
+    AssignmentIndex,
+    ConflictType,
+    _TimelineShift,
+    validate_employee_assignment,
+)
+
+ALWAYS = {day: {"available": True} for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]}
+MONDAY = date(2024, 1, 1)
+
+
+class IndexSession:
+    """Async session stand-in serving identity-map gets and the timeline rows."""
+
+    def __init__(self, rows=(), objects=()):
+        self.rows = list(rows)
+        self.objects = {(type(obj), obj.id): obj for obj in objects}
+        self.info = {}
+        self.statements = []
+
+    async def get(self, model, ident):
+        return self.objects.get((model, ident))
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: list(self.rows))
+
+
+class SharedCache:
+    """Redis cache stand-in shared by the indexes of several worker processes."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+def _entry(assignment_id, shift_id, start, end):
+    return _TimelineShift(shift_id, MONDAY, time(start), time(end), assignment_id, end - start)
+
+
+@pytest.mark.asyncio
+async def test_timeline_is_loaded_once_and_kept_current():
+    index = AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))])
+
+    first = await index.timeline(session, 1, MONDAY)
+    again = await index.timeline(session, 1, MONDAY)
+    index.apply([("add", 1, _entry(101, 11, 18, 22)), ("discard", 1, 100)])
+
+    assert first is again
+    assert len(session.statements) == 1
+    assert (index.hits, index.misses) == (1, 1)
+    assert list(first.by_assignment) == [101]
+    assert first.daily_hours[MONDAY] == 4
+
+
+@pytest.mark.asyncio
+async def test_commit_during_a_load_is_not_overwritten():
+    index = AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))])
+
+    async def execute(stmt):
+        index.apply([("discard", 1, 100)])  # Another session commits while the rows are read
+        return SimpleNamespace(all=lambda: list(session.rows))
+
+    session.execute = execute
+    await index.timeline(session, 1, MONDAY)
+
+    assert index._entries == {}
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_changes_are_read_in_the_transaction_and_not_cached():
+    index = AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))])
+    session.info[_CHANGES_KEY] = [("add", 1, _entry(100, 10, 9, 17))]
+
+    timeline = await index.timeline(session, 1, MONDAY)
+
+    assert list(timeline.by_assignment) == [100]
+    assert index._entries == {}
+
+
+@pytest.mark.asyncio
+async def test_shift_change_drops_every_timeline_with_the_shift():
+    index = AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17)), (2, 200, 20, MONDAY, time(9), time(17))])
+    await index.timelines(session, {1, 2}, MONDAY, MONDAY)
+
+    index.apply([("shift", None, 10)])
+
+    assert set(index._entries) == {2}
+
+
+@pytest.mark.asyncio
+async def test_commits_in_another_process_make_the_timeline_reload(monkeypatch):
+    monkeypatch.setattr(conflict_detection, "cache", SharedCache())
+    worker, other = AssignmentIndex(), AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))])
+    await worker.timeline(session, 1, MONDAY)
+
+    other.apply([("discard", 1, 100)])
+    session.rows = []
+    after_assignment = await worker.timeline(session, 1, MONDAY)
+    other.apply([("shift", None, 10)])
+    after_shift = await worker.timeline(session, 1, MONDAY)
+
+    assert len(session.statements) == 3
+    assert after_assignment.by_assignment == {} and after_shift is not after_assignment
+
+
+@pytest.mark.asyncio
+async def test_own_commits_keep_the_timeline_cached_across_processes(monkeypatch):
+    monkeypatch.setattr(conflict_detection, "cache", SharedCache())
+    worker = AssignmentIndex()
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))])
+    cached = await worker.timeline(session, 1, MONDAY)
+
+    worker.apply([("add", 1, _entry(101, 11, 18, 22)), ("shift", None, 99)])
+    again = await worker.timeline(session, 1, MONDAY)
+
+    assert again is cached and len(session.statements) == 1
+    assert list(again.by_assignment) == [100, 101]
+
+
+@pytest.mark.asyncio
+async def test_validation_of_a_cached_employee_needs_no_queries(monkeypatch):
+    index = AssignmentIndex()
+    monkeypatch.setattr(conflict_detection, "assignment_index", index)
+    employee = Employee(id=1, first_name="A", last_name="B", availability=ALWAYS)
+    shift = Shift(id=11, date=MONDAY, start_time=time(12), end_time=time(20), required_staff=1)
+    session = IndexSession(rows=[(1, 100, 10, MONDAY, time(9), time(17))], objects=[employee, shift])
+    await index.timeline(session, 1, MONDAY)
+    session.statements.clear()
+
+    conflicts = await validate_employee_assignment(session, 1, 11)
+    moved = await validate_employee_assignment(session, 1, 11, exclude_assignment_id=100)
+
+    assert session.statements == []
+    assert [c["conflict_type"] for c in conflicts] == [ConflictType.OVERLAPPING_SHIFTS, ConflictType.EXCESSIVE_HOURS]
+    assert moved == []
@@ -0,0 +1,103 @@
+"""
+Unit tests for the batched department conflict report.
+"""
+
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.models import Employee, ScheduleAssignment, Shift
+from src.services.conflict_detection import ConflictType, generate_conflict_report
+
+ALWAYS = {day: {"available": True} for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]}
+
+
+class ReportSession:
+    """Async session stand-in returning the department shifts, then the timeline rows."""
+
+    def __init__(self, shifts, timeline_rows):
+        self.results = [
+            SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: shifts)),
+            SimpleNamespace(all=lambda: timeline_rows),
+        ]
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return self.results[len(self.statements) - 1]
+
+
+def _employee(employee_id):
+    return Employee(id=employee_id, first_name="E", last_name=str(employee_id), availability=ALWAYS)
+
+
+def _assign(assignment_id, employee, shift, status="assigned"):
+    assignment = ScheduleAssignment(id=assignment_id, employee_id=employee.id, shift_id=shift.id, status=status)
+    assignment.employee = employee
+    shift.schedule_assignments.append(assignment)
+    return (employee.id, assignment_id, shift.id, shift.date, shift.start_time, shift.end_time)
+
+
+@pytest.mark.asyncio
+async def test_report_runs_all_checks_from_two_queries(make_shift):
+    first, second, third = _employee(1), _employee(2), _employee(3)
+    night = make_shift(10, 0, time(22, 0), time(6, 0), model=Shift, department_id=1, required_staff=1)
+    day = make_shift(11, 1, model=Shift, department_id=1, required_staff=3)
+    rows = [
+        _assign(100, first, night),
+        _assign(101, first, day),
+        _assign(102, second, day),
+        _assign(103, second, day),
+        _assign(104, third, night),
+    ]
+    # Third employee also works 40 hours elsewhere in the same week
+    rows.extend((3, 200 + index, 50 + index, date(2024, 1, 3 + index), time(8), time(16)) for index in range(5))
+    session = ReportSession([night, day], rows)
+
+    report = await generate_conflict_report(session, 1, date(2024, 1, 1), date(2024, 1, 2))
+
+    assert len(session.statements) == 2
+    conflicts = [c for level in report["conflicts_by_severity"].values() for c in level]
+    found = {(c["employee_id"], c["shift_id"], c["conflict_type"], c.get("period")) for c in conflicts}
+    assert found == {
+        (1, 10, ConflictType.INSUFFICIENT_REST, None),
+        (1, 11, ConflictType.INSUFFICIENT_REST, None),
+        (2, 11, ConflictType.DOUBLE_BOOKING, None),
+        (2, 11, ConflictType.OVERLAPPING_SHIFTS, None),
+        (2, 11, ConflictType.EXCESSIVE_HOURS, "daily"),
+        (3, 10, ConflictType.EXCESSIVE_HOURS, "weekly"),
+    }
+    # Each duplicate sees the other one, never itself; the single 8h assignments raise no hour conflicts
+    assert report["summary"]["total_conflicts"] == 9
+    assert [(c["shift_id"], c["conflict_type"]) for c in report["coverage_issues"]] == [(10, ConflictType.OVERSTAFFED)]
+
+
+@pytest.mark.asyncio
+async def test_report_without_assignments_skips_timeline_query(make_shift):
+    session = ReportSession([make_shift(10, model=Shift, department_id=1, required_staff=1)], [])
+
+    report = await generate_conflict_report(session, 1, date(2024, 1, 1), date(2024, 1, 7))
+
+    assert len(session.statements) == 1
+    assert report["coverage_issues"][0]["conflict_type"] == ConflictType.UNDERSTAFFED
+    assert report["summary"]["total_conflicts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_report_checks_and_counts_confirmed_assignments(make_shift):
+    first = _employee(1)
+    night = make_shift(10, 0, time(22, 0), time(6, 0), model=Shift, department_id=1, required_staff=1)
+    day = make_shift(11, 1, model=Shift, department_id=1, required_staff=1)
+    rows = [_assign(100, first, night, status="confirmed"), _assign(101, first, day)]
+    session = ReportSession([night, day], rows)
+
+    report = await generate_conflict_report(session, 1, date(2024, 1, 1), date(2024, 1, 2))
+
+    conflicts = [c for level in report["conflicts_by_severity"].values() for c in level]
+    assert {(c["shift_id"], c["conflict_type"]) for c in conflicts} == {
+        (10, ConflictType.INSUFFICIENT_REST),
+        (11, ConflictType.INSUFFICIENT_REST),
+    }
+    assert report["coverage_issues"] == []
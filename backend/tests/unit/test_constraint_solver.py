@@ -3,7 +3,7 @@ Unit tests for the Constraint Solver using Google OR-Tools.
 Tests schedule optimization with various constraints and objectives.
 """
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -516,3 +516,189 @@ class TestScheduleOptimizer:
 
         assert "assignments" in result
         assert len(result["assignments"]) == 0
+
+
+class TestSparseVariables:
+    """Test sparse decision variable creation from the eligibility index."""
+
+    @pytest.fixture
+    def employees(self):
+        return [
+            Employee(id="1", name="Qualified", qualifications=["rn"]),
+            Employee(id="2", name="Unqualified", qualifications=[]),
+            Employee(id="3", name="Weekends", availability={"Saturday": [(time(6, 0), time(22, 0))]}),
+        ]
+
+    @pytest.fixture
+    def shifts(self, make_shift):
+        return [
+            make_shift("rn_mon", 0, time(8, 0), time(16, 0), required_qualifications=["rn"]),
+            make_shift("any_mon", 0, time(8, 0), time(16, 0)),
+        ]
+
+    def test_sparse_mode_skips_ineligible_pairs(self, employees, shifts):
+        """Only eligible (employee, shift) pairs get a variable in sparse mode."""
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True})
+        optimizer.model = cp_model.CpModel()
+        optimizer._create_variables(employees, shifts)
+
+        assert set(optimizer.variables["assignments"]) == {("1", "rn_mon"), ("1", "any_mon"), ("2", "any_mon")}
+        assert [emp_id for emp_id, _ in optimizer.shift_vars["rn_mon"]] == ["1"]
+        assert optimizer.employee_vars["3"] == []
+
+    def test_dense_mode_creates_every_pair(self, employees, shifts):
+        """Dense mode keeps one variable per pair."""
+        optimizer = ScheduleOptimizer(config={"sparse_variables": False})
+        optimizer.model = cp_model.CpModel()
+        optimizer._create_variables(employees, shifts)
+
+        assert len(optimizer.variables["assignments"]) == len(employees) * len(shifts)
+
+    def test_hours_prefilter(self, make_shift):
+        """Shifts longer than an employee's weekly cap are never eligible."""
+        optimizer = ScheduleOptimizer()
+        employees = [Employee(id="1", name="Part time", max_hours_per_week=6)]
+        shifts = [make_shift("long", 0, time(8, 0), time(16, 0))]
+
+        eligibility = optimizer._build_eligibility_index(employees, shifts)
+
+        assert eligibility["long"] == set()
+
+    def test_sparse_and_dense_agree(self, employees, shifts):
+        """Both modes find the same feasible assignments."""
+        results = []
+        for sparse in (True, False):
+            optimizer = ScheduleOptimizer(config={"sparse_variables": sparse, "max_solve_time": 5})
+            result = optimizer.generate_schedule(employees, shifts)
+            assert result["status"] in ["optimal", "feasible"]
+            results.append({s["shift_id"]: {e["id"] for e in s["assigned_employees"]} for s in result["schedule"]})
+
+        assert results[0]["rn_mon"] == results[1]["rn_mon"] == {"1"}
+
+
+class TestRestPeriods:
+    """Test rest-period constraints built from the interval index."""
+
+    def test_short_rest_across_templates_is_infeasible_for_one_employee(self, make_shift):
+        """A closing shift can't be followed by any of several next-morning openers."""
+        employees = [Employee(id="1", name="Solo")]
+        shifts = [
+            make_shift("close", 0, time(15, 0), time(23, 0), max_employees=1),
+            make_shift("open_a", 1, time(5, 0), time(9, 0), max_employees=1),
+            make_shift("open_b", 1, time(6, 0), time(10, 0), max_employees=1),
+        ]
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True, "min_rest_hours": 8, "max_solve_time": 5})
+
+        result = optimizer.generate_schedule(employees, shifts)
+
+        assert result["status"] == "infeasible"
+
+
+class TestIncumbentCallback:
+    """Test streaming of improving solutions."""
+
+    def test_solution_callback_receives_incumbents(self, make_shift):
+        employees = [Employee(id=str(i), name=f"Emp {i}") for i in range(3)]
+        shifts = [make_shift(f"s{day}", day) for day in range(3)]
+        incumbents = []
+
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True, "max_solve_time": 5})
+        result = optimizer.generate_schedule(employees, shifts, solution_callback=incumbents.append)
+
+        assert result["status"] in ["optimal", "feasible"]
+        assert incumbents
+        first = incumbents[0]
+        assert first["solution"] == 1
+        assert first["removed"] == []
+        assert len(first["added"]) == first["assignment_count"]
+        assert {"objective", "best_bound", "gap", "elapsed"} <= set(first)
+
+
+class TestWarmStart:
+    """Test re-optimization from an existing plan."""
+
+    @pytest.fixture
+    def instance(self, make_shift):
+        employees = [Employee(id=str(i), name=f"Emp {i}") for i in range(4)]
+        shifts = [make_shift(f"s{day}", day, max_employees=1) for day in range(4)]
+        return employees, shifts
+
+    def test_minimal_change_keeps_current_plan(self, instance):
+        employees, shifts = instance
+        current = {("3", "s0"), ("2", "s1"), ("1", "s2"), ("0", "s3")}
+
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True, "max_solve_time": 5})
+        result = optimizer.generate_schedule(employees, shifts, existing_assignments=current, minimal_change_weight=50)
+
+        assigned = {(e["id"], s["shift_id"]) for s in result["schedule"] for e in s["assigned_employees"]}
+        assert assigned == current
+
+    def test_hints_added_for_every_variable(self, instance):
+        employees, shifts = instance
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True})
+        optimizer.model = cp_model.CpModel()
+        optimizer._create_variables(employees, shifts)
+        optimizer.existing_assignments = {("0", "s0")}
+
+        optimizer._add_solution_hints()
+
+        assert len(optimizer.model.Proto().solution_hint.vars) == len(optimizer.variables["assignments"])
+
+
+class TestRepairSchedule:
+    """Test neighborhood repair after a call-out."""
+
+    @pytest.fixture
+    def instance(self, make_shift):
+        employees = [
+            Employee(id="0", name="Emp 0", qualifications=["rn"]),
+            Employee(id="1", name="Emp 1", qualifications=["rn"], max_hours_per_week=8),
+            Employee(id="2", name="Emp 2", qualifications=["rn"]),
+            Employee(id="3", name="Emp 3"),
+        ]
+        shifts = [
+            make_shift("day0", 0, required_qualifications=["rn"], max_employees=1),
+            make_shift("night0", 0, time(20, 0), time(4, 0), max_employees=1),
+            make_shift("day1", 1, required_qualifications=["rn"], max_employees=1),
+            make_shift("day5", 5, max_employees=1),
+        ]
+        current = {("0", "day0"), ("3", "night0"), ("1", "day1"), ("2", "day5")}
+        return employees, shifts, current
+
+    def test_refills_called_out_shift(self, instance):
+        employees, shifts, current = instance
+        optimizer = ScheduleOptimizer(config={"min_rest_hours": 8})
+
+        result = optimizer.repair_schedule(employees, shifts, current, "day0", ["0"])
+
+        assert result["status"] == "optimal"
+        assert result["removed"] == [{"employee_id": "0", "shift_id": "day0"}]
+        # Emp 1's frozen day1 shift uses up their hours and Emp 3 lacks the qualification
+        assert result["added"] == [{"employee_id": "2", "shift_id": "day0"}]
+        assert result["unfilled"] == []
+
+    def test_shifts_outside_neighborhood_are_frozen(self, instance):
+        employees, shifts, current = instance
+        optimizer = ScheduleOptimizer(config={"min_rest_hours": 8})
+
+        result = optimizer.repair_schedule(employees, shifts, current, "day0", ["0"])
+
+        # day1 starts 16h after day0 ends, outside the 8h rest window
+        assert result["neighborhood"] == {"shifts": 2, "candidates": 2}
+        assert set(optimizer.shift_vars) == {"day0", "night0"}
+
+    def test_reports_unfilled_position(self, instance):
+        employees, shifts, current = instance
+        for emp in employees[1:]:
+            emp.qualifications = []
+        optimizer = ScheduleOptimizer(config={"min_rest_hours": 8})
+
+        result = optimizer.repair_schedule(employees, shifts, current, "day0", ["0"])
+
+        assert result["added"] == []
+        assert result["unfilled"] == [{"shift_id": "day0", "missing": 1}]
+
+    def test_unknown_shift(self, instance):
+        employees, shifts, current = instance
+        result = ScheduleOptimizer().repair_schedule(employees, shifts, current, "missing", ["0"])
+        assert result["status"] == "error"
@@ -0,0 +1,134 @@
+"""
+Unit tests for compiling stored rules into solver constraints.
+"""
+
+from datetime import datetime, time
+from types import SimpleNamespace
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer, ShiftType
+from src.scheduler.instance import SolverInstance
+from src.scheduler.rule_compiler import RuleCompiler, RuleTemplate, ShiftSelector, compile_templates
+
+
+def _rule(rule_id=1, rule_type="restriction", constraints=None, employee_id=None, strict=True, updated_at=None):
+    return SimpleNamespace(
+        id=rule_id,
+        rule_text=f"Rule {rule_id}",
+        rule_type=rule_type,
+        constraints=constraints or {},
+        employee_id=employee_id,
+        priority=5,
+        strict=strict,
+        updated_at=updated_at or datetime(2024, 1, 1),
+    )
+
+
+def _assigned(result):
+    return {(emp["id"], entry["shift_id"]) for entry in result["schedule"] for emp in entry["assigned_employees"]}
+
+
+class TestCompileTemplates:
+    """Test interpretation of rule payloads."""
+
+    def test_parser_payload_with_daily_hour_limit(self):
+        constraints = {
+            "days": [{"type": "day", "value": "weekend"}],
+            "hours": [{"type": "hours", "value": 6, "constraint": "max 6 hours per day"}],
+        }
+
+        (template,) = compile_templates("restriction", constraints)
+
+        assert (template.kind, template.limit, template.period) == ("max_hours", 6, "day")
+        assert template.selector.weekdays == {5, 6}
+
+    def test_restricting_action_forbids_selected_days(self):
+        constraints = {"type": "availability", "days": ["saturday", "sunday"], "action": "restrict"}
+
+        (template,) = compile_templates("availability", constraints)
+
+        assert template == RuleTemplate("forbid", ShiftSelector(weekdays=frozenset({5, 6})))
+
+    def test_availability_allows_only_selected_window(self):
+        (template,) = compile_templates("availability", {"times": ["9:00 am", "5 pm"], "shifts": ["morning"]})
+
+        assert template.kind == "only"
+        assert template.selector.window == (540, 1020)
+        assert template.selector.shift_types == {"morning"}
+
+    def test_requirement_hours_are_minimums_and_empty_payloads_compile_to_nothing(self):
+        (template,) = compile_templates("requirement", {"days": ["mon"], "hours": 8})
+
+        assert (template.kind, template.limit, template.selector.weekdays) == ("min_hours", 8, {0})
+        assert compile_templates("restriction", {}) == ()
+        assert compile_templates("qualification", {"days": ["monday"]}) == ()
+
+    def test_selector_window_overlaps_across_midnight(self, make_shift):
+        shifts = [
+            make_shift("mon_morning", 0, time(6, 0), time(14, 0), shift_type=ShiftType.MORNING),
+            make_shift("mon_evening", 0, time(14, 0), time(22, 0), shift_type=ShiftType.EVENING),
+            make_shift("mon_night", 0, time(22, 0), time(6, 0), shift_type=ShiftType.NIGHT),
+            make_shift("sat_morning", 5, time(6, 0), time(14, 0), shift_type=ShiftType.MORNING),
+        ]
+        instance = SolverInstance([], shifts)
+
+        night_window = ShiftSelector(window=(23 * 60, 2 * 60))
+        evenings = compile_templates("preference", {"shifts": ["evening"]})[0].selector
+
+        assert night_window.mask(instance).tolist() == [False, False, True, False]
+        assert evenings.mask(instance).tolist() == [False, True, True, False]
+        assert ShiftSelector(weekdays=frozenset({5})).mask(instance).tolist() == [False, False, False, True]
+
+
+class TestRuleCompiler:
+    """Test the per-version cache."""
+
+    def test_templates_are_reused_until_the_rule_changes(self):
+        compiler = RuleCompiler()
+        rule = _rule(constraints={"days": ["monday"]}, employee_id=3)
+
+        first = compiler.compile(rule)
+        second = compiler.compile(rule)
+        rule.constraints, rule.updated_at = {"days": ["tuesday"]}, datetime(2024, 2, 1)
+        third = compiler.compile(rule)
+
+        assert (compiler.hits, compiler.misses) == (1, 2)
+        assert first.templates is second.templates
+        assert third.templates[0].selector.weekdays == {1}
+        assert third.parameters["employee_id"] == "3" and third.employee_id == "3"
+
+
+class TestOptimizerRules:
+    """Test compiled rules in the model."""
+
+    def test_strict_rule_keeps_employee_off_selected_shifts(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+        shifts = [make_shift(f"d{day}", day) for day in range(7)]
+        rule = RuleCompiler().compile(_rule(constraints={"days": ["weekend"]}, employee_id=1))
+
+        result = ScheduleOptimizer().generate_schedule(employees=employees, shifts=shifts, constraints=[rule])
+
+        assert result["status"] in ("optimal", "feasible")
+        assert not {("1", shift.id) for shift in shifts[5:]} & _assigned(result)
+
+    def test_soft_rule_is_penalized_not_enforced(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift(f"d{day}", day) for day in range(3)]
+        rule = RuleCompiler().compile(_rule(rule_type="workload", constraints={"hours": 16}, strict=False))
+        optimizer = ScheduleOptimizer()
+
+        result = optimizer.generate_schedule(employees=employees, shifts=shifts, constraints=[rule])
+
+        assert result["status"] == "optimal"
+        assert len(_assigned(result)) == 3
+        assert len(optimizer.rule_penalties) == 1
+
+    def test_strict_rest_rule_is_named_in_unsat_core(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift("early", 0, time(6, 0), time(14, 0)), make_shift("late", 0, time(20, 0), time(23, 0))]
+        rule = RuleCompiler().compile(_rule(rule_id=9, rule_type="rest_period", constraints={"min_rest_hours": 12}))
+        optimizer = ScheduleOptimizer(config={"min_rest_hours": 4})
+
+        result = optimizer.generate_schedule(employees=employees, shifts=shifts, constraints=[rule])
+
+        assert result["status"] == "infeasible"
+        assert "rule:9" in {conflict["rule"] for conflict in result["conflicts"]}
@@ -0,0 +1,165 @@
+"""
+Unit tests for the windowed rest period and hour limit audit.
+"""
+
+import os
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.database import Base
+from src.models import Department, Employee, Schedule, ScheduleAssignment, Shift
+from src.services.conflict_detection import (
+    ConflictType,
+    _get_employee_weekly_hours,
+    _schedule_audit_query,
+    audit_employee_schedules,
+)
+
+MONDAY = date(2024, 1, 1)
+
+# The audit query uses PostgreSQL interval arithmetic and date_trunc, so it runs only against PostgreSQL
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+AUDIT_TABLES = ("departments", "employees", "shifts", "schedules", "schedule_assignments")
+
+
+class AuditSession:
+    """Async session stand-in returning one result for every statement."""
+
+    def __init__(self, rows=(), scalar=None):
+        self.rows = list(rows)
+        self.value = scalar
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: self.rows, scalar=lambda: self.value)
+
+
+def _row(shift_id, day, start, end, prev=None, daily=8, weekly=8):
+    start_at = datetime.combine(MONDAY + timedelta(days=day), datetime.min.time()) + timedelta(hours=start)
+    return SimpleNamespace(
+        employee_id=1,
+        first_name="A",
+        last_name="B",
+        shift_id=shift_id,
+        date=start_at.date(),
+        start_at=start_at,
+        end_at=start_at + timedelta(hours=end - start),
+        prev_shift_id=prev[0] if prev else None,
+        prev_end=prev[1] if prev else None,
+        prev_date=prev[1].date() if prev else None,
+        daily_hours=timedelta(hours=daily),
+        weekly_hours=timedelta(hours=weekly),
+    )
+
+
+def test_audit_query_uses_window_functions_over_the_context_range():
+    query = _schedule_audit_query(MONDAY, MONDAY + timedelta(days=2), {1}, 3, 8.0, 12.0, 40.0)
+
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "max(spans.end_at) OVER (PARTITION BY spans.employee_id ORDER BY spans.start_at" in sql
+    assert "ROWS BETWEEN UNBOUNDED PRECEDING AND %(param_1)s PRECEDING" in sql and compiled.params["param_1"] == 1
+    assert "OVER (PARTITION BY spans.employee_id, date_trunc(" in sql
+    # Enough days before the range for the rest check, and the rest of the week for weekly hours
+    assert (compiled.params["date_1"], compiled.params["date_2"]) == (MONDAY - timedelta(days=2), MONDAY + timedelta(days=6))
+
+
+@pytest.mark.asyncio
+async def test_audit_reports_rest_on_the_same_day_and_each_hour_overrun_once():
+    morning = _row(10, 0, 6, 10, daily=13, weekly=45)
+    afternoon = _row(11, 0, 14, 23, prev=(10, datetime(2024, 1, 1, 10)), daily=13, weekly=45)
+    session = AuditSession([morning, afternoon])
+
+    conflicts = await audit_employee_schedules(session, MONDAY, MONDAY + timedelta(days=6))
+
+    assert len(session.statements) == 1
+    found = [(c["shift_id"], c["conflict_type"], c.get("period"), c.get("rest_hours")) for c in conflicts]
+    assert found == [
+        (10, ConflictType.EXCESSIVE_HOURS, "daily", None),
+        (10, ConflictType.EXCESSIVE_HOURS, "weekly", None),
+        (10, ConflictType.INSUFFICIENT_REST, None, 4.0),
+        (11, ConflictType.INSUFFICIENT_REST, None, 4.0),
+    ]
+    assert conflicts[2]["next_shift_id"] == 11 and conflicts[3]["previous_shift_id"] == 10
+    assert conflicts[1]["week_start"] == "2024-01-01" and conflicts[1]["total_hours"] == 45
+
+
+@pytest.mark.asyncio
+async def test_overlapping_neighbours_are_not_rest_violations():
+    session = AuditSession([_row(11, 0, 12, 20, prev=(10, datetime(2024, 1, 1, 17)), daily=16)])
+
+    conflicts = await audit_employee_schedules(session, MONDAY, MONDAY)
+
+    assert [(c["conflict_type"], c["period"]) for c in conflicts] == [(ConflictType.EXCESSIVE_HOURS, "daily")]
+
+
+@pytest.mark.asyncio
+async def test_next_shift_side_is_reported_when_the_next_shift_is_after_the_range():
+    late = _row(11, 1, 2, 6, prev=(10, datetime(2024, 1, 1, 23)))
+    session = AuditSession([late])
+
+    conflicts = await audit_employee_schedules(session, MONDAY, MONDAY)
+
+    assert [(c["shift_id"], c["shift_date"], c["next_shift_id"]) for c in conflicts] == [(10, "2024-01-01", 11)]
+
+
+@pytest.mark.asyncio
+async def test_scheduled_hours_are_summed_by_the_database():
+    assert await _get_employee_weekly_hours(AuditSession(scalar=timedelta(hours=37, minutes=30)), 1, MONDAY, MONDAY) == 37.5
+    assert await _get_employee_weekly_hours(AuditSession(scalar=None), 1, MONDAY, MONDAY) == 0.0
+
+
+@pytest_asyncio.fixture
+async def postgres_db():
+    """Session on empty scheduling tables of the PostgreSQL test database."""
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_async_engine(TEST_POSTGRES_URL, poolclass=NullPool)
+    tables = [Base.metadata.tables[name] for name in AUDIT_TABLES]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=tables)
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=tables)
+    await engine.dispose()
+
+
+async def _assign_shifts(db, *spans):
+    """Assign one employee a shift on MONDAY for each (start hour, end hour) span; return the shift ids."""
+    employee = Employee(
+        email="a@example.com", password_hash="x", first_name="A", last_name="B", department=Department(name="Ward")
+    )
+    schedule = Schedule(week_start=MONDAY, week_end=MONDAY + timedelta(days=6), creator=employee)
+    shifts = [Shift(date=MONDAY, start_time=time(start), end_time=time(end)) for start, end in spans]
+    db.add_all([schedule, *shifts])
+    await db.flush()
+    db.add_all([ScheduleAssignment(schedule=schedule, employee=employee, shift=shift) for shift in shifts])
+    await db.commit()
+    return [shift.id for shift in shifts]
+
+
+@pytest.mark.asyncio
+async def test_rest_after_a_nested_shift_counts_from_the_enclosing_shift(postgres_db):
+    long_day, nested, night = await _assign_shifts(postgres_db, (8, 20), (10, 12), (22, 23))
+
+    conflicts = await audit_employee_schedules(postgres_db, MONDAY, MONDAY)
+
+    rest = [c for c in conflicts if c["conflict_type"] == ConflictType.INSUFFICIENT_REST]
+    assert [(c["shift_id"], c.get("next_shift_id"), c.get("previous_shift_id"), c["rest_hours"]) for c in rest] == [
+        (long_day, night, None, 2.0),
+        (night, None, long_day, 2.0),
+    ]
+    assert nested not in {c["shift_id"] for c in rest}
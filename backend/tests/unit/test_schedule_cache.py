@@ -0,0 +1,141 @@
+"""
+Unit tests for the content-addressed solver result cache.
+"""
+
+from datetime import date, time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core.cache import CacheManager, ScheduleCache, canonical_json
+from src.scheduler.constraint_solver import Employee, SchedulingConstraint, Shift
+from src.services.schedule_service import GenerationInput, ScheduleGenerationService, _invalidate_cached_results
+
+
+@pytest.fixture
+def memory_cache():
+    """ScheduleCache backed by the in-memory fallback."""
+    manager = CacheManager.__new__(CacheManager)
+    manager.redis_client = None
+    manager.enabled = False
+    manager.memory_cache = {}
+    return ScheduleCache(manager)
+
+
+@pytest.fixture
+def instance():
+    employees = [
+        Employee(id="1", name="A", qualifications=["rn", "cpr"], availability={"Monday": [(time(22), time(6))]}),
+        Employee(id="2", name="B"),
+    ]
+    shifts = [
+        Shift(id="1_2024-01-01", date=date(2024, 1, 1), start_time=time(9), end_time=time(17)),
+        Shift(id="2_2024-01-01", date=date(2024, 1, 1), start_time=time(17), end_time=time(23)),
+    ]
+    constraints = [SchedulingConstraint(id="1", name="rule", type="limit", parameters={"days": ["mon", "tue"]})]
+    return employees, shifts, constraints
+
+
+class TestCanonicalJson:
+    """Test order-independent serialization."""
+
+    def test_dict_and_list_order_ignored(self):
+        assert canonical_json({"b": [1, 2], "a": {"y": 1, "x": 2}}) == canonical_json({"a": {"x": 2, "y": 1}, "b": [2, 1]})
+
+    def test_tuple_order_kept(self):
+        assert canonical_json((time(22), time(6))) != canonical_json((time(6), time(22)))
+
+    def test_dataclasses_serialized_by_content(self, instance):
+        employees, _, _ = instance
+        reordered = Employee(**{**employees[0].__dict__, "qualifications": ["cpr", "rn"]})
+        assert canonical_json(employees[0]) == canonical_json(reordered)
+
+
+class TestScheduleCache:
+    """Test fingerprint keyed storage and invalidation."""
+
+    def test_key_independent_of_input_order(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"}, config={"max_solve_time": 60})
+
+        cached = memory_cache.get_schedule(employees[::-1], shifts[::-1], constraints, config={"max_solve_time": 60})
+
+        assert cached == {"status": "optimal"}
+
+    def test_key_changes_with_content(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"})
+
+        employees[1].max_hours_per_week = 20
+        assert memory_cache.get_schedule(employees, shifts, constraints) is None
+
+    def test_key_changes_with_config(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"}, config={"decompose": False})
+        assert memory_cache.get_schedule(employees, shifts, constraints, config={"decompose": True}) is None
+
+    def test_invalidate_employee_schedules(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"})
+        memory_cache.set_schedule(employees[1:], shifts, constraints, {"status": "feasible"})
+
+        assert memory_cache.invalidate_employee_schedules("1") == 1
+
+        assert memory_cache.get_schedule(employees, shifts, constraints) is None
+        assert memory_cache.get_schedule(employees[1:], shifts, constraints) == {"status": "feasible"}
+
+
+class TestServiceResultCache:
+    """Test solver result caching in the generation service."""
+
+    def test_roundtrip_marks_cache_hit(self, memory_cache, instance):
+        service = ScheduleGenerationService()
+        generation_input = GenerationInput([], *instance)
+        result = {"status": "optimal", "schedule": [], "statistics": {"solve_time": 1.0}}
+
+        with patch("src.services.schedule_service.get_schedule_cache", return_value=memory_cache):
+            assert service.get_cached_result(generation_input, {"decompose": False}) is None
+            service.cache_result(generation_input, {"decompose": False}, result)
+            cached = service.get_cached_result(generation_input, {"decompose": False})
+
+        assert cached["statistics"] == {"solve_time": 1.0, "cache_hit": True}
+        assert "cache_hit" not in result["statistics"]
+
+    def test_failed_results_not_cached(self, memory_cache, instance):
+        service = ScheduleGenerationService()
+        generation_input = GenerationInput([], *instance)
+
+        with patch("src.services.schedule_service.get_schedule_cache", return_value=memory_cache):
+            service.cache_result(generation_input, None, {"status": "infeasible", "schedule": []})
+            assert service.get_cached_result(generation_input) is None
+
+    def _state(self, changed):
+        """Fake instance state with attribute history for the given changed fields."""
+        attrs = {
+            name: SimpleNamespace(history=SimpleNamespace(has_changes=lambda name=name: name in changed))
+            for name in ("qualifications", "availability", "first_name")
+        }
+        return SimpleNamespace(attrs=attrs)
+
+    def test_employee_update_invalidates(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"})
+
+        with patch("src.services.schedule_service.get_schedule_cache", return_value=memory_cache), patch(
+            "src.services.schedule_service.inspect", return_value=self._state({"qualifications"})
+        ):
+            _invalidate_cached_results(None, None, SimpleNamespace(id=1))
+
+        assert memory_cache.get_schedule(employees, shifts, constraints) is None
+
+    def test_unrelated_employee_update_keeps_results(self, memory_cache, instance):
+        employees, shifts, constraints = instance
+        memory_cache.set_schedule(employees, shifts, constraints, {"status": "optimal"})
+
+        with patch("src.services.schedule_service.get_schedule_cache", return_value=memory_cache), patch(
+            "src.services.schedule_service.inspect", return_value=self._state({"first_name"})
+        ):
+            _invalidate_cached_results(None, None, SimpleNamespace(id=1))
+
+        assert memory_cache.get_schedule(employees, shifts, constraints) == {"status": "optimal"}
@@ -0,0 +1,60 @@
+"""
+Unit tests for the per-employee conflict sweep of ScheduleGenerationService.
+"""
+
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.services.schedule_service import ScheduleGenerationService
+
+MONDAY = date(2024, 1, 1)
+
+
+def _assignment(assignment_id, employee, day, start, end):
+    shift = SimpleNamespace(
+        id=assignment_id,
+        date=MONDAY + timedelta(days=day),
+        start_time=time(start),
+        end_time=time(end),
+        required_qualifications=None,
+    )
+    return SimpleNamespace(id=assignment_id, employee_id=employee.id, employee=employee, shift=shift)
+
+
+class FakeSession:
+    """Async session stand-in returning the assignments in range."""
+
+    def __init__(self, assignments):
+        self.assignments = assignments
+
+    async def execute(self, stmt):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.assignments))
+
+
+@pytest.mark.asyncio
+async def test_overnight_overlap_rest_and_consecutive_days():
+    alice = SimpleNamespace(id=1, name="Alice", qualifications=[])
+    bob = SimpleNamespace(id=2, name="Bob", qualifications=[])
+    assignments = [
+        _assignment(1, alice, 0, 22, 6),  # Runs into Tuesday morning
+        _assignment(2, alice, 1, 5, 9),
+        _assignment(3, alice, 1, 14, 20),
+        _assignment(4, bob, 0, 9, 17),
+    ]
+    assignments += [_assignment(10 + day, bob, day, 9, 17) for day in range(1, 6)]
+    service = ScheduleGenerationService()
+    service.optimizer.config["max_consecutive_days"] = 5
+
+    result = await service.check_conflicts(FakeSession(assignments), MONDAY, MONDAY + timedelta(days=6))
+
+    found = [(c["type"], c["employee_id"], c.get("assignment_ids")) for c in result["conflicts"]]
+    assert found == [
+        ("double_booking", 1, [1, 2]),
+        ("insufficient_rest", 1, [2, 3]),
+        ("consecutive_days", 2, None),
+    ]
+    assert result["conflicts"][1]["rest_hours"] == 5
+    assert result["conflicts"][2]["days"] == 6
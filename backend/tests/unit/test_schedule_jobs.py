@@ -0,0 +1,110 @@
+"""
+Unit tests for the background schedule generation job queue.
+"""
+
+import asyncio
+import threading
+from datetime import date, time
+
+import pytest
+
+from src.scheduler.constraint_solver import Employee, Shift
+from src.services.schedule_jobs import GenerationJob, JobStatus, ScheduleJobManager, solve_in_worker
+
+
+class TestGenerationJob:
+    """Test job serialization."""
+
+    def test_round_trip(self):
+        job = GenerationJob(id="abc", start_date=date(2024, 1, 1), end_date=date(2024, 1, 7), constraints={"x": 1})
+        job.status = JobStatus.COMPLETED
+        job.result = {"status": "optimal", "schedule": []}
+
+        restored = GenerationJob.from_dict(job.to_dict(include_result=True))
+
+        assert restored.id == "abc"
+        assert restored.status == JobStatus.COMPLETED
+        assert restored.is_finished
+        assert restored.result == {"status": "optimal", "schedule": []}
+
+    def test_existing_assignments_round_trip(self):
+        job = GenerationJob(
+            id="abc", start_date=date(2024, 1, 1), end_date=date(2024, 1, 7), existing_assignments=[("1", "s1")]
+        )
+
+        restored = GenerationJob.from_dict(job.to_dict())
+
+        assert restored.existing_assignments == [("1", "s1")]
+
+    def test_result_excluded_by_default(self):
+        job = GenerationJob(id="abc", start_date=date(2024, 1, 1), end_date=date(2024, 1, 7))
+        assert "result" not in job.to_dict()
+
+
+class TestSolveInWorker:
+    """Test the pool worker entry point."""
+
+    @pytest.fixture
+    def instance(self):
+        employees = [Employee(id="1", name="Alice"), Employee(id="2", name="Bob")]
+        shifts = [Shift(id="s1", date=date(2024, 1, 1), start_time=time(9, 0), end_time=time(17, 0))]
+        return employees, shifts
+
+    def test_solves_without_cancel_event(self, instance):
+        employees, shifts = instance
+        result = solve_in_worker({"max_solve_time": 5}, employees, shifts, [])
+        assert result["status"] in ["optimal", "feasible"]
+
+    def test_pre_cancelled_solve_returns(self, instance):
+        employees, shifts = instance
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        result = solve_in_worker({"max_solve_time": 30}, employees, shifts, [], cancel_event)
+
+        assert result["status"] in ["optimal", "feasible", "unknown"]
+
+
+class TestScheduleJobManager:
+    """Test job bookkeeping that doesn't need the worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_unknown_job(self):
+        manager = ScheduleJobManager()
+        assert await manager.cancel("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_finished_job_is_noop(self):
+        manager = ScheduleJobManager()
+        job = GenerationJob(id="done", start_date=date(2024, 1, 1), end_date=date(2024, 1, 7))
+        job.status = JobStatus.COMPLETED
+        manager._jobs[job.id] = job
+
+        assert (await manager.cancel("done")).status == JobStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_run_waits_for_the_job_result(self, monkeypatch):
+        manager = ScheduleJobManager()
+
+        async def fake_run(job):
+            await asyncio.sleep(0)
+            manager._finish(job, JobStatus.COMPLETED, "done", {"status": "optimal", "existing": job.existing_assignments})
+
+        monkeypatch.setattr(manager, "_run", fake_run)
+
+        result = await manager.run(date(2024, 1, 1), date(2024, 1, 7), existing_assignments=[("2", "s1"), ("1", "s1")])
+
+        assert result == {"status": "optimal", "existing": [("1", "s1"), ("2", "s1")]}
+
+    @pytest.mark.asyncio
+    async def test_run_reports_jobs_without_result(self, monkeypatch):
+        manager = ScheduleJobManager()
+
+        async def fake_run(job):
+            manager._finish(job, JobStatus.CANCELLED, "Cancelled by user")
+
+        monkeypatch.setattr(manager, "_run", fake_run)
+
+        result = await manager.run(date(2024, 1, 1), date(2024, 1, 7))
+
+        assert result == {"status": "cancelled", "message": "Cancelled by user", "schedule": []}
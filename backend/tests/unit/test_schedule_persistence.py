@@ -0,0 +1,109 @@
+"""
+Unit tests for set-based persistence of generated schedules.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.services.schedule_service import ScheduleGenerationService
+
+
+def _rows(stmt):
+    """Per-row parameters of a multi-row INSERT, keyed by column name."""
+    rows = {}
+    for name, value in stmt.compile(dialect=postgresql.dialect()).params.items():
+        column, _, row = name.rpartition("_m")
+        if column and row.isdigit():
+            rows.setdefault(int(row), {})[column] = value
+    return [rows[row] for row in sorted(rows)]
+
+
+class RecordingSession:
+    """Async session stand-in that records statements and replays canned rows."""
+
+    def __init__(self, existing_weeks=()):
+        self.existing_weeks = list(existing_weeks)
+        self.statements = []
+        self.commits = 0
+        self.info = {}
+        self._next_id = 100
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        if sql.startswith("SELECT"):
+            return SimpleNamespace(all=lambda: list(self.existing_weeks))
+        if sql.startswith("INSERT INTO schedules"):
+            rows = []
+            for row in _rows(stmt):
+                self._next_id += 1
+                rows.append((self._next_id, row["week_start"]))
+            return SimpleNamespace(all=lambda: rows)
+        # Pretend every assignment row was new
+        return SimpleNamespace(rowcount=len(_rows(stmt)))
+
+    async def commit(self):
+        self.commits += 1
+
+    def sql(self):
+        return [str(stmt.compile(dialect=postgresql.dialect())) for stmt in self.statements]
+
+
+def _entry(template_id, day, *employee_ids):
+    return {
+        "shift_id": f"{template_id}_{day.isoformat()}",
+        "date": day.isoformat(),
+        "assigned_employees": [{"id": emp_id} for emp_id in employee_ids],
+    }
+
+
+@pytest.mark.asyncio
+async def test_weeks_created_in_one_statement_and_assignments_upserted():
+    session = RecordingSession(existing_weeks=[(7, date(2024, 1, 1), date(2024, 1, 7))])
+    schedule = [
+        _entry(1, date(2024, 1, 2), "1", "2"),
+        _entry(1, date(2024, 1, 3), "1"),  # same template and week: same assignment key
+        _entry(2, date(2024, 1, 9), "2", "99"),  # unknown employee is skipped
+        _entry(2, date(2024, 1, 16), "1"),
+    ]
+    employees = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+    saved = await ScheduleGenerationService()._save_schedule_to_db(session, schedule, employees)
+
+    sql = session.sql()
+    assert len(sql) == 3
+    assert sql[0].startswith("SELECT")
+    assert sql[1].startswith("INSERT INTO schedules") and "RETURNING" in sql[1]
+    assert sql[2].startswith("INSERT INTO schedule_assignments")
+    assert sql[2].endswith("ON CONFLICT (schedule_id, employee_id, shift_id) DO NOTHING")
+
+    # Two missing weeks created together, the existing one reused
+    created = _rows(session.statements[1])
+    assert [row["week_start"] for row in created] == [date(2024, 1, 8), date(2024, 1, 15)]
+
+    rows = _rows(session.statements[2])
+    assert {(row["schedule_id"], row["employee_id"], row["shift_id"]) for row in rows} == {
+        (7, 1, 1),
+        (7, 2, 1),
+        (101, 2, 2),
+        (102, 1, 2),
+    }
+    assert saved == 4
+    assert session.commits == 1
+    # Upserts bypass the ORM, so the assignment index reloads these employees on commit
+    assert {change[1] for change in session.info["assignment_index_changes"]} == {1, 2}
+
+
+@pytest.mark.asyncio
+async def test_nothing_to_save():
+    session = RecordingSession()
+
+    saved = await ScheduleGenerationService()._save_schedule_to_db(session, [], [])
+
+    assert saved == 0
+    assert session.statements == []
+    assert session.commits == 1
@@ -0,0 +1,101 @@
+"""
+Unit tests for adaptive solve-time budgeting and early termination.
+"""
+
+import threading
+import time
+from datetime import date
+from datetime import time as dtime
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer, Shift
+from src.scheduler.solve_budget import EarlyStop, SolveHistory, SolvePlan, SolveRecord, plan_solve, solve_history
+
+ADAPTIVE = {"max_solve_time": 60, "adaptive_time_limit": True, "min_solve_time": 2, "solve_seconds_per_1k_variables": 1.0}
+
+
+class TestPlanSolve:
+    """Test time limit and worker selection."""
+
+    def test_static_without_adaptive_time_limit(self):
+        plan = plan_solve({"max_solve_time": 30, "num_search_workers": 4}, 50_000)
+
+        assert (plan.time_limit, plan.max_time, plan.num_workers) == (30, 30, 4)
+        assert not plan.needs_watcher
+
+    def test_time_limit_scales_with_size_within_bounds(self):
+        history = SolveHistory()
+
+        assert plan_solve(ADAPTIVE, 500, history, cores=16).time_limit == 2
+        assert plan_solve(ADAPTIVE, 20_000, history, cores=16).time_limit == 20
+        assert plan_solve(ADAPTIVE, 500_000, history, cores=16).time_limit == 60
+
+    def test_workers_grow_with_size_up_to_cores(self):
+        history = SolveHistory()
+
+        assert plan_solve(ADAPTIVE, 500, history, cores=16).num_workers == 1
+        assert plan_solve(ADAPTIVE, 5_000, history, cores=16).num_workers == 4
+        assert plan_solve(ADAPTIVE, 50_000, history, cores=16).num_workers == 8
+        assert plan_solve(ADAPTIVE, 50_000, history, cores=2).num_workers == 2
+        assert plan_solve({**ADAPTIVE, "num_search_workers": 3}, 50_000, history, cores=16).num_workers == 3
+
+    def test_history_of_similar_solves_sets_time_limit(self):
+        history = SolveHistory()
+        history.record(SolveRecord(num_variables=10_000, solve_time=60, first_solution_time=2, best_solution_time=4))
+        history.record(SolveRecord(num_variables=100, solve_time=1, first_solution_time=0.1, best_solution_time=0.5))
+
+        plan = plan_solve(ADAPTIVE, 20_000, history, cores=1)
+
+        # 4s for half the variables, scaled to 8s, with 1.5x headroom
+        assert plan.time_limit == 12
+
+
+class TestEarlyStop:
+    """Test the soft limit and stall detection."""
+
+    def _run(self, plan, solutions_at, duration):
+        stopped = threading.Event()
+        with EarlyStop(plan, stopped.set, poll_interval=0.01) as early_stop:
+            started = time.monotonic()
+            pending = list(solutions_at)
+            while time.monotonic() - started < duration and not stopped.is_set():
+                if pending and time.monotonic() - started >= pending[0]:
+                    pending.pop(0)
+                    early_stop.on_solution()
+                time.sleep(0.005)
+        return early_stop, stopped.is_set(), time.monotonic() - started
+
+    def test_stops_at_soft_limit_once_a_solution_exists(self):
+        early_stop, stopped, elapsed = self._run(SolvePlan(0.2, 5, 1), [0.05], 2)
+
+        assert stopped and early_stop.stop_reason == "time_limit"
+        assert elapsed < 1
+
+    def test_keeps_searching_without_a_solution(self):
+        early_stop, stopped, _ = self._run(SolvePlan(0.1, 5, 1), [], 0.4)
+
+        assert not stopped and early_stop.stop_reason is None
+
+    def test_late_first_solution_stops_on_stall_only(self):
+        early_stop, stopped, elapsed = self._run(SolvePlan(0.1, 5, 1, stall_time=0.3), [0.2, 0.4], 3)
+
+        assert stopped and early_stop.stop_reason == "stall"
+        assert 0.65 <= elapsed < 2
+        assert early_stop.first_solution_time < early_stop.best_solution_time
+
+
+class TestOptimizerBudget:
+    """Test that the optimizer applies and records its budget."""
+
+    def test_statistics_report_plan_and_history_is_recorded(self):
+        employees = [Employee(id=str(index), name=f"E{index}") for index in range(3)]
+        shifts = [Shift(id="s1", date=date(2024, 1, 1), start_time=dtime(9), end_time=dtime(17))]
+        solve_history.clear()
+
+        result = ScheduleOptimizer(config=ADAPTIVE).generate_schedule(employees=employees, shifts=shifts)
+
+        statistics = result["statistics"]
+        assert statistics["time_limit"] == 2
+        assert statistics["num_workers"] == 1
+        assert len(solve_history.records) == 1
+        assert solve_history.records[0].num_variables == 3
+        assert solve_history.records[0].first_solution_time is not None
@@ -0,0 +1,160 @@
+"""
+Unit tests for component-week decomposition of solver instances.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time
+
+import pytest
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer
+from src.scheduler.decomposition import boundary_dates, partition_instance, solve_decomposed
+
+
+@pytest.fixture
+def weekend_instance(make_shift):
+    """Sunday night shift followed by an early Monday shift in one department."""
+    employees = [Employee(id="a", name="A", department_id=1), Employee(id="b", name="B", department_id=1)]
+    shifts = [
+        make_shift("sat", 5, max_employees=1),
+        make_shift("sun_night", 6, time(22, 0), time(6, 0), max_employees=1),
+        make_shift("mon_early", 7, time(7, 0), time(15, 0), max_employees=1),
+        make_shift("tue", 8, max_employees=1),
+    ]
+    return employees, shifts
+
+
+class TestPartitioning:
+    """Test splitting instances by eligibility component and week."""
+
+    def test_partitions_by_component_and_week(self, weekend_instance, make_shift):
+        employees, shifts = weekend_instance
+        for shift in shifts:
+            shift.required_qualifications = ["ward"]
+        for emp in employees:
+            emp.qualifications = ["ward"]
+        employees.append(Employee(id="c", name="C", department_id=2, qualifications=["lab"]))
+        shifts.append(make_shift("other", 7, department_id=2, required_qualifications=["lab"], max_employees=1))
+
+        partitions = partition_instance(employees, shifts)
+
+        assert [(p.component, p.week_start) for p in partitions] == [
+            (0, date(2024, 1, 1)),
+            (0, date(2024, 1, 8)),
+            (1, date(2024, 1, 8)),
+        ]
+        assert [e.id for e in partitions[2].employees] == ["c"]
+        assert [s.id for s in partitions[1].shifts] == ["mon_early", "tue"]
+
+    def test_components_follow_eligibility_not_department(self, make_shift):
+        # Like the single model, employees may work shifts of any department they are eligible for
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", department_id=2)]
+        shifts = [make_shift("s", 0, department_id=1)]
+
+        partitions = partition_instance(employees, shifts)
+
+        assert len(partitions) == 1
+        assert [e.id for e in partitions[0].employees] == ["a", "b"]
+
+    def test_shifts_nobody_may_work_get_a_partition_without_employees(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [make_shift("s", 0, required_qualifications=["rn"])]
+
+        partitions = partition_instance(employees, shifts)
+
+        assert [(p.employees, [s.id for s in p.shifts]) for p in partitions] == [([], ["s"])]
+
+    def test_boundary_dates(self, weekend_instance):
+        _, shifts = weekend_instance
+        assert boundary_dates(shifts) == {date(2024, 1, 7), date(2024, 1, 8)}
+
+    def test_no_boundary_inside_single_week(self, weekend_instance):
+        _, shifts = weekend_instance
+        assert boundary_dates(shifts[2:]) == set()
+
+
+class TestStitching:
+    """Test re-solving boundary days with the rest of the plan frozen."""
+
+    def test_resolve_window_fixes_rest_violation(self, weekend_instance):
+        employees, shifts = weekend_instance
+        current = {("a", "sat"), ("a", "sun_night"), ("a", "mon_early"), ("b", "tue")}
+
+        result = ScheduleOptimizer(config={"min_rest_hours": 8}).resolve_window(
+            employees, shifts, current, {"sun_night", "mon_early"}
+        )
+
+        assert result["status"] == "optimal"
+        assert len(result["added"]) == 1 and result["added"][0]["employee_id"] == "b"
+        assert len(result["removed"]) == 1 and result["removed"][0]["employee_id"] == "a"
+        assert result["unfilled"] == []
+
+    def test_solve_decomposed(self, weekend_instance):
+        employees, shifts = weekend_instance
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"min_rest_hours": 8, "max_solve_time": 5}, employees, shifts, executor=executor)
+
+        assert result["status"] == "feasible"
+        assert result["statistics"]["partitions"] == 2
+        assert result["statistics"]["stitched_days"] == 2
+
+        assigned = {entry["shift_id"]: [e["id"] for e in entry["assigned_employees"]] for entry in result["schedule"]}
+        assert all(len(ids) == 1 for ids in assigned.values())
+        assert assigned["sun_night"] != assigned["mon_early"]
+
+    def test_understaffed_boundary_is_reported(self, weekend_instance):
+        employees, shifts = weekend_instance
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"min_rest_hours": 8, "max_solve_time": 5}, employees[:1], shifts, executor=executor)
+
+        assert result["status"] == "fallback"
+        assert result["unfilled"] in ([{"shift_id": "sun_night", "missing": 1}], [{"shift_id": "mon_early", "missing": 1}])
+        assert result["message"] == "Decomposed solve left 1 shifts understaffed"
+
+    def test_matches_single_model_across_departments(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", department_id=2)]
+        shifts = [make_shift("s", 0, department_id=1, max_employees=1)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"max_solve_time": 5}, employees, shifts, executor=executor)
+
+        assert result["status"] == "optimal"
+        assert len(result["schedule"][0]["assigned_employees"]) == 1
+
+    def test_shift_nobody_may_work_is_unfilled_without_failing_the_rest(self, weekend_instance, make_shift):
+        employees, shifts = weekend_instance
+        shifts.append(make_shift("orphan", 8, department_id=3, required_qualifications=["rn"], max_employees=1))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"min_rest_hours": 8, "max_solve_time": 5}, employees, shifts, executor=executor)
+
+        assert result["status"] == "fallback"
+        assert result["unfilled"] == [{"shift_id": "orphan", "missing": 1}]
+        assigned = {entry["shift_id"]: entry["assigned_employees"] for entry in result["schedule"]}
+        assert all(len(assigned[shift.id]) == 1 for shift in shifts[:-1])
+
+    def test_greedy_partitions_keep_their_plan(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [
+            make_shift("first", 0, max_employees=1),
+            make_shift("second", 0, time(12, 0), time(20, 0), max_employees=1),
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"greedy_variable_limit": 1}, employees, shifts, executor=executor)
+
+        assert result["status"] == "fallback"
+        assert len(result["unfilled"]) == 1
+        assert sum(len(entry["assigned_employees"]) for entry in result["schedule"]) == 1
+
+    def test_failed_partition_is_reported(self, weekend_instance):
+        employees, shifts = weekend_instance
+        shifts[-1].min_employees = 3
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = solve_decomposed({"max_solve_time": 5}, employees, shifts, executor=executor)
+
+        assert result["status"] == "infeasible"
+        assert "week of 2024-01-08" in result["message"]
@@ -0,0 +1,119 @@
+"""
+Unit tests for pre-solve capacity checks and infeasibility explanations.
+"""
+
+from dataclasses import dataclass
+from datetime import date, time
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer, SchedulingConstraint
+from src.scheduler.diagnostics import capacity_bottlenecks
+from src.scheduler.eligibility import EligibilityMatrix
+from src.scheduler.instance import SolverInstance
+
+MONDAY = date(2024, 1, 1)
+
+
+def _bottlenecks(employees, shifts):
+    return capacity_bottlenecks(SolverInstance(employees, shifts), EligibilityMatrix(employees, shifts))
+
+
+@dataclass
+class ClosedShift(SchedulingConstraint):
+    """Test rule keeping everyone off one shift."""
+
+    def apply(self, model, variables, context):
+        for (_, shift_id), var in variables["assignments"].items():
+            if shift_id == self.parameters["shift_id"]:
+                model.Add(var == 0)
+        return True
+
+
+class TestCapacityBottlenecks:
+    """Test the linear-time demand and supply checks."""
+
+    def test_feasible_instance_has_none(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+
+        assert _bottlenecks(employees, [make_shift("s1", 0), make_shift("s2", 1)]) == []
+
+    def test_shift_with_too_few_qualified_employees(self, make_shift):
+        employees = [Employee(id="1", name="A", qualifications=["rn"]), Employee(id="2", name="B")]
+        shift = make_shift("s1", required_qualifications=["rn"], min_employees=2)
+
+        (bottleneck,) = [b for b in _bottlenecks(employees, [shift]) if b["kind"] == "shift"]
+
+        assert (bottleneck["shift_id"], bottleneck["demand"], bottleneck["supply"]) == ("s1", 2, 1)
+
+    def test_overlapping_window(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+        shifts = [
+            make_shift("s1", end=time(13, 0)),
+            make_shift("s2", start=time(12, 0)),
+            make_shift("s3", start=time(11, 0), end=time(15, 0)),
+        ]
+
+        (bottleneck,) = _bottlenecks(employees, shifts)
+
+        assert bottleneck["kind"] == "window"
+        assert set(bottleneck["shift_ids"]) == {"s1", "s2", "s3"}
+        assert (bottleneck["demand"], bottleneck["supply"]) == (3, 2)
+
+    def test_qualification_hours_per_week(self, make_shift):
+        employees = [
+            Employee(id="1", name="A", qualifications=["rn"], max_hours_per_week=8),
+            Employee(id="2", name="B", qualifications=["rn"], max_hours_per_week=8),
+            Employee(id="3", name="C"),
+            Employee(id="4", name="D"),
+        ]
+        shifts = [make_shift(f"s{day}", day, required_qualifications=["rn"]) for day in range(3)] + [make_shift("open", 3)]
+
+        bottlenecks = _bottlenecks(employees, shifts)
+
+        (qualification,) = [b for b in bottlenecks if b["kind"] == "qualification"]
+        assert qualification["qualification"] == "rn"
+        assert qualification["week_start"] == MONDAY.isoformat()
+        assert (qualification["demand"], qualification["supply"]) == (24, 16)
+        assert not [b for b in bottlenecks if b["kind"] == "week"]
+
+    def test_week_hours_under_weekly_limits(self, make_shift):
+        employees = [Employee(id="1", name="A", max_hours_per_week=20)]
+        shifts = [make_shift(f"s{day}", day) for day in range(3)] + [make_shift("next", 7)]
+
+        (bottleneck,) = _bottlenecks(employees, shifts)
+
+        assert (bottleneck["kind"], bottleneck["week_start"]) == ("week", MONDAY.isoformat())
+        assert (bottleneck["demand"], bottleneck["supply"]) == (24, 20)
+
+
+class TestOptimizerDiagnostics:
+    """Test how the optimizer reports infeasible instances."""
+
+    def test_precheck_returns_before_solving(self, make_shift):
+        employees = [Employee(id="1", name="A", max_hours_per_week=8)]
+
+        result = ScheduleOptimizer().generate_schedule(employees=employees, shifts=[make_shift("s1", 0), make_shift("s2", 1)])
+
+        assert result["status"] == "infeasible"
+        assert result["bottlenecks"][0]["kind"] == "week"
+        assert "need 16 hours" in result["message"]
+        assert result["statistics"]["precheck"]
+
+    def test_core_names_conflicting_hard_rules(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift("s1", 0), make_shift("s2", 0, time(20, 0), time(23, 0)), make_shift("s3", 2, min_employees=0)]
+
+        result = ScheduleOptimizer(config={"min_rest_hours": 8}).generate_schedule(employees=employees, shifts=shifts)
+
+        assert result["status"] == "infeasible"
+        assert {conflict["rule"] for conflict in result["conflicts"]} == {"min_staff:s1", "min_staff:s2", "min_rest"}
+
+    def test_core_names_custom_rule(self, make_shift):
+        employees = [Employee(id="1", name="A", max_hours_per_week=8), Employee(id="2", name="B")]
+        shifts = [make_shift("s1", 0, min_employees=2), make_shift("s2", 1)]
+        rule = ClosedShift(id="7", name="Closed Tuesday", type="custom", parameters={"shift_id": "s2"})
+        optimizer = ScheduleOptimizer(config={"feasibility_precheck": False})
+
+        result = optimizer.generate_schedule(employees=employees, shifts=shifts, constraints=[rule])
+
+        assert {conflict["rule"] for conflict in result["conflicts"]} == {"min_staff:s2", "rule:7"}
+        assert "Rule 'Closed Tuesday'" in result["message"]
@@ -0,0 +1,85 @@
+"""
+Unit tests for the vectorized eligibility matrix.
+"""
+
+from datetime import time
+
+import numpy as np
+
+from src.scheduler.constraint_solver import Employee
+from src.scheduler.eligibility import EligibilityMatrix, availability_bitmap, qualification_bitsets
+
+
+class TestAvailabilityBitmap:
+    """Test encoding of weekly availability."""
+
+    def test_empty_availability_is_always_available(self):
+        assert availability_bitmap({}).all()
+
+    def test_window_bits(self):
+        bitmap = availability_bitmap({"Tuesday": [(time(9, 0), time(17, 0))]})
+        assert bitmap.sum() == 8 * 60
+        assert bitmap[1440 + 9 * 60] and not bitmap[1440 + 17 * 60]
+
+    def test_overnight_window_wraps_past_sunday(self):
+        bitmap = availability_bitmap({"Sunday": [(time(22, 0), time(6, 0))]})
+        assert bitmap[-1] and bitmap[0] and bitmap[6 * 60 - 1]
+        assert bitmap.sum() == 8 * 60
+
+
+class TestQualificationBitsets:
+    """Test qualification encoding."""
+
+    def test_bits_span_multiple_words(self):
+        vocabulary = {f"q{i}": i for i in range(70)}
+        bits = qualification_bitsets([["q0", "q69", "unknown"]], vocabulary)
+
+        assert bits.shape == (1, 2)
+        assert bits[0, 0] == np.uint64(1) and bits[0, 1] == np.uint64(1 << 5)
+
+
+class TestEligibilityMatrix:
+    """Test the employee x shift matrix."""
+
+    def test_qualifications_availability_and_hours(self, make_shift):
+        employees = [
+            Employee(id="rn", name="RN", qualifications=["rn", "cpr"]),
+            Employee(id="cpr", name="CPR", qualifications=["cpr"]),
+            Employee(id="mon", name="Mondays", availability={"Monday": [(time(8, 0), time(18, 0))]}),
+            Employee(id="short", name="Part time", max_hours_per_week=4),
+        ]
+        shifts = [
+            make_shift("mon_rn", 0, required_qualifications=["rn", "cpr"]),
+            make_shift("mon", 0),
+            make_shift("mon_late", 0, time(12, 0), time(20, 0)),
+            make_shift("tue", 1),
+            make_shift("tue_short", 1, time(9, 0), time(12, 0)),
+        ]
+
+        eligibility = EligibilityMatrix(employees, shifts)
+
+        assert eligibility.by_shift() == {
+            "mon_rn": {"rn"},
+            "mon": {"rn", "cpr", "mon"},
+            "mon_late": {"rn", "cpr"},
+            "tue": {"rn", "cpr"},
+            "tue_short": {"rn", "cpr", "short"},
+        }
+        assert eligibility.pair_count() == 11
+        assert eligibility.is_eligible("mon", "mon") and not eligibility.is_eligible("mon", "tue")
+
+    def test_overnight_shift_needs_next_day(self, make_shift):
+        evening = (time(20, 0), time(23, 59))
+        employees = [
+            Employee(id="both", name="Both", availability={"Monday": [evening], "Tuesday": [(time(0, 0), time(8, 0))]}),
+            Employee(id="monday", name="Monday", availability={"Monday": [evening]}),
+        ]
+        shifts = [make_shift("night", 0, time(22, 0), time(6, 0))]
+
+        assert EligibilityMatrix(employees, shifts).by_shift() == {"night": {"both"}}
+
+    def test_pairs_are_employee_major(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", qualifications=["x"])]
+        shifts = [make_shift("x", 0, required_qualifications=["x"]), make_shift("any", 0)]
+
+        assert list(EligibilityMatrix(employees, shifts).pairs()) == [(0, 1), (1, 0), (1, 1)]
@@ -0,0 +1,216 @@
+"""
+Unit tests for the greedy construction heuristic.
+"""
+
+from datetime import time
+
+import pytest
+
+from src.scheduler.constraint_solver import CarryOver, Employee, ScheduleOptimizer
+from src.scheduler.greedy import GreedyScheduler
+
+
+def _greedy(employees, shifts, min_rest_hours=8, **config):
+    optimizer = ScheduleOptimizer(config={"min_rest_hours": min_rest_hours, **config})
+    eligibility = optimizer._build_eligibility_index(employees, shifts)
+    return optimizer._greedy_scheduler(employees, shifts, eligibility)
+
+
+class TestGreedyScheduler:
+    """Test hard constraints and ordering of the heuristic."""
+
+    def test_scarce_qualification_filled_first(self, make_shift):
+        employees = [Employee(id="nurse", name="N", qualifications=["rn"]), Employee(id="aide", name="A")]
+        shifts = [
+            make_shift("open", 0),
+            make_shift("rn", 0, time(10, 0), time(18, 0), required_qualifications=["rn"]),
+        ]
+
+        greedy = _greedy(employees, shifts)
+        assignments = greedy.build()
+
+        assert assignments == {("nurse", "rn"), ("aide", "open")}
+        assert greedy.unfilled() == {}
+
+    def test_rest_period_respected(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B")]
+        shifts = [
+            make_shift("late", 0, time(15, 0), time(23, 0)),
+            make_shift("early", 1, time(6, 0), time(14, 0)),
+        ]
+
+        assignments = _greedy(employees, shifts).build()
+
+        assert {emp for emp, _ in assignments} == {"a", "b"}
+
+    def test_back_to_back_allowed_but_short_rest_after_chain_is_not(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [
+            make_shift("first", 0, time(6, 0), time(10, 0)),
+            make_shift("second", 0, time(10, 0), time(12, 0)),
+            make_shift("third", 0, time(13, 0), time(15, 0)),
+        ]
+
+        greedy = _greedy(employees, shifts)
+        assignments = greedy.build()
+
+        assert assignments == {("a", "first"), ("a", "second")}
+        assert greedy.unfilled() == {"third": 1}
+
+    def test_hour_limit_respected(self, make_shift):
+        employees = [Employee(id="a", name="A", max_hours_per_week=16), Employee(id="b", name="B")]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(4)]
+
+        assignments = _greedy(employees, shifts).build()
+
+        assert len([1 for emp, _ in assignments if emp == "a"]) <= 2
+        assert len(assignments) == 4
+
+    def test_hour_limit_applies_per_calendar_week(self, make_shift):
+        employees = [Employee(id=str(i), name=str(i), max_hours_per_week=40) for i in range(2)]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(21)]
+
+        greedy = _greedy(employees, shifts)
+        assignments = greedy.build()
+
+        assert greedy.unfilled() == {}
+        for emp in employees:
+            for week in range(3):
+                days = [day for day in range(7 * week, 7 * week + 7) if (emp.id, f"d{day}") in assignments]
+                assert len(days) * 8 <= 40
+
+    def test_min_hours_apply_per_calendar_week(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", min_hours_per_week=40)]
+        shifts = [make_shift(f"d{day}", day, max_employees=2) for day in range(14)]
+
+        assignments = _greedy(employees, shifts).build()
+
+        for week in range(2):
+            days = [day for day in range(7 * week, 7 * week + 7) if ("b", f"d{day}") in assignments]
+            assert len(days) >= 5
+
+    def test_consecutive_days_limit_respected(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [make_shift(f"d{day}", day) for day in range(3)]
+
+        greedy = _greedy(employees, shifts, max_consecutive_days=2)
+        assignments = greedy.build()
+
+        assert len(assignments) == 2
+        assert len(greedy.unfilled()) == 1
+
+    def test_carried_streak_counts_towards_consecutive_days(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [make_shift(f"d{day}", day) for day in range(3)]
+        optimizer = ScheduleOptimizer(config={"max_consecutive_days": 2})
+        optimizer.carry_over = CarryOver(consecutive_days={"a": 2})
+
+        greedy = optimizer._greedy_scheduler(employees, shifts, optimizer._build_eligibility_index(employees, shifts))
+        assignments = greedy.build()
+
+        assert ("a", "d0") not in assignments
+        assert assignments == {("a", "d1"), ("a", "d2")}
+
+    def test_load_balanced(self, make_shift):
+        employees = [Employee(id=str(i), name=str(i)) for i in range(3)]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(6)]
+
+        assignments = _greedy(employees, shifts).build()
+
+        counts = {emp.id: 0 for emp in employees}
+        for emp_id, _ in assignments:
+            counts[emp_id] += 1
+        assert set(counts.values()) == {2}
+
+    def test_min_hours_topped_up(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", min_hours_per_week=40)]
+        shifts = [make_shift(f"d{day}", day, max_employees=2) for day in range(7)]
+
+        assignments = _greedy(employees, shifts).build()
+
+        assert len([1 for emp, _ in assignments if emp == "b"]) >= 5
+
+    def test_min_hours_pro_rated_for_partial_week(self, make_shift):
+        employees = [Employee(id="a", name="A"), Employee(id="b", name="B", min_hours_per_week=56)]
+        shifts = [make_shift(f"d{day}", day, max_employees=2) for day in range(2)]
+
+        assignments = _greedy(employees, shifts).build()
+
+        # 56 hours a week is 16 hours over the two days the horizon covers
+        assert {("b", "d0"), ("b", "d1")} <= assignments
+
+    def test_unfilled_reported(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [make_shift("s", 0, min_employees=2)]
+
+        greedy = _greedy(employees, shifts)
+        greedy.build()
+
+        assert greedy.unfilled() == {"s": 1}
+
+
+class TestOptimizerIntegration:
+    """Test use of the heuristic by ScheduleOptimizer."""
+
+    @pytest.fixture
+    def instance(self, make_shift):
+        employees = [Employee(id=str(i), name=f"Emp {i}") for i in range(3)]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(3)]
+        return employees, shifts
+
+    def test_fallback_schedule_is_feasible(self, instance):
+        employees, shifts = instance
+        result = ScheduleOptimizer()._generate_fallback_schedule(employees, shifts)
+
+        assert result["status"] == "feasible"
+        assert result["statistics"]["method"] == "greedy"
+        assert all(len(entry["assigned_employees"]) == 1 for entry in result["schedule"])
+
+    def test_fallback_reports_understaffing(self, instance):
+        employees, shifts = instance
+        shifts[0].min_employees = 5
+
+        result = ScheduleOptimizer()._generate_fallback_schedule(employees, shifts)
+
+        assert result["status"] == "fallback"
+        assert result["unfilled"] == [{"shift_id": "d0", "missing": 2}]
+
+    def test_large_instance_skips_solver(self, instance):
+        employees, shifts = instance
+        optimizer = ScheduleOptimizer(config={"greedy_variable_limit": 5})
+
+        result = optimizer.generate_schedule(employees, shifts)
+
+        assert result["statistics"]["method"] == "greedy"
+        assert optimizer.model is None
+
+    def test_multi_week_greedy_path_fully_staffed(self, make_shift):
+        employees = [Employee(id=str(i), name=str(i), max_hours_per_week=40) for i in range(2)]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(21)]
+        optimizer = ScheduleOptimizer(config={"greedy_variable_limit": 10})
+
+        result = optimizer.generate_schedule(employees, shifts)
+
+        assert result["statistics"]["method"] == "greedy"
+        assert result["status"] == "feasible"
+
+    def test_greedy_path_respects_consecutive_days(self, make_shift):
+        employees = [Employee(id="a", name="A")]
+        shifts = [make_shift(f"d{day}", day) for day in range(3)]
+        optimizer = ScheduleOptimizer(config={"greedy_variable_limit": 1, "max_consecutive_days": 2})
+
+        result = optimizer.generate_schedule(employees, shifts)
+
+        assert result["status"] == "fallback"
+        assert sum(len(entry["assigned_employees"]) for entry in result["schedule"]) == 2
+
+    def test_greedy_plan_seeds_hints(self, instance):
+        employees, shifts = instance
+        optimizer = ScheduleOptimizer(config={"sparse_variables": True, "max_solve_time": 5})
+
+        result = optimizer.generate_schedule(employees, shifts)
+
+        hint = optimizer.model.Proto().solution_hint
+        assert result["status"] in ["optimal", "feasible"]
+        assert len(hint.vars) == len(optimizer.variables["assignments"])
+        assert sum(hint.values) == 3
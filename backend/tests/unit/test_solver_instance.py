@@ -0,0 +1,80 @@
+"""
+Unit tests for the compact solver instance.
+"""
+
+import pickle
+from datetime import time
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer, ShiftType
+from src.scheduler.instance import SolverInstance
+
+
+class TestSolverInstance:
+    """Test conversion to flat arrays."""
+
+    def test_shift_arrays(self, make_shift):
+        shifts = [
+            make_shift("wed", 2, time(9, 0), time(17, 30)),
+            make_shift("sun_night", 6, time(22, 0), time(6, 0), shift_type=ShiftType.NIGHT),
+            make_shift("mon", 7, time(6, 0), time(14, 0), shift_type=ShiftType.MORNING),
+        ]
+
+        instance = SolverInstance([], shifts)
+
+        assert instance.intervals() == [("wed", 540, 1050), ("sun_night", 7080, 7560), ("mon", 7560, 8040)]
+        assert list(instance.hours) == [8, 8, 8]
+        assert list(instance.day) == [0, 4, 5]
+        assert list(instance.week) == [0, 0, 1]
+        assert list(instance.weekday) == [2, 6, 0]
+        assert [instance.shift_types[code] for code in instance.type_code] == ["full_day", "night", "morning"]
+
+    def test_hours_match_shift_durations(self, make_shift):
+        shifts = [make_shift("a", 2, time(8, 15), time(12, 0)), make_shift("b", 3, time(20, 0), time(4, 45))]
+
+        instance = SolverInstance([], shifts)
+
+        assert list(instance.hours) == [int(shift.get_duration_hours()) for shift in shifts]
+
+    def test_preference_penalty(self, make_shift):
+        employee = Employee(id="1", name="Prefs", preferences={"preferred_shift_type": "night", "preferred_days": ["sunday"]})
+        shifts = [make_shift("wed", 2), make_shift("sun", 6, time(22, 0), time(6, 0), shift_type=ShiftType.NIGHT)]
+
+        instance = SolverInstance([employee], shifts)
+
+        assert instance.preference_penalty(employee, 0) == 15
+        assert instance.preference_penalty(employee, 1) == 0
+
+    def test_matches_survives_pickling_with_its_inputs(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift("wed", 2)]
+
+        copies = pickle.loads(pickle.dumps((employees, shifts, SolverInstance(employees, shifts))))
+
+        assert copies[2].matches(copies[0], copies[1])
+        assert not copies[2].matches(employees, shifts)
+
+
+class TestOptimizerUsesInstance:
+    """Test that the optimizer reads a supplied instance."""
+
+    def test_supplied_instance_is_used(self, make_shift):
+        employees = [Employee(id=str(i), name=f"Emp {i}") for i in range(2)]
+        shifts = [make_shift(f"d{day}", day) for day in range(2, 5)]
+        instance = SolverInstance(employees, shifts)
+        optimizer = ScheduleOptimizer(config={"max_solve_time": 5})
+
+        result = optimizer.generate_schedule(employees, shifts, instance=instance)
+
+        assert result["status"] in ["optimal", "feasible"]
+        assert optimizer.instance is instance
+
+    def test_stale_instance_is_rebuilt(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift("wed", 2)]
+        stale = SolverInstance(employees, shifts[:0])
+        optimizer = ScheduleOptimizer(config={"max_solve_time": 5})
+
+        optimizer.generate_schedule(employees, shifts, instance=stale)
+
+        assert optimizer.instance is not stale
+        assert optimizer.instance.matches(employees, shifts)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the interval helpers used by the constraint solver.
+"""
+
+from datetime import date
+
+from src.scheduler.intervals import IntervalIndex, absolute_interval, clashes, overlap_cliques, sweep_conflicts
+
+
+class TestAbsoluteInterval:
+    """Test conversion of shifts to absolute minutes."""
+
+    def test_same_day_shift(self):
+        assert absolute_interval(date(2024, 1, 2), 8 * 60, 16 * 60, date(2024, 1, 1)) == (1920, 2400)
+
+    def test_overnight_shift_ends_next_day(self):
+        start, end = absolute_interval(date(2024, 1, 1), 22 * 60, 6 * 60, date(2024, 1, 1))
+        assert (start, end) == (1320, 1800)
+
+
+class TestClashes:
+    """Test pairwise overlap and rest checks."""
+
+    def test_overlap_clashes(self):
+        assert clashes((0, 10), (5, 15))
+
+    def test_back_to_back_does_not_clash(self):
+        assert not clashes((0, 10), (10, 20), min_rest=60)
+
+    def test_short_rest_clashes_in_either_order(self):
+        assert clashes((0, 10), (30, 40), min_rest=60)
+        assert clashes((30, 40), (0, 10), min_rest=60)
+        assert not clashes((0, 10), (70, 80), min_rest=60)
+
+
+class TestOverlapCliques:
+    """Test sweep-line maximal clique detection."""
+
+    def test_chain_of_overlaps(self):
+        intervals = [("a", 0, 10), ("b", 5, 15), ("c", 10, 20), ("d", 12, 13)]
+        assert overlap_cliques(intervals) == [["a", "b"], ["b", "c", "d"]]
+
+    def test_back_to_back_intervals_do_not_overlap(self):
+        assert overlap_cliques([("a", 0, 10), ("b", 10, 20)]) == []
+
+    def test_input_order_does_not_matter(self):
+        intervals = [("late", 1320, 1800), ("early", 1440, 1800), ("day", 480, 960)]
+        assert overlap_cliques(intervals) == [["late", "early"]]
+
+    def test_empty_intervals_ignored(self):
+        assert overlap_cliques([("a", 5, 5), ("b", 0, 10)]) == []
+
+
+class TestSweepConflicts:
+    """Test the per-employee overlap and rest sweep."""
+
+    def test_reports_every_overlapping_pair_once(self):
+        intervals = [("c", 10, 20), ("a", 0, 10), ("b", 5, 15), ("d", 12, 13)]
+        assert sorted(sweep_conflicts(intervals)) == [("a", "b", -5), ("b", "c", -5), ("b", "d", -3), ("c", "d", -8)]
+
+    def test_short_rest_against_the_last_shift_to_end(self):
+        intervals = [("night", 1320, 1800), ("day", 480, 960), ("next", 2340, 2820)]
+        assert list(sweep_conflicts(intervals, min_rest=480)) == [("day", "night", 360)]
+        assert list(sweep_conflicts(intervals, min_rest=600)) == [("day", "night", 360), ("night", "next", 540)]
+
+    def test_short_rest_against_every_recent_shift(self):
+        intervals = [("a", 0, 60), ("b", 70, 100), ("c", 110, 200)]
+        assert sorted(sweep_conflicts(intervals, min_rest=480)) == [("a", "b", 10), ("a", "c", 50), ("b", "c", 10)]
+
+    def test_short_rest_checked_while_another_shift_is_active(self):
+        intervals = [("a", 0, 60), ("b", 90, 300), ("c", 100, 200)]
+        assert sorted(sweep_conflicts(intervals, min_rest=480)) == [("a", "b", 30), ("a", "c", 40), ("b", "c", -200)]
+
+    def test_back_to_back_is_neither_overlap_nor_short_rest(self):
+        assert list(sweep_conflicts([("a", 0, 10), ("b", 10, 20)], min_rest=60)) == []
+
+
+class TestIntervalIndex:
+    """Test windowed rest-period lookups."""
+
+    def test_starting_within_excludes_back_to_back(self):
+        index = IntervalIndex([("a", 0, 480), ("b", 480, 960), ("c", 600, 900), ("d", 1000, 1200)])
+        assert [key for key, _, _ in index.starting_within(480, 480)] == ["c"]
+
+    def test_rest_cliques_cover_every_short_rest_pair(self):
+        # Late shift ends 23:00; two overlapping early shifts and one mid shift start next morning
+        index = IntervalIndex(
+            [
+                ("late", 960, 1380),
+                ("early_a", 1440 + 360, 1440 + 840),
+                ("early_b", 1440 + 400, 1440 + 900),
+                ("mid", 1440 + 1400, 1440 + 1500),
+            ]
+        )
+        assert index.rest_cliques(8 * 60) == [["late", "early_a", "early_b"]]
+
+    def test_rest_cliques_pair_non_overlapping_followers(self):
+        index = IntervalIndex([("a", 0, 100), ("b", 150, 200), ("c", 250, 300)])
+        assert sorted(index.rest_cliques(200)) == [["a", "b"], ["a", "c"], ["b", "c"]]
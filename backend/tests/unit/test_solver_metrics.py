@@ -0,0 +1,79 @@
+"""
+Unit tests for schedule generation metrics.
+"""
+
+from prometheus_client import REGISTRY
+
+from src.scheduler.constraint_solver import Employee, ScheduleOptimizer
+from src.solver_metrics import PhaseTimer, get_last_generation, record_generation
+
+
+class TestPhaseTimer:
+    """Test per-phase timing."""
+
+    def test_phases_accumulate_in_execution_order(self):
+        timer = PhaseTimer()
+        with timer.phase("solve"):
+            pass
+        with timer.phase("fetch_employees"):
+            pass
+        timer.update({"solve": 1.0, "custom": 0.5})
+
+        phases = timer.as_dict()
+
+        assert list(phases) == ["fetch_employees", "solve", "custom"]
+        assert 1.0 <= phases["solve"] < 1.1
+        assert phases["custom"] == 0.5
+
+
+class TestRecordGeneration:
+    """Test histogram observation and the health summary."""
+
+    def test_observes_histograms_and_remembers_run(self):
+        def count(name, labels):
+            return REGISTRY.get_sample_value(name, labels) or 0.0
+
+        phase_before = count("schedule_generation_phase_seconds_count", {"phase": "solve"})
+        size_before = count("schedule_solver_model_size_count", {"kind": "variables"})
+
+        record_generation(
+            {"build_model": 0.2, "solve": 1.5},
+            {"num_variables": 120, "conflicts": 3, "gap": 0.0, "phases": {"solve": 1.5}},
+        )
+
+        assert count("schedule_generation_phase_seconds_count", {"phase": "solve"}) == phase_before + 1
+        assert count("schedule_solver_model_size_count", {"kind": "variables"}) == size_before + 1
+
+        last = get_last_generation()
+        assert last["phases"] == {"build_model": 0.2, "solve": 1.5}
+        assert last["num_variables"] == 120
+        assert "timestamp" in last
+
+
+class TestOptimizerStatistics:
+    """Test solver statistics reported with each result."""
+
+    def test_feasible_result_reports_model_and_search_statistics(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+        optimizer = ScheduleOptimizer()
+
+        result = optimizer.generate_schedule(employees=employees, shifts=[make_shift("s1")], constraints=[])
+
+        statistics = result["statistics"]
+        assert result["status"] in ("optimal", "feasible")
+        assert statistics["num_variables"] == 2
+        assert statistics["num_objective_terms"] > 0
+        assert statistics["conflicts"] >= 0 and statistics["branches"] >= 0
+        assert statistics["gap"] is not None
+        assert set(statistics["phases"]) == {"build_model", "solve"}
+
+    def test_infeasible_result_carries_statistics(self, make_shift):
+        optimizer = ScheduleOptimizer(config={"feasibility_precheck": False})
+
+        result = optimizer.generate_schedule(
+            employees=[Employee(id="1", name="A")], shifts=[make_shift("s1", min_employees=2)], constraints=[]
+        )
+
+        assert result["status"] == "infeasible"
+        assert result["statistics"]["num_variables"] == 1
+        assert result["statistics"]["gap"] is None
@@ -0,0 +1,145 @@
+"""
+Unit tests for per-week hour caps and rolling-horizon solving.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from src.scheduler.constraint_solver import CarryOver, Employee, ScheduleOptimizer
+from src.scheduler.rolling_horizon import advance_carry_over, horizon_windows, solve_rolling, use_rolling_horizon
+from src.scheduler.synthetic import InstanceSpec, generate_instance
+
+MONDAY = date(2024, 1, 1)
+
+
+def _assigned(result):
+    return {(emp["id"], entry["shift_id"]) for entry in result["schedule"] for emp in entry["assigned_employees"]}
+
+
+class TestWeeklyHours:
+    """Test that hour limits apply per calendar week."""
+
+    def test_each_week_has_its_own_cap(self, make_shift):
+        employees = [Employee(id="1", name="A", max_hours_per_week=8)]
+        shifts = [make_shift("d0", 0), make_shift("d7", 7)]
+
+        result = ScheduleOptimizer().generate_schedule(employees=employees, shifts=shifts)
+
+        assert result["status"] in ("optimal", "feasible")
+        assert _assigned(result) == {("1", shifts[0].id), ("1", shifts[1].id)}
+
+
+class TestCarryOver:
+    """Test state carried into a solve."""
+
+    def test_last_shift_rules_out_short_rest(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+        shift = make_shift("d0", 0, time(6, 0), time(14, 0))
+        sunday = MONDAY - timedelta(days=1)
+        carry_over = CarryOver(last_shift={"1": (datetime.combine(sunday, time(16)), datetime.combine(sunday, time(23)))})
+
+        result = ScheduleOptimizer().generate_schedule(employees=employees, shifts=[shift], carry_over=carry_over)
+
+        assert _assigned(result) == {("2", shift.id)}
+
+    def test_carried_streak_limits_consecutive_days(self, make_shift):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")]
+        shifts = [make_shift(f"d{day}", day, max_employees=1) for day in range(3)]
+        optimizer = ScheduleOptimizer(config={"max_consecutive_days": 5})
+
+        result = optimizer.generate_schedule(
+            employees=employees, shifts=shifts, carry_over=CarryOver(consecutive_days={"1": 4, "2": 5})
+        )
+
+        assert result["status"] in ("optimal", "feasible")
+        assert ("2", shifts[0].id) not in _assigned(result)
+        assert {shift_id for emp_id, shift_id in _assigned(result) if emp_id == "1"} == {shifts[0].id}
+
+    def test_advance_carry_over(self, make_shift):
+        shifts = [make_shift(f"d{day}", day) for day in range(7)] + [make_shift("night6", 6, time(22, 0), time(6, 0))]
+        assignments = {("1", shifts[day].id) for day in (4, 5, 6)} | {("2", shifts[5].id), ("3", shifts[7].id)}
+        previous = CarryOver(consecutive_days={"1": 10, "2": 3}, hours={"1": 100})
+
+        carry_over = advance_carry_over(previous, shifts, assignments, MONDAY + timedelta(days=7))
+
+        assert carry_over.consecutive_days == {"1": 3, "3": 1}
+        assert carry_over.hours == {"1": 124, "2": 8, "3": 8}
+        assert carry_over.weekend_shifts == {"1": 2, "2": 1, "3": 1}
+        assert carry_over.last_shift["3"] == (datetime(2024, 1, 7, 22), datetime(2024, 1, 8, 6))
+
+    def test_streak_spanning_the_window_continues(self, make_shift):
+        shifts = [make_shift(f"d{day}", day) for day in range(7)]
+        assignments = {("1", shift.id) for shift in shifts}
+
+        carry_over = advance_carry_over(CarryOver(consecutive_days={"1": 2}), shifts, assignments, MONDAY + timedelta(days=7))
+
+        assert carry_over.consecutive_days == {"1": 9}
+
+
+class TestRollingHorizon:
+    """Test window splitting and the rolling solve."""
+
+    def test_windows_commit_weeks_and_look_ahead(self, make_shift):
+        shifts = [make_shift(f"d{day}", day) for day in range(2, 17)]
+
+        windows = horizon_windows(shifts, window_weeks=1, overlap_days=2)
+
+        assert len(windows) == 3
+        window, committed = windows[0]
+        assert committed == {shift.id for shift in shifts if shift.date < MONDAY + timedelta(days=7)}
+        assert max(shift.date for shift in window) == MONDAY + timedelta(days=8)
+        assert windows[2][1] == {shift.id for shift in shifts[-3:]}
+
+    def test_use_rolling_horizon_threshold(self, make_shift):
+        shifts = [make_shift("d0", 0), make_shift("d27", 27)]
+
+        assert not use_rolling_horizon({"rolling_horizon_days": 28}, shifts)
+        assert use_rolling_horizon({"rolling_horizon_days": 27}, shifts)
+        assert not use_rolling_horizon({}, shifts)
+
+    def test_solve_rolling_respects_weekly_caps_and_rest(self):
+        employees, shifts, constraints = generate_instance(InstanceSpec(employees=12, templates=3, days=21, rules=0))
+        config = {"max_solve_time": 2, "min_rest_hours": 8, "sparse_variables": True, "max_consecutive_days": 6}
+
+        result = solve_rolling(config, employees, shifts, constraints)
+
+        assert result["status"] in ("optimal", "feasible")
+        assert result["statistics"]["windows"] == 3
+
+        shift_map = {shift.id: shift for shift in shifts}
+        limits = {emp.id: emp.max_hours_per_week for emp in employees}
+        weekly, intervals = defaultdict(int), defaultdict(list)
+        for emp_id, shift_id in _assigned(result):
+            shift = shift_map[shift_id]
+            start = datetime.combine(shift.date, shift.start_time)
+            weekly[(emp_id, shift.date.isocalendar()[1])] += int(shift.get_duration_hours())
+            intervals[emp_id].append((start, start + timedelta(hours=shift.get_duration_hours())))
+
+        assert all(hours <= limits[emp_id] for (emp_id, _), hours in weekly.items())
+        for spans in intervals.values():
+            spans.sort()
+            for (_, end), (start, _) in zip(spans, spans[1:]):
+                assert start == end or start - end >= timedelta(hours=8)
+
+    def test_greedy_windows_are_committed_and_shortfalls_reported(self, make_shift):
+        employees = [Employee(id="1", name="A", max_hours_per_week=16)]
+        shifts = [make_shift(f"d{day}", day) for day in range(14)]
+        config = {"greedy_variable_limit": 1, "rolling_overlap_days": 0}
+
+        result = solve_rolling(config, employees, shifts)
+
+        assert result["status"] == "fallback"
+        assert result["statistics"]["windows"] == 2
+        assert len(_assigned(result)) == 4
+        assert len(result["unfilled"]) == 10
+        assert result["message"] == "Rolling-horizon solve left 10 shifts understaffed"
+
+    def test_greedy_windows_continue_carried_streaks(self, make_shift):
+        employees = [Employee(id="1", name="A")]
+        shifts = [make_shift(f"d{day}", day) for day in range(5, 9)]
+        config = {"greedy_variable_limit": 1, "rolling_overlap_days": 0, "max_consecutive_days": 2}
+
+        result = solve_rolling(config, employees, shifts)
+
+        assert result["unfilled"] == [{"shift_id": shifts[2].id, "missing": 1}]
+        assert _assigned(result) == {("1", shifts[index].id) for index in (0, 1, 3)}
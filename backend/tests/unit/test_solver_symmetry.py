@@ -0,0 +1,121 @@
+"""
+Unit tests for symmetry breaking between interchangeable employees.
+"""
+
+from datetime import date, time, timedelta
+
+from ortools.sat.python import cp_model
+
+from src.scheduler.constraint_solver import CarryOver, Employee, ScheduleOptimizer, SchedulingConstraint, Shift
+from src.scheduler.eligibility import EligibilityMatrix
+from src.scheduler.symmetry import add_lex_leader, canonical_plan, employee_classes
+
+MONDAY = date(2024, 1, 1)
+
+
+def _rotation(days):
+    shifts = []
+    for day in range(days):
+        shift_date = MONDAY + timedelta(days=day)
+        for template, (start, end) in enumerate([(6, 14), (14, 22), (22, 6)]):
+            shifts.append(
+                Shift(
+                    id=f"{template}_{shift_date.isoformat()}",
+                    date=shift_date,
+                    start_time=time(start),
+                    end_time=time(end),
+                    min_employees=2,
+                    max_employees=3,
+                )
+            )
+    return shifts
+
+
+class TestEmployeeClasses:
+    """Test which employees count as interchangeable."""
+
+    def test_groups_by_eligibility_and_limits(self):
+        employees = [
+            Employee(id="1", name="A", qualifications=["rn"]),
+            Employee(id="2", name="B"),
+            Employee(id="3", name="C", qualifications=["rn"]),
+            Employee(id="4", name="D", qualifications=["rn"], max_hours_per_week=20),
+            Employee(id="5", name="E", qualifications=["cpr"]),
+        ]
+        shifts = _rotation(1)
+        shifts[0].required_qualifications = ["rn"]
+
+        classes = employee_classes(employees, EligibilityMatrix(employees, shifts))
+
+        # B and E differ in qualifications but not in the shifts they may take
+        assert sorted(classes) == [[0, 2], [1, 4]]
+
+    def test_current_plan_carry_over_and_rules_single_out(self):
+        employees = [Employee(id=str(index), name=str(index)) for index in range(5)]
+        eligibility = EligibilityMatrix(employees, _rotation(1))
+        rule = SchedulingConstraint(id="1", name="Rule", type="restriction", parameters={"employee_id": 3})
+
+        classes = employee_classes(
+            employees,
+            eligibility,
+            existing_assignments={("1", "0_2024-01-01")},
+            carry_over=CarryOver(hours={"2": 8}),
+            constraints=[rule],
+        )
+
+        assert classes == [[0, 4]]
+
+
+class TestLexLeader:
+    """Test the lexicographic order constraint."""
+
+    def test_allows_exactly_the_ordered_pairs(self):
+        model = cp_model.CpModel()
+        first = [model.NewBoolVar(f"x{k}") for k in range(3)]
+        second = [model.NewBoolVar(f"y{k}") for k in range(3)]
+        add_lex_leader(model, first, second, "lex")
+
+        solutions = set()
+
+        class Collector(cp_model.CpSolverSolutionCallback):
+            def on_solution_callback(self):
+                solutions.add((tuple(self.Value(x) for x in first), tuple(self.Value(y) for y in second)))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.enumerate_all_solutions = True
+        solver.Solve(model, Collector())
+
+        assert len(solutions) == 36
+        assert all(x >= y for x, y in solutions)
+
+    def test_canonical_plan_orders_each_class(self):
+        plan = {("a", "s2"), ("b", "s1"), ("c", "s1"), ("c", "s2"), ("d", "s1")}
+
+        canonical = canonical_plan(plan, [(["a", "b", "c"], ["s1", "s2"])])
+
+        assert canonical == {("a", "s1"), ("a", "s2"), ("b", "s1"), ("c", "s2"), ("d", "s1")}
+
+
+class TestOptimizerSymmetry:
+    """Test symmetry breaking in the optimizer."""
+
+    def test_homogeneous_team_is_proved_optimal(self):
+        employees = [Employee(id=str(index), name=f"E{index}") for index in range(9)]
+        shifts = _rotation(7)
+        config = {"max_solve_time": 20, "sparse_variables": True, "num_search_workers": 1}
+
+        result = ScheduleOptimizer(config=config).generate_schedule(employees=employees, shifts=shifts)
+
+        assert result["status"] == "optimal"
+        assert result["statistics"]["symmetric_employees"] == 9
+        assert all(len(entry["assigned_employees"]) >= 2 for entry in result["schedule"])
+
+    def test_skipped_when_few_employees_are_interchangeable(self):
+        employees = [Employee(id="1", name="A"), Employee(id="2", name="B")] + [
+            Employee(id=str(index), name=f"E{index}", max_hours_per_week=30 + index) for index in range(3, 8)
+        ]
+
+        result = ScheduleOptimizer(config={"max_solve_time": 5}).generate_schedule(employees=employees, shifts=_rotation(2))
+
+        assert result["status"] in ("optimal", "feasible")
+        assert result["statistics"]["symmetry_classes"] == 0
@@ -0,0 +1,67 @@
+"""
+Unit tests for the synthetic instance generator used by the solver benchmark.
+"""
+
+from src.scheduler.constraint_solver import ScheduleOptimizer
+from src.scheduler.synthetic import InstanceSpec, generate_instance
+
+
+class TestGenerateInstance:
+    """Test shape, determinism and solvability of generated instances."""
+
+    def test_sizes_follow_spec(self):
+        spec = InstanceSpec(employees=30, templates=4, days=7, departments=3, rules=12)
+
+        employees, shifts, rules = generate_instance(spec)
+
+        assert len(employees) == 30
+        assert len(shifts) == 4 * 7
+        assert len(rules) == 12
+        assert {emp.department_id for emp in employees} == {1, 2, 3}
+
+    def test_same_seed_same_instance(self):
+        first = generate_instance(InstanceSpec(seed=7))
+        second = generate_instance(InstanceSpec(seed=7))
+        other = generate_instance(InstanceSpec(seed=8))
+
+        assert first == second
+        assert first != other
+
+    def test_rule_mix_is_respected(self):
+        spec = InstanceSpec(rules=20, rule_mix={"requirement": 1.0})
+
+        _, _, rules = generate_instance(spec)
+
+        assert {rule.type for rule in rules} == {"requirement"}
+        assert all("hours" in rule.parameters for rule in rules)
+
+    def test_distributions_can_be_switched_off(self):
+        spec = InstanceSpec(employees=20, qualification_rate=0, required_qualification_rate=0, restricted_availability_rate=0)
+
+        employees, shifts, _ = generate_instance(spec)
+
+        assert all(not emp.qualifications and not emp.availability for emp in employees)
+        assert all(not shift.required_qualifications for shift in shifts)
+
+    def test_one_week_instance_is_staffable(self):
+        employees, shifts, _ = generate_instance(InstanceSpec(employees=60, templates=5, days=7))
+        optimizer = ScheduleOptimizer(config={"min_rest_hours": 8})
+
+        greedy = optimizer._greedy_scheduler(employees, shifts, optimizer._build_eligibility_index(employees, shifts))
+        greedy.build()
+
+        assert greedy.unfilled() == {}
+
+
+class TestModelStatistics:
+    """Test the build statistics the benchmark reads."""
+
+    def test_build_statistics_reported(self):
+        employees, shifts, rules = generate_instance(InstanceSpec(employees=10, templates=2, days=2))
+        optimizer = ScheduleOptimizer(config={"max_solve_time": 5})
+
+        result = optimizer.generate_schedule(employees, shifts, rules)
+
+        assert result["status"] in ["optimal", "feasible"]
+        assert result["statistics"]["build_time"] == optimizer.build_time > 0
+        assert result["statistics"]["num_constraints"] == len(optimizer.model.Proto().constraints)
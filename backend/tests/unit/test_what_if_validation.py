@@ -0,0 +1,103 @@
+"""
+Unit tests for what-if validation of batched assignment changes.
+"""
+
+from datetime import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.auth.models  # noqa: F401  registers User for the model relationships
+from src.models import Employee, ScheduleAssignment, Shift
+from src.services import conflict_detection
+from src.services.conflict_detection import AssignmentIndex, ConflictType, evaluate_assignment_changes
+
+ALWAYS = {day: {"available": True} for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]}
+OVERLAP = ConflictType.OVERLAPPING_SHIFTS
+
+
+class WhatIfSession:
+    """Async session stand-in returning assignments, shifts, employees and then the timeline rows."""
+
+    def __init__(self, assignment_rows, shifts, employees, timeline_rows):
+        self.results = [
+            SimpleNamespace(all=lambda: assignment_rows),
+            SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: shifts)),
+            SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: employees)),
+            SimpleNamespace(all=lambda: timeline_rows),
+        ]
+        self.info = {}
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return self.results[len(self.statements) - 1]
+
+    def add(self, obj):
+        raise AssertionError("what-if validation must not write")
+
+
+def _assign(assignment_id, employee_id, shift):
+    shift.schedule_assignments.append(
+        ScheduleAssignment(id=assignment_id, employee_id=employee_id, shift_id=shift.id, status="assigned")
+    )
+    row = SimpleNamespace(id=assignment_id, employee_id=employee_id, shift_id=shift.id, status="assigned")
+    return row, (employee_id, assignment_id, shift.id, shift.date, shift.start_time, shift.end_time)
+
+
+@pytest.mark.asyncio
+async def test_changes_report_new_and_resolved_conflicts_without_writes(monkeypatch, make_shift):
+    monkeypatch.setattr(conflict_detection, "assignment_index", AssignmentIndex())
+    morning = make_shift(10, model=Shift, department_id=1, required_staff=1)
+    midday = make_shift(11, 0, time(12, 0), time(20, 0), model=Shift, department_id=1, required_staff=1)
+    late = make_shift(12, 0, time(16, 0), time(23, 0), model=Shift, department_id=1, required_staff=1)
+    employees = [Employee(id=i, first_name="E", last_name=str(i), availability=ALWAYS) for i in (1, 2, 3)]
+    first, first_row = _assign(100, 1, morning)
+    second, second_row = _assign(101, 1, midday)
+    _, third_row = _assign(200, 2, late)
+    session = WhatIfSession([first, second], [morning, midday, late], employees, [first_row, second_row, third_row])
+
+    result = await evaluate_assignment_changes(
+        session,
+        [
+            {"action": "move", "assignment_id": 101, "employee_id": 2},
+            {"action": "add", "employee_id": 3, "shift_id": 10},
+            {"action": "remove", "assignment_id": 999},
+        ],
+    )
+
+    assert len(session.statements) == 4
+    resolved = {(c["employee_id"], c["shift_id"], c["conflict_type"]) for c in result["resolved_conflicts"]}
+    new = {(c.get("employee_id"), c["shift_id"], c["conflict_type"]) for c in result["new_conflicts"]}
+    # Both overlapping pairs also exceed the 12 hour daily limit
+    assert resolved == {(1, shift_id, kind) for shift_id in (10, 11) for kind in (OVERLAP, ConflictType.EXCESSIVE_HOURS)}
+    assert new == {(2, shift_id, kind) for shift_id in (11, 12) for kind in (OVERLAP, ConflictType.EXCESSIVE_HOURS)} | {
+        (None, 10, ConflictType.OVERSTAFFED)
+    }
+    assert (result["total_changes"], result["applied_changes"]) == (3, 2)
+    assert result["errors"] == [{"index": 2, "action": "remove", "error": "Assignment 999 not found"}]
+    assert not result["valid"]
+
+
+@pytest.mark.asyncio
+async def test_changes_outside_the_department_are_rejected(monkeypatch, make_shift):
+    monkeypatch.setattr(conflict_detection, "assignment_index", AssignmentIndex())
+    ours = make_shift(10, model=Shift, department_id=1, required_staff=1)
+    theirs = make_shift(20, model=Shift, department_id=2, required_staff=1)
+    employees = [Employee(id=i, first_name="E", last_name=str(i), availability=ALWAYS) for i in (1, 2)]
+    other, other_row = _assign(300, 2, theirs)
+    session = WhatIfSession([other], [ours, theirs], employees, [other_row])
+
+    changes = [
+        {"action": "add", "employee_id": 1, "shift_id": 20},
+        {"action": "move", "assignment_id": 300, "shift_id": 10},
+        {"action": "add", "employee_id": 1, "shift_id": 10},
+    ]
+    result = await evaluate_assignment_changes(session, changes, department_id=1)
+
+    assert result["errors"] == [
+        {"index": 0, "action": "add", "error": "Shift 20 is not in department 1"},
+        {"index": 1, "action": "move", "error": "Assignment 300 is not in department 1"},
+    ]
+    assert result["applied_changes"] == 1
+    assert result["valid"]